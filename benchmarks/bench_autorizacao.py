@@ -0,0 +1,100 @@
+# ========================
+# Benchmark - checagem de acesso: pilha de decorators x política central
+# ========================
+
+''' Como rodar (na raiz do projeto):
+    python benchmarks/bench_autorizacao.py --repeticoes 5000
+
+Mede µs por requisição (mediana) só da checagem de acesso de uma rota admin,
+com o admin logado (sessão do Flask-Login):
+- decorators: login_required + somente_admin + verifica_inatividade
+  (o current_user carrega o Usuario pelo ORM a cada requisição)
+- central: verificar_acesso (política compilada + principal em cache)
+A view em si não faz nada.
+'''
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import session  # noqa: E402
+from flask_login import login_required  # noqa: E402
+
+from servicosdigitais.app import criar_app, bancodedados  # noqa: E402
+from servicosdigitais.app.config import ConfigTeste  # noqa: E402
+from servicosdigitais.app.models import Usuario  # noqa: E402
+from servicosdigitais.app.utilidades.autenticacao import verifica_inatividade  # noqa: E402
+from servicosdigitais.app.utilidades.autorizacao import (  # noqa: E402
+    somente_admin, verificar_acesso
+)
+
+ROTA = '/admin/metricas'
+
+
+class _ConfigBench(ConfigTeste):
+    CACHE_TIPO = 'simples'  # o principal precisa de cache (ConfigTeste usa 'nulo')
+
+
+def criar():
+    app = criar_app(_ConfigBench)
+    with app.app_context():
+        bancodedados.create_all()
+        admin = Usuario(nome='Admin', email='admin@bench.com', tipo='usuario', is_admin=True)
+        admin.set_senha('bench123')
+        bancodedados.session.add(admin)
+        bancodedados.session.commit()
+    return app
+
+
+def view_vazia():
+    return ''
+
+
+def medir(app, checar, repeticoes):
+    tempos = []
+    # sem app_context por fora: cada requisição tem o próprio contexto e g
+    # (o Flask-Login guarda o usuário em g._login_user; com um g só, o
+    # user_loader rodaria uma vez e os decorators não pagariam o ORM)
+    for _ in range(repeticoes):
+        with app.test_request_context(ROTA):
+            session['_user_id'] = 'usuario:1'
+            session['ultima_atividade'] = datetime.now(timezone.utc).isoformat()
+            inicio = time.perf_counter()
+            checar()
+            tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1e6  # µs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeticoes', type=int, default=5000)
+    args = parser.parse_args()
+
+    app = criar()
+
+    empilhada = login_required(somente_admin(verifica_inatividade(view_vazia)))
+
+    def central():
+        if verificar_acesso() is None:
+            view_vazia()
+
+    casos = (('decorators', empilhada), ('central', central))
+
+    for _nome, checar in casos:
+        medir(app, checar, 200)  # aquece (cache do principal, imports)
+
+    print(f'{"modo":<12} {"µs/req":>8}')
+    resultados = {}
+    for nome, checar in casos:
+        resultados[nome] = medir(app, checar, args.repeticoes)
+        print(f'{nome:<12} {resultados[nome]:>8.1f}')
+    print(f'ganho: {resultados["decorators"] / resultados["central"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+# ========================
+# Benchmark - compressão das páginas (bytes economizados x CPU)
+# ========================
+
+''' Como rodar (na raiz do projeto):
+    python benchmarks/bench_compressao.py --prestadores 200 --repeticoes 50
+
+Renderiza as páginas com o app de teste (banco em memória), sem compressão,
+e mede para cada página e cada nível:
+- tamanho comprimido e % economizado
+- tempo de CPU por compressão (mediana)
+- custo de um acerto no cache de corpos comprimidos (sha1 do corpo)
+'''
+
+import argparse
+import hashlib
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from servicosdigitais.app import criar_app, bancodedados  # noqa: E402
+from servicosdigitais.app.config import ConfigTeste  # noqa: E402
+from servicosdigitais.app.models import Usuario, PrestadorServico  # noqa: E402
+from servicosdigitais.app.utilidades.compressao import _brotli, comprimir_bytes  # noqa: E402
+
+PAGINAS = ('/', '/servicos', '/prestadores', '/perfil/2')
+NIVEIS_GZIP = (1, 6, 9)
+NIVEIS_BROTLI = (4, 5, 11)
+
+
+class ConfigBench(ConfigTeste):
+    COMPRESSAO_ATIVA = False  # corpos originais
+
+
+def popular(app, quantidade):
+    with app.app_context():
+        bancodedados.create_all()
+        admin = Usuario(nome='Admin', email='admin@bench.com', tipo='usuario', is_admin=True)
+        admin.set_senha('bench123')
+        bancodedados.session.add(admin)
+        for i in range(quantidade):
+            p = PrestadorServico(
+                nome=f'Prestador {i}', email=f'p{i}@bench.com',
+                cnpj=str(11222333000181 + i),
+                especialidade=('Eletricista', 'Pintor', 'Encanador', 'Pedreiro')[i % 4],
+            )
+            p.set_senha('bench123')
+            bancodedados.session.add(p)
+        bancodedados.session.commit()
+
+
+def renderizar(app):
+    cliente = app.test_client()
+    with cliente.session_transaction() as sessao:
+        sessao['_user_id'] = 'usuario:1'
+        sessao['_fresh'] = True
+
+    corpos = {}
+    for pagina in PAGINAS:
+        resposta = cliente.get(pagina)
+        if resposta.status_code == 200:
+            corpos[pagina] = resposta.get_data()
+        else:
+            print(f'{pagina}: status {resposta.status_code} (ignorada)')
+    return corpos
+
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return resultado, statistics.median(tempos) * 1e6  # µs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--prestadores', type=int, default=200)
+    parser.add_argument('--repeticoes', type=int, default=50)
+    args = parser.parse_args()
+
+    app = criar_app(ConfigBench)
+    popular(app, args.prestadores)
+    corpos = renderizar(app)
+
+    variantes = [('gzip', 'COMPRESSAO_NIVEL', n) for n in NIVEIS_GZIP]
+    if _brotli():
+        variantes += [('br', 'COMPRESSAO_NIVEL_BROTLI', n) for n in NIVEIS_BROTLI]
+    else:
+        print('(pacote brotli não instalado: só gzip)')
+
+    print(f'{"página":<16} {"cod":<5} {"nível":>5} {"original":>9} {"final":>8} '
+          f'{"economia":>9} {"µs/página":>10}')
+    for pagina, dados in corpos.items():
+        for codificacao, chave, nivel in variantes:
+            config = dict(app.config, **{chave: nivel})
+            comprimido, micros = medir(
+                lambda: comprimir_bytes(dados, codificacao, config), args.repeticoes
+            )
+            economia = 100 * (1 - len(comprimido) / len(dados))
+            print(f'{pagina:<16} {codificacao:<5} {nivel:>5} {len(dados):>9} '
+                  f'{len(comprimido):>8} {economia:>8.1f}% {micros:>10.0f}')
+
+        _, micros_hash = medir(lambda: hashlib.sha1(dados).digest(), args.repeticoes)
+        print(f'{pagina:<16} {"cache":<5} {"-":>5} {"":>9} {"":>8} {"":>9} {micros_hash:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# ========================
+# Benchmark - custo de renderizar o base.html (form_logout preguiçoso x a cada render)
+# ========================
+
+''' Como rodar (na raiz do projeto):
+    python benchmarks/bench_contexto_templates.py --repeticoes 2000
+
+Compara, para visitante e usuário logado:
+- preguicoso: form_logout é um proxy (criado só se o template usar)
+- a_cada_render: context processor antigo, FormLogout() em todo render
+'''
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import render_template  # noqa: E402
+from flask_login import login_user  # noqa: E402
+
+from servicosdigitais.app import criar_app, bancodedados  # noqa: E402
+from servicosdigitais.app.config import ConfigTeste  # noqa: E402
+from servicosdigitais.app.forms.autenticacao_forms import FormLogout  # noqa: E402
+from servicosdigitais.app.models import Usuario  # noqa: E402
+
+TEMPLATE = 'estrutura/base.html'
+
+
+def criar(a_cada_render):
+    app = criar_app(ConfigTeste)
+    if a_cada_render:
+        # comportamento anterior (o context processor tem prioridade sobre o global)
+        @app.context_processor
+        def injetar_forms_globais():
+            return {'form_logout': FormLogout()}
+
+    with app.app_context():
+        bancodedados.create_all()
+        usuario = Usuario(nome='Bench', email='bench@bench.com', tipo='usuario')
+        usuario.set_senha('bench123')
+        bancodedados.session.add(usuario)
+        bancodedados.session.commit()
+    return app
+
+
+def medir(app, logado, repeticoes):
+    tempos = []
+    # sem app_context por fora: cada render tem a própria requisição e o
+    # próprio g (o form preguiçoso fica no g; com um g só, seria criado
+    # uma vez e reaproveitado em todos os renders)
+    for _ in range(repeticoes):
+        with app.test_request_context('/'):
+            if logado:
+                login_user(bancodedados.session.get(Usuario, 1))
+            inicio = time.perf_counter()
+            render_template(TEMPLATE)
+            tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1e6  # µs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeticoes', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f'{"modo":<14} {"visitante µs":>13} {"logado µs":>10}')
+    for nome, a_cada_render in (('a_cada_render', True), ('preguicoso', False)):
+        app = criar(a_cada_render)
+        medir(app, False, 50)  # aquece o cache de templates
+        visitante = medir(app, False, args.repeticoes)
+        logado = medir(app, True, args.repeticoes)
+        print(f'{nome:<14} {visitante:>13.1f} {logado:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# ========================
+# Benchmark - tempo de subida (import + criar_app)
+# ========================
+
+''' Como rodar (na raiz do projeto):
+    python benchmarks/bench_importacao.py
+    python benchmarks/bench_importacao.py --orcamento-ms 900 --repeticoes 5
+
+Roda "import servicosdigitais.app; criar_app('teste')" num processo novo
+com "python -X importtime", soma o tempo dos imports de primeiro nível e
+mede o criar_app. Usa o menor valor das repetições (menos ruído).
+
+Termina com código 1 (falha) se:
+- o tempo total passar do orçamento (--orcamento-ms), ou
+- algum módulo pesado for importado na subida (PIL, smtplib, alembic...)
+Serve de verificação no CI / antes do deploy.
+'''
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Devem carregar só no primeiro uso (upload, envio de e-mail, flask db)
+MODULOS_PROIBIDOS = ('PIL', 'smtplib', 'alembic', 'flask_migrate')
+
+ORCAMENTO_PADRAO_MS = 1200
+
+_CODIGO = '''
+import json, sys, time
+inicio = time.perf_counter()
+from servicosdigitais.app import criar_app
+importado = time.perf_counter()
+criar_app('teste')
+fim = time.perf_counter()
+print(json.dumps({
+    'import_ms': (importado - inicio) * 1000,
+    'criar_app_ms': (fim - importado) * 1000,
+    'carregados': [m for m in %r if m in sys.modules],
+}))
+''' % (MODULOS_PROIBIDOS,)
+
+
+def medir_uma_vez():
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _CODIGO],
+        cwd=RAIZ, capture_output=True, text=True, check=True
+    )
+    resultado = json.loads(processo.stdout.strip().splitlines()[-1])
+
+    # linhas "import time: self | cumulativo | módulo"; primeiro nível = sem recuo
+    imports = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith('import time:') or 'cumulative' in linha:
+            continue
+        _, cumulativo, modulo = linha[len('import time:'):].split('|')
+        if not modulo.startswith('  '):
+            imports.append((int(cumulativo) / 1000, modulo.strip()))
+
+    resultado['imports_ms'] = sum(ms for ms, _ in imports)
+    resultado['maiores'] = sorted(imports, reverse=True)[:8]
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--orcamento-ms', type=float, default=ORCAMENTO_PADRAO_MS)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    medicoes = [medir_uma_vez() for _ in range(args.repeticoes)]
+    melhor = min(medicoes, key=lambda m: m['import_ms'] + m['criar_app_ms'])
+    total = melhor['import_ms'] + melhor['criar_app_ms']
+
+    print(f"import servicosdigitais.app: {melhor['import_ms']:.0f} ms")
+    print(f"criar_app('teste'):          {melhor['criar_app_ms']:.0f} ms")
+    print(f"total:                       {total:.0f} ms (orçamento {args.orcamento_ms:.0f} ms)")
+    print("maiores imports de primeiro nível (-X importtime):")
+    for ms, modulo in melhor['maiores']:
+        print(f"  {ms:8.1f} ms  {modulo}")
+
+    falhou = False
+    if melhor['carregados']:
+        print(f"FALHA: módulos pesados carregados na subida: {', '.join(melhor['carregados'])}")
+        falhou = True
+    if total > args.orcamento_ms:
+        print("FALHA: tempo de subida acima do orçamento.")
+        falhou = True
+
+    if not falhou:
+        print("OK")
+    return 1 if falhou else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
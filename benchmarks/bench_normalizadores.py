@@ -0,0 +1,139 @@
+# ========================
+# Benchmark - normalização/formatação: loops por caractere x tabelas prontas
+# ========================
+
+''' Como rodar (na raiz do projeto):
+    python benchmarks/bench_normalizadores.py --quantidade 50000
+
+Para cada função mede µs por chamada:
+- antigo: implementação anterior (gerador por caractere / fatias)
+- novo_frio: versão atual com o lru_cache limpo (valores todos diferentes)
+- novo_cache: versão atual repetindo os valores (como numa lista de página)
+
+Obs.: os formatadores novos também limpam a entrada (pontuação, int);
+sem cache eles fazem mais trabalho que as fatias antigas.
+'''
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from servicosdigitais.app.utilidades import normalizadores as n  # noqa: E402
+
+
+# ======================================================
+# IMPLEMENTAÇÕES ANTERIORES (referência)
+# ======================================================
+def antigo_apenas_numeros(valor):
+    if not valor:
+        return ''
+    return ''.join(ch for ch in str(valor) if ch.isdigit())
+
+
+def antigo_mask_doc(doc):
+    if not doc:
+        return ''
+    s = ''.join(ch for ch in str(doc) if ch.isdigit())
+    if len(s) == 11:
+        return f"{s[0:3]}.{s[3:6]}.***-{s[-2:]}"
+    if len(s) == 14:
+        return f"{s[0:2]}.{s[2:5]}.***./{s[8:12]}-{s[-2:]}"
+    if len(s) <= 4:
+        return '*' * len(s)
+    return s[0:2] + '*' * (len(s) - 4) + s[-2:]
+
+
+def antigo_mask_phone(phone):
+    if not phone:
+        return ''
+    s = ''.join(ch for ch in str(phone) if ch.isdigit())
+    if len(s) <= 4:
+        return '*' * len(s)
+    return '*' * (len(s) - 4) + s[-4:]
+
+
+def antigo_formatar_cnpj(cnpj):
+    cnpj = str(cnpj)
+    return f"{cnpj[:2]}.{cnpj[2:5]}.{cnpj[5:8]}/{cnpj[8:12]}-{cnpj[12:]}"
+
+
+def antigo_formatar_telefone(tel):
+    tel = str(tel)
+    if len(tel) == 10:
+        return f"({tel[:2]}) {tel[2:6]}-{tel[6:]}"
+    return f"({tel[:2]}) {tel[2:7]}-{tel[7:]}"
+
+
+# ======================================================
+# DADOS
+# ======================================================
+def gerar(quantidade, semente=7):
+    aleatorio = random.Random(semente)
+
+    def digitos(k):
+        return ''.join(aleatorio.choice('0123456789') for _ in range(k))
+
+    return {
+        'cnpj_pontuado': [
+            f'{d[:2]}.{d[2:5]}.{d[5:8]}/{d[8:12]}-{d[12:]}'
+            for d in (digitos(14) for _ in range(quantidade))
+        ],
+        'cnpj': [digitos(14) for _ in range(quantidade)],
+        'cpf': [digitos(11) for _ in range(quantidade)],
+        'telefone': [f'({d[:2]}) {d[2:7]}-{d[7:]}' for d in (digitos(11) for _ in range(quantidade))],
+        'telefone_digitos': [digitos(11) for _ in range(quantidade)],
+    }
+
+
+CASOS = (
+    ('apenas_numeros', 'cnpj_pontuado', antigo_apenas_numeros, n.apenas_numeros),
+    ('_mask_doc', 'cpf', antigo_mask_doc, n._mask_doc),
+    ('_mask_phone', 'telefone', antigo_mask_phone, n._mask_phone),
+    ('formatar_cnpj', 'cnpj', antigo_formatar_cnpj, n.formatar_cnpj),
+    ('formatar_telefone', 'telefone_digitos', antigo_formatar_telefone, n.formatar_telefone),
+)
+
+
+def micros_por_chamada(funcao, valores):
+    inicio = time.perf_counter()
+    for valor in valores:
+        funcao(valor)
+    return (time.perf_counter() - inicio) / len(valores) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--quantidade', type=int, default=50000)
+    parser.add_argument('--repetidos', type=int, default=50,
+                        help='valores distintos no cenário com cache')
+    args = parser.parse_args()
+
+    dados = gerar(args.quantidade)
+
+    print(f'{"função":<18} {"antigo µs":>10} {"novo_frio µs":>13} {"novo_cache µs":>14} '
+          f'{"ganho frio":>11} {"ganho cache":>12}')
+    for nome, chave, antigo, novo in CASOS:
+        valores = dados[chave]
+        repetidos = valores[:args.repetidos] * (len(valores) // args.repetidos)
+
+        t_antigo = micros_por_chamada(antigo, valores)
+
+        limpar = getattr(novo, 'cache_clear', None)
+        if limpar:
+            limpar()
+        t_frio = micros_por_chamada(novo, valores)
+
+        if limpar:
+            limpar()
+        t_cache = micros_por_chamada(novo, repetidos)
+
+        print(f'{nome:<18} {t_antigo:>10.3f} {t_frio:>13.3f} {t_cache:>14.3f} '
+              f'{t_antigo / t_frio:>10.1f}x {t_antigo / t_cache:>11.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+# ========================
+# Benchmark - prestadores perto de um ponto: R*Tree x caixa em índice x varredura
+# ========================
+
+''' Como rodar (na raiz do projeto):
+    python benchmarks/bench_proximidade.py --prestadores 100000 --consultas 500
+
+Cria N prestadores com localização (70% em volta de capitais, 30% espalhados
+pelo Brasil) num SQLite em arquivo temporário e mede ms por busca de:
+- rtree: buscar_proximos no SQLite (caixa no R*Tree + haversine)
+- caixa_indice: mesma busca pelo índice (latitude, longitude), como nos outros bancos
+- varredura: haversine em todas as linhas (sem índice)
+Confere também que os três devolvem os mesmos prestadores.
+'''
+
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import select  # noqa: E402
+
+from servicosdigitais.app import criar_app, bancodedados  # noqa: E402
+from servicosdigitais.app.config import ConfigTeste  # noqa: E402
+from servicosdigitais.app.models import Usuario, PrestadorServico, Localizacao  # noqa: E402
+from servicosdigitais.app.servicos import localizacao_servico  # noqa: E402
+from servicosdigitais.app.utilidades.normalizadores import normalizar_texto  # noqa: E402
+
+CAPITAIS = (
+    ('São Paulo', 'SP', -23.5505, -46.6333),
+    ('Rio de Janeiro', 'RJ', -22.9068, -43.1729),
+    ('Belo Horizonte', 'MG', -19.9167, -43.9345),
+    ('Brasília', 'DF', -15.7939, -47.8828),
+    ('Salvador', 'BA', -12.9714, -38.5014),
+    ('Curitiba', 'PR', -25.4284, -49.2733),
+    ('Porto Alegre', 'RS', -30.0346, -51.2177),
+    ('Recife', 'PE', -8.0476, -34.8770),
+    ('Fortaleza', 'CE', -3.7319, -38.5267),
+    ('Manaus', 'AM', -3.1190, -60.0217),
+)
+ESPECIALIDADES = ('Eletricista', 'Pintor', 'Encanador', 'Pedreiro', 'Jardineiro')
+TAMANHO_LOTE = 5000
+
+
+def criar(arquivo):
+    class Config(ConfigTeste):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + arquivo
+
+    app = criar_app(Config)
+    with app.app_context():
+        bancodedados.create_all()
+    return app
+
+
+def popular(app, quantidade, semente=11):
+    aleatorio = random.Random(semente)
+    t_usuario = Usuario.__table__
+    t_prestador = PrestadorServico.__table__
+    t_localizacao = Localizacao.__table__
+
+    with app.app_context():
+        conexao = bancodedados.session.connection()
+        for inicio in range(0, quantidade, TAMANHO_LOTE):
+            ids = range(inicio + 1, min(inicio + TAMANHO_LOTE, quantidade) + 1)
+            usuarios, prestadores, localizacoes = [], [], []
+            for i in ids:
+                especialidade = aleatorio.choice(ESPECIALIDADES)
+                if aleatorio.random() < 0.7:
+                    cidade, uf, lat, lon = aleatorio.choice(CAPITAIS)
+                    lat += aleatorio.gauss(0, 0.2)
+                    lon += aleatorio.gauss(0, 0.2)
+                else:
+                    cidade, uf = 'Interior', None
+                    lat, lon = aleatorio.uniform(-33, 5), aleatorio.uniform(-74, -35)
+                usuarios.append({
+                    'id': i, 'nome': f'Prestador {i}', 'email': f'p{i}@bench.com',
+                    'senha_hash': 'x', 'tipo': 'prestador', 'ativo': True,
+                })
+                prestadores.append({'id': i, 'cnpj': f'{i:014d}', 'especialidade': especialidade})
+                localizacoes.append({
+                    'prestador_id': i, 'cidade': cidade, 'estado': uf,
+                    'cidade_norm': normalizar_texto(cidade),
+                    'especialidade_norm': normalizar_texto(especialidade),
+                    'nome': f'Prestador {i}', 'latitude': lat, 'longitude': lon,
+                })
+            conexao.execute(t_usuario.insert(), usuarios)
+            conexao.execute(t_prestador.insert(), prestadores)
+            conexao.execute(t_localizacao.insert(), localizacoes)
+        bancodedados.session.commit()
+        conexao = bancodedados.session.connection()
+        conexao.exec_driver_sql('ANALYZE')
+        bancodedados.session.commit()
+
+
+def varredura(lat, lon, raio_km, limite):
+    """Referência sem índice: distância de todas as linhas."""
+    linhas = bancodedados.session.execute(select(
+        Localizacao.prestador_id, Localizacao.nome, Localizacao.latitude, Localizacao.longitude
+    ).where(Localizacao.latitude.isnot(None)))
+    proximos = []
+    for prestador_id, nome, p_lat, p_lon in linhas:
+        distancia = localizacao_servico.distancia_km(lat, lon, p_lat, p_lon)
+        if distancia <= raio_km:
+            proximos.append(localizacao_servico.Proximo(prestador_id, nome, distancia))
+    proximos.sort(key=lambda p: (p.distancia_km, p.id))
+    return proximos[:limite]
+
+
+def pontos(quantidade, semente=5):
+    aleatorio = random.Random(semente)
+    resultado = []
+    for _ in range(quantidade):
+        _cidade, _uf, lat, lon = aleatorio.choice(CAPITAIS)
+        resultado.append((lat + aleatorio.gauss(0, 0.1), lon + aleatorio.gauss(0, 0.1)))
+    return resultado
+
+
+def medir(funcao, consultas, raio_km, limite):
+    tempos, resultados = [], []
+    for lat, lon in consultas:
+        inicio = time.perf_counter()
+        resultado = funcao(lat, lon, raio_km, limite=limite)
+        tempos.append(time.perf_counter() - inicio)
+        resultados.append([p.id for p in resultado])
+    tempos.sort()
+    p95 = tempos[min(len(tempos) - 1, math.ceil(len(tempos) * 0.95) - 1)]
+    return statistics.median(tempos) * 1e3, p95 * 1e3, resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--prestadores', type=int, default=100000)
+    parser.add_argument('--consultas', type=int, default=500)
+    parser.add_argument('--raio', type=float, default=10.0, help='km')
+    parser.add_argument('--limite', type=int, default=50)
+    parser.add_argument('--varredura', type=int, default=20,
+                        help='consultas medidas na varredura (é lenta)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        app = criar(os.path.join(pasta, 'bench.sqlite'))
+        inicio = time.perf_counter()
+        popular(app, args.prestadores)
+        print(f'{args.prestadores} prestadores criados em {time.perf_counter() - inicio:.1f}s')
+
+        consultas = pontos(args.consultas)
+        buscar = localizacao_servico.buscar_proximos
+
+        with app.app_context():
+            medir(buscar, consultas[:20], args.raio, args.limite)  # aquece
+
+            t_rtree = medir(buscar, consultas, args.raio, args.limite)
+
+            original = localizacao_servico._usa_rtree
+            localizacao_servico._usa_rtree = lambda: False  # força a caixa no índice B-tree
+            try:
+                t_caixa = medir(buscar, consultas, args.raio, args.limite)
+            finally:
+                localizacao_servico._usa_rtree = original
+
+            t_varredura = medir(varredura, consultas[:args.varredura], args.raio, args.limite)
+
+        print(f'raio {args.raio:g} km, até {args.limite} resultados')
+        print(f'{"modo":<13} {"mediana ms":>11} {"p95 ms":>8}')
+        for nome, (mediana, p95, resultados) in (
+            ('rtree', t_rtree), ('caixa_indice', t_caixa), ('varredura', t_varredura)
+        ):
+            if resultados != t_rtree[2][:len(resultados)]:
+                print(f'{nome}: resultado divergiu do rtree!')
+            print(f'{nome:<13} {mediana:>11.2f} {p95:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+# ========================
+# Benchmark - SQLite padrão x perfil de produção (WAL + PRAGMAs)
+# ========================
+
+''' Como rodar (na raiz do projeto):
+    python benchmarks/bench_sqlite_pragmas.py --escritores 4 --leitores 8 --segundos 5
+
+Cada perfil usa um arquivo novo. Escritores fazem INSERT + COMMIT
+(como as tentativas de login e os chamados de suporte); leitores fazem
+SELECTs curtos. Mede operações/s e erros "database is locked".
+'''
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from servicosdigitais.app.config import ConfigProducao  # noqa: E402
+from servicosdigitais.app.utilidades.banco import aplicar_pragmas  # noqa: E402
+
+
+def criar_engine(caminho, producao):
+    if not producao:
+        # como o app hoje: sem opções de engine, sem PRAGMAs
+        return create_engine(f'sqlite:///{caminho}')
+
+    engine = create_engine(
+        f'sqlite:///{caminho}',
+        connect_args=ConfigProducao.SQLITE_CONNECT_ARGS,
+        **ConfigProducao.SQLALCHEMY_ENGINE_OPTIONS
+    )
+
+    @event.listens_for(engine, 'connect')
+    def _ao_conectar(conexao_dbapi, registro):
+        aplicar_pragmas(conexao_dbapi, ConfigProducao.SQLITE_PRAGMAS)
+
+    return engine
+
+
+def rodar(producao, escritores, leitores, segundos):
+    pasta = tempfile.mkdtemp()
+    engine = criar_engine(os.path.join(pasta, 'bench.db'), producao)
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE evento (id INTEGER PRIMARY KEY, usuario_id INTEGER, '
+            'descricao TEXT, criado_em REAL)'
+        ))
+        conn.execute(text('CREATE INDEX ix_evento_usuario ON evento (usuario_id)'))
+
+    contagem = {'escritas': 0, 'leituras': 0, 'bloqueios': 0}
+    trava = threading.Lock()
+    fim = time.perf_counter() + segundos
+
+    def somar(chave):
+        with trava:
+            contagem[chave] += 1
+
+    def escritor(n):
+        while time.perf_counter() < fim:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        text('INSERT INTO evento (usuario_id, descricao, criado_em) VALUES (:u, :d, :t)'),
+                        {'u': n, 'd': 'falha de login', 't': time.time()}
+                    )
+                somar('escritas')
+            except OperationalError:
+                somar('bloqueios')
+
+    def leitor(n):
+        while time.perf_counter() < fim:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(
+                        text('SELECT count(*) FROM evento WHERE usuario_id = :u'), {'u': n % 4}
+                    ).scalar()
+                somar('leituras')
+            except OperationalError:
+                somar('bloqueios')
+
+    threads = (
+        [threading.Thread(target=escritor, args=(i,)) for i in range(escritores)]
+        + [threading.Thread(target=leitor, args=(i,)) for i in range(leitores)]
+    )
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    engine.dispose()
+    return contagem
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--escritores', type=int, default=4)
+    parser.add_argument('--leitores', type=int, default=8)
+    parser.add_argument('--segundos', type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f'{args.escritores} escritores, {args.leitores} leitores, {args.segundos}s por perfil')
+    print(f'{"perfil":<10} {"escritas/s":>12} {"leituras/s":>12} {"bloqueios":>10}')
+    for nome, producao in (('padrao', False), ('producao', True)):
+        c = rodar(producao, args.escritores, args.leitores, args.segundos)
+        print(
+            f'{nome:<10} {c["escritas"] / args.segundos:>12.0f} '
+            f'{c["leituras"] / args.segundos:>12.0f} {c["bloqueios"]:>10}'
+        )
+
+
+if __name__ == '__main__':
+    main()
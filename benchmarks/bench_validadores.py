@@ -0,0 +1,95 @@
+# ========================
+# Benchmark - validação de CPF/CNPJ: um a um x em lote (NumPy / Python puro)
+# ========================
+
+''' Como rodar (na raiz do projeto):
+    python benchmarks/bench_validadores.py --quantidade 200000
+
+Gera documentos aleatórios (metade com dígitos verificadores corretos)
+e mede documentos/s de:
+- escalar: validar_cpf / validar_cnpj em loop
+- lote_python: validar_cpfs / validar_cnpjs sem NumPy
+- lote_numpy: validar_cpfs / validar_cnpjs com NumPy (se instalado)
+Confere também que os três dão o mesmo resultado.
+'''
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from servicosdigitais.app.utilidades import validadores  # noqa: E402
+from servicosdigitais.app.utilidades.validadores import (  # noqa: E402
+    PESOS_CPF, PESOS_CNPJ, validar_cpf, validar_cnpj, validar_cpfs, validar_cnpjs
+)
+
+
+def _digito(base, pesos):
+    resto = sum(int(d) * p for d, p in zip(base, pesos)) % 11
+    return '0' if resto < 2 else str(11 - resto)
+
+
+def gerar(quantidade, tamanho, pesos, semente=42):
+    aleatorio = random.Random(semente)
+    documentos = []
+    for i in range(quantidade):
+        base = ''.join(aleatorio.choice('0123456789') for _ in range(tamanho - 2))
+        if i % 2:
+            documentos.append(base + aleatorio.choice('0123456789') * 2)
+            continue
+        d1 = _digito(base, pesos[0])
+        documentos.append(base + d1 + _digito(base + d1, pesos[1]))
+    return documentos
+
+
+def cronometrar(funcao, documentos):
+    inicio = time.perf_counter()
+    resultado = [bool(v) for v in funcao(documentos)]
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--quantidade', type=int, default=200000)
+    args = parser.parse_args()
+
+    tem_numpy = validadores._numpy() is not None
+    if not tem_numpy:
+        print('(NumPy não instalado: lote_numpy fica de fora)')
+
+    casos = (
+        ('cpf', 11, PESOS_CPF, validar_cpf, validar_cpfs),
+        ('cnpj', 14, PESOS_CNPJ, validar_cnpj, validar_cnpjs),
+    )
+
+    print(f'{"doc":<5} {"modo":<12} {"segundos":>9} {"docs/s":>12} {"x escalar":>10}')
+    for nome, tamanho, pesos, escalar, lote in casos:
+        documentos = gerar(args.quantidade, tamanho, pesos)
+
+        referencia, t_escalar = cronometrar(lambda docs: [escalar(d) for d in docs], documentos)
+        tempos = [('escalar', t_escalar, referencia)]
+
+        original = validadores._numpy
+        validadores._numpy = lambda: None  # força o caminho em Python puro
+        try:
+            resultado, segundos = cronometrar(lote, documentos)
+        finally:
+            validadores._numpy = original
+        tempos.append(('lote_python', segundos, resultado))
+
+        if tem_numpy:
+            resultado, segundos = cronometrar(lote, documentos)
+            tempos.append(('lote_numpy', segundos, resultado))
+
+        for modo, segundos, resultado in tempos:
+            if resultado != referencia:
+                print(f'{nome}: {modo} divergiu do escalar!')
+            print(f'{nome:<5} {modo:<12} {segundos:>9.3f} '
+                  f'{len(documentos) / segundos:>12.0f} {t_escalar / segundos:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
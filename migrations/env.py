@@ -45,6 +45,17 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+# Tabelas fora dos modelos (R*Tree do SQLite e suas tabelas-sombra):
+# criadas à mão nas migrações, o autogenerate não deve tentar removê-las
+TABELAS_IGNORADAS = ('localizacao_rtree',)
+
+
+def include_name(name, type_, parent_names):
+    if type_ == 'table':
+        return not (name or '').startswith(TABELAS_IGNORADAS)
+    return True
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
@@ -65,7 +76,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_name=include_name
     )
 
     with context.begin_transaction():
@@ -100,6 +112,7 @@ def run_migrations_online():
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
+            include_name=include_name,
             **conf_args
         )
 
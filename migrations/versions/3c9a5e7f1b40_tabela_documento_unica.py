@@ -0,0 +1,96 @@
+"""Tabela documento: CPF/CNPJ de todas as contas com índice único
+
+Revision ID: 3c9a5e7f1b40
+Revises: 8d4e6b1c2a37
+Create Date: 2026-10-19 12:00:00.000000
+
+- documento(numero, tipo, usuario_id) com ix_documento_numero único
+- Preenchida a partir de cliente_cpf, cliente_cnpj e prestador_servico
+  (números repetidos entre tabelas ficam só na primeira conta; avisa no log
+  do Alembic — as contas que ficaram de fora só entram pelo e-mail)
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9a5e7f1b40'
+down_revision = '8d4e6b1c2a37'
+branch_labels = None
+depends_on = None
+
+ORIGENS = (
+    # tabela, coluna, tipo
+    ('cliente_cpf', 'cpf', 'cpf'),
+    ('cliente_cnpj', 'cnpj', 'cnpj'),
+    ('prestador_servico', 'cnpj', 'cnpj'),
+)
+
+
+def _preencher(conexao, documento, nome_tabela, nome_coluna, tipo):
+    """INSERT ... SELECT dos números que ainda não estão em documento."""
+    origem = sa.table(nome_tabela, sa.column('id', sa.Integer), sa.column(nome_coluna))
+    numero = origem.c[nome_coluna]
+
+    ja_existe = sa.exists().where(documento.c.numero == numero)
+    selecao = (
+        sa.select(numero, sa.literal(tipo), origem.c.id)
+        .where(numero.is_not(None))
+        .where(~ja_existe)
+        .order_by(origem.c.id)
+    )
+    conexao.execute(
+        documento.insert().from_select(['numero', 'tipo', 'usuario_id'], selecao)
+    )
+
+    repetidos = conexao.scalar(
+        sa.select(sa.func.count())
+        .select_from(origem)
+        .join(documento, documento.c.numero == numero)
+        .where(documento.c.usuario_id != origem.c.id)
+    )
+    if repetidos:
+        logger.warning(
+            '[documento] %s conta(s) de %s com %s já usado por outra conta: '
+            'ficaram fora da tabela documento e não conseguem mais entrar '
+            'pelo documento (só pelo e-mail) até o cadastro ser corrigido',
+            repetidos, nome_tabela, tipo
+        )
+
+
+def upgrade():
+    op.create_table(
+        'documento',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('numero', sa.String(length=14), nullable=False),
+        sa.Column('tipo', sa.String(length=4), nullable=False),
+        sa.Column('usuario_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['usuario_id'], ['usuario.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('documento', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_documento_numero'), ['numero'], unique=True)
+        batch_op.create_index(batch_op.f('ix_documento_usuario_id'), ['usuario_id'], unique=True)
+
+    conexao = op.get_bind()
+    documento = sa.table(
+        'documento',
+        sa.column('numero', sa.String),
+        sa.column('tipo', sa.String),
+        sa.column('usuario_id', sa.Integer),
+    )
+    for tabela, coluna, tipo in ORIGENS:
+        _preencher(conexao, documento, tabela, coluna, tipo)
+
+
+def downgrade():
+    with op.batch_alter_table('documento', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_documento_usuario_id'))
+        batch_op.drop_index(batch_op.f('ix_documento_numero'))
+
+    op.drop_table('documento')
@@ -0,0 +1,30 @@
+"""Coluna usuario.versao (trava otimista)
+
+Revision ID: 5e2f8a9c4d61
+Revises: 3c9a5e7f1b40
+Create Date: 2026-10-19 14:00:00.000000
+
+- versao INTEGER NOT NULL DEFAULT 1 (version_id_col do modelo Usuario)
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2f8a9c4d61'
+down_revision = '3c9a5e7f1b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('usuario', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column('versao', sa.Integer(), server_default='1', nullable=False)
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('usuario', schema=None) as batch_op:
+        batch_op.drop_column('versao')
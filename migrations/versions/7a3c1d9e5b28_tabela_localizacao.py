@@ -0,0 +1,51 @@
+"""Tabela localizacao (cidade/UF do prestador) com índice de busca
+
+Revision ID: 7a3c1d9e5b28
+Revises: 5e2f8a9c4d61
+Create Date: 2026-10-19 16:00:00.000000
+
+- localizacao: uma linha por prestador (prestador_id único)
+- cidade_norm: cidade sem acento / caixa (chave de busca)
+- especialidade_norm, nome: cópias do prestador
+- ix_localizacao_busca (cidade_norm, especialidade_norm, nome)
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3c1d9e5b28'
+down_revision = '5e2f8a9c4d61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'localizacao',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('prestador_id', sa.Integer(), nullable=False),
+        sa.Column('cidade', sa.String(length=100), nullable=False),
+        sa.Column('estado', sa.CHAR(length=2), nullable=True),
+        sa.Column('cidade_norm', sa.String(length=100), nullable=False),
+        sa.Column('especialidade_norm', sa.String(length=120), nullable=False),
+        sa.Column('nome', sa.String(length=100), nullable=False),
+        sa.ForeignKeyConstraint(['prestador_id'], ['prestador_servico.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('localizacao', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_localizacao_prestador_id'), ['prestador_id'], unique=True)
+        batch_op.create_index(batch_op.f('ix_localizacao_estado'), ['estado'], unique=False)
+        batch_op.create_index(
+            'ix_localizacao_busca', ['cidade_norm', 'especialidade_norm', 'nome'], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('localizacao', schema=None) as batch_op:
+        batch_op.drop_index('ix_localizacao_busca')
+        batch_op.drop_index(batch_op.f('ix_localizacao_estado'))
+        batch_op.drop_index(batch_op.f('ix_localizacao_prestador_id'))
+
+    op.drop_table('localizacao')
@@ -0,0 +1,129 @@
+"""CPF/CNPJ como CHAR de largura fixa com índice único
+
+Revision ID: 8d4e6b1c2a37
+Revises: 1f191ff04732
+Create Date: 2026-10-19 10:00:00.000000
+
+- cliente_cpf.cpf: String(11) + UNIQUE sem nome → CHAR(11) + ix_cliente_cpf_cpf (único)
+- cliente_cnpj.cnpj / prestador_servico.cnpj: Integer → CHAR(14)
+- Linhas existentes convertidas em lotes: só dígitos, com zeros à esquerda
+  (CNPJs guardados como inteiro tinham perdido os zeros)
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d4e6b1c2a37'
+down_revision = '1f191ff04732'
+branch_labels = None
+depends_on = None
+
+TAMANHO_LOTE = 1000
+
+# Dá nome à UNIQUE(cpf) criada sem nome na primeira migração (SQLite)
+CONVENCAO_NOMES = {'uq': 'uq_%(table_name)s_%(column_0_name)s'}
+
+DOCUMENTOS = (
+    # tabela, coluna, largura, era inteiro (completa com zeros à esquerda)
+    ('cliente_cpf', 'cpf', 11, False),
+    ('cliente_cnpj', 'cnpj', 14, True),
+    ('prestador_servico', 'cnpj', 14, True),
+)
+
+
+def _normalizar(valor, largura, era_inteiro):
+    """Só dígitos; zeros à esquerda apenas para o que era coluna inteira."""
+    if valor is None:
+        return None
+    digitos = ''.join(ch for ch in str(valor) if '0' <= ch <= '9')
+    if not digitos:
+        return None
+    return digitos.zfill(largura) if era_inteiro else digitos
+
+
+def _normalizar_em_lotes(nome_tabela, nome_coluna, largura, era_inteiro):
+    """Percorre a tabela por id (keyset) e regrava só as linhas que mudam."""
+    conexao = op.get_bind()
+    tabela = sa.table(nome_tabela, sa.column('id', sa.Integer), sa.column(nome_coluna))
+    coluna = tabela.c[nome_coluna]
+
+    atualizar = (
+        sa.update(tabela)
+        .where(tabela.c.id == sa.bindparam('id_alvo'))
+        .values({nome_coluna: sa.bindparam('novo')})
+    )
+
+    ultimo_id = 0
+    while True:
+        linhas = conexao.execute(
+            sa.select(tabela.c.id, coluna)
+            .where(tabela.c.id > ultimo_id)
+            .order_by(tabela.c.id)
+            .limit(TAMANHO_LOTE)
+        ).all()
+        if not linhas:
+            break
+
+        mudancas = []
+        for id_linha, valor in linhas:
+            novo = _normalizar(valor, largura, era_inteiro)
+            if novo != valor:
+                mudancas.append({'id_alvo': id_linha, 'novo': novo})
+        if mudancas:
+            conexao.execute(atualizar, mudancas)
+
+        ultimo_id = linhas[-1][0]
+
+
+def upgrade():
+    # 1) tipo novo; índices antigos saem (recriados com os dados já limpos)
+    with op.batch_alter_table(
+        'cliente_cpf', schema=None, naming_convention=CONVENCAO_NOMES
+    ) as batch_op:
+        batch_op.drop_constraint('uq_cliente_cpf_cpf', type_='unique')
+        batch_op.alter_column(
+            'cpf', existing_type=sa.String(length=11), type_=sa.CHAR(length=11),
+            existing_nullable=True
+        )
+
+    for tabela in ('cliente_cnpj', 'prestador_servico'):
+        with op.batch_alter_table(tabela, schema=None) as batch_op:
+            batch_op.drop_index(batch_op.f(f'ix_{tabela}_cnpj'))
+            batch_op.alter_column(
+                'cnpj', existing_type=sa.Integer(), type_=sa.CHAR(length=14),
+                existing_nullable=False,
+                postgresql_using="lpad(cnpj::text, 14, '0')"
+            )
+
+    # 2) dados: só dígitos, largura fixa
+    for tabela, coluna, largura, era_inteiro in DOCUMENTOS:
+        _normalizar_em_lotes(tabela, coluna, largura, era_inteiro)
+
+    # 3) índices únicos (busca exata no login / cadastro / importação)
+    for tabela, coluna, _largura, _era_inteiro in DOCUMENTOS:
+        with op.batch_alter_table(tabela, schema=None) as batch_op:
+            batch_op.create_index(batch_op.f(f'ix_{tabela}_{coluna}'), [coluna], unique=True)
+
+
+def downgrade():
+    for tabela, coluna, _largura, _era_inteiro in DOCUMENTOS:
+        with op.batch_alter_table(tabela, schema=None) as batch_op:
+            batch_op.drop_index(batch_op.f(f'ix_{tabela}_{coluna}'))
+
+    for tabela in ('cliente_cnpj', 'prestador_servico'):
+        with op.batch_alter_table(tabela, schema=None) as batch_op:
+            batch_op.alter_column(
+                'cnpj', existing_type=sa.CHAR(length=14), type_=sa.Integer(),
+                existing_nullable=False,
+                postgresql_using='cnpj::bigint'
+            )
+            batch_op.create_index(batch_op.f(f'ix_{tabela}_cnpj'), ['cnpj'], unique=True)
+
+    with op.batch_alter_table('cliente_cpf', schema=None) as batch_op:
+        batch_op.alter_column(
+            'cpf', existing_type=sa.CHAR(length=11), type_=sa.String(length=11),
+            existing_nullable=True
+        )
+        batch_op.create_unique_constraint('uq_cliente_cpf_cpf', ['cpf'])
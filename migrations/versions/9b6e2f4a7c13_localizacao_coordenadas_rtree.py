@@ -0,0 +1,78 @@
+"""Coordenadas na localizacao + índice espacial (R*Tree no SQLite)
+
+Revision ID: 9b6e2f4a7c13
+Revises: 7a3c1d9e5b28
+Create Date: 2026-10-19 18:00:00.000000
+
+- localizacao.latitude / longitude (FLOAT, opcionais)
+- ix_localizacao_coordenadas (latitude, longitude): caixa delimitadora
+  nos bancos sem R*Tree
+- SQLite: tabela virtual localizacao_rtree + triggers que a mantêm,
+  preenchida com as coordenadas já existentes
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b6e2f4a7c13'
+down_revision = '7a3c1d9e5b28'
+branch_labels = None
+depends_on = None
+
+RTREE = 'localizacao_rtree'
+
+DDL_RTREE = (
+    f"CREATE VIRTUAL TABLE {RTREE} USING rtree(id, min_lat, max_lat, min_lon, max_lon)",
+    f"""CREATE TRIGGER {RTREE}_ai AFTER INSERT ON localizacao
+        WHEN new.latitude IS NOT NULL AND new.longitude IS NOT NULL
+        BEGIN
+            INSERT INTO {RTREE}
+            VALUES (new.id, new.latitude, new.latitude, new.longitude, new.longitude);
+        END""",
+    f"""CREATE TRIGGER {RTREE}_au AFTER UPDATE OF latitude, longitude ON localizacao
+        BEGIN
+            DELETE FROM {RTREE} WHERE id = old.id;
+            INSERT INTO {RTREE}
+            SELECT new.id, new.latitude, new.latitude, new.longitude, new.longitude
+            WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL;
+        END""",
+    f"""CREATE TRIGGER {RTREE}_ad AFTER DELETE ON localizacao
+        BEGIN
+            DELETE FROM {RTREE} WHERE id = old.id;
+        END""",
+)
+
+
+def _sqlite():
+    return op.get_bind().dialect.name == 'sqlite'
+
+
+def upgrade():
+    with op.batch_alter_table('localizacao', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('latitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('longitude', sa.Float(), nullable=True))
+        batch_op.create_index('ix_localizacao_coordenadas', ['latitude', 'longitude'], unique=False)
+
+    # depois do batch: o batch do SQLite recria a tabela e levaria os triggers
+    if _sqlite():
+        for comando in DDL_RTREE:
+            op.execute(comando)
+        op.execute(
+            f"INSERT INTO {RTREE} "
+            "SELECT id, latitude, latitude, longitude, longitude FROM localizacao "
+            "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+        )
+
+
+def downgrade():
+    if _sqlite():
+        for sufixo in ('ai', 'au', 'ad'):
+            op.execute(f"DROP TRIGGER IF EXISTS {RTREE}_{sufixo}")
+        op.execute(f"DROP TABLE IF EXISTS {RTREE}")
+
+    with op.batch_alter_table('localizacao', schema=None) as batch_op:
+        batch_op.drop_index('ix_localizacao_coordenadas')
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
@@ -0,0 +1,47 @@
+"""Índice único em lower(usuario.email)
+
+Revision ID: c4b8d2e6f1a9
+Revises: 9b6e2f4a7c13
+Create Date: 2026-10-19 20:00:00.000000
+
+- ix_usuario_email_unico: UNIQUE (lower(email)); dois cadastros
+  simultâneos com o mesmo e-mail não passam mais os dois
+- Se já houver e-mails repetidos (ignorando caixa), a migração para
+  e lista quantos são: corrija as contas e rode de novo
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4b8d2e6f1a9'
+down_revision = '9b6e2f4a7c13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conexao = op.get_bind()
+    usuario = sa.table('usuario', sa.column('email'))
+    email = sa.func.lower(usuario.c.email)
+
+    repetidos = conexao.scalar(
+        sa.select(sa.func.count()).select_from(
+            sa.select(email).group_by(email).having(sa.func.count() > 1).subquery()
+        )
+    )
+    if repetidos:
+        raise RuntimeError(
+            f'[usuario] {repetidos} e-mail(s) usado(s) por mais de uma conta '
+            '(SELECT lower(email), count(*) FROM usuario GROUP BY 1 HAVING count(*) > 1). '
+            'Corrija ou junte essas contas antes de criar o índice único.'
+        )
+
+    op.create_index(
+        'ix_usuario_email_unico', 'usuario', [sa.text('lower(email)')], unique=True
+    )
+
+
+def downgrade():
+    op.drop_index('ix_usuario_email_unico', table_name='usuario')
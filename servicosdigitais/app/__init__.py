@@ -1,25 +1,50 @@
+import os
+
 from flask import Flask
 
-from servicosdigitais.app.config import ConfigPadrao
+from servicosdigitais.app.config import obter_config
+from servicosdigitais.app.utilidades.logs import configurar_logs
+from servicosdigitais.app.utilidades.banco import configurar_engines, configurar_sqlite
+from servicosdigitais.app.utilidades.templates import configurar_templates
+from servicosdigitais.app.utilidades.assets import configurar_assets
+from servicosdigitais.app.utilidades.fotos import configurar_fotos
+from servicosdigitais.app.utilidades.compressao import configurar_compressao
 from servicosdigitais.app.extensoes import (
     bancodedados,
     bcrypt,
     login_manager,
     csrf,
-    migrate
+    migrate,
+    cache
 )
 
 
-def criar_app():
+def criar_app(config=None):
     """
     Fábrica da aplicação Flask.
 
+    config: classe de configuração (ex.: ConfigProducao) ou nome do perfil
+    ('desenvolvimento' | 'producao' | 'teste'). Sem valor, usa a variável
+    de ambiente SERVICOS_AMBIENTE.
+
     Responsável por:
     - Criar o app
     - Carregar configurações
+    - Criar a pasta instance (se necessário)
+    - Configurar log em arquivo (com rotação)
+    - Opções de engine por banco (connect_args do SQLite só no SQLite)
     - Inicializar extensões
+    - Aplicar PRAGMAs do SQLite (se o perfil definir)
     - Registrar user_loader
+    - Registrar filtros dos templates (formatação/máscaras)
     - Registrar blueprints
+    - Registrar comandos de terminal
+    - Arquivos estáticos com hash (/assets, url_static)
+    - Fotos de perfil com cache (/fotos, url_foto)
+    - Autorização central (tabela de políticas por rota)
+    - Ligar a instrumentação (métricas por endpoint)
+    - Cache de bytecode / pré-compilação dos templates
+    - Compressão gzip/brotli das respostas
     """
 
     # ===========================
@@ -30,17 +55,38 @@ def criar_app():
     # ===========================
     # Configurações
     # ===========================
-    app.config.from_object(ConfigPadrao)
+    if config is None or isinstance(config, str):
+        config = obter_config(config)
+    app.config.from_object(config)
+
+    # Pasta instance (banco SQLite, logs) só é criada aqui
+    if app.config.get('INSTANCIA_DIR'):
+        os.makedirs(app.config['INSTANCIA_DIR'], exist_ok=True)
+
+    # ===========================
+    # Log em arquivo (RotatingFileHandler)
+    # ===========================
+    configurar_logs(app)
+
+    # ===========================
+    # Opções de engine por banco (connect_args do SQLite só no SQLite)
+    # ===========================
+    configurar_engines(app)
 
     # ===========================
     # Inicializar extensões
     # ===========================
     bancodedados.init_app(app)
-    migrate.init_app(app, bancodedados)
+    migrate.init_app(app, bancodedados)  # só no CLI (flask db ...)
     bcrypt.init_app(app)
     login_manager.init_app(app)
     csrf.init_app(app)
+    cache.init_app(app)
 
+    # ===========================
+    # SQLite: PRAGMAs em cada conexão nova
+    # ===========================
+    configurar_sqlite(app)
 
     # ===========================
     # Registrar user_loader
@@ -48,6 +94,7 @@ def criar_app():
     registrar_user_loader()
 
     registrar_contexto_global(app)
+    registrar_filtros(app)
 
     # ===========================
     # Registrar blueprints
@@ -63,16 +110,79 @@ def criar_app():
     app.register_blueprint(suporte_bp)
     app.register_blueprint(admin_bp)
 
+    # ===========================
+    # Arquivos estáticos com hash
+    # ===========================
+    configurar_assets(app)
+    configurar_fotos(app)
+
+    # ===========================
+    # Autorização (política por rota, compilada depois das rotas)
+    # ===========================
+    from servicosdigitais.app.utilidades.autorizacao import configurar_autorizacao
+    configurar_autorizacao(app)
+
+    # ===========================
+    # Comandos de terminal
+    # ===========================
+    from servicosdigitais.app.comandos import registrar_comandos
+    registrar_comandos(app)
+
+    # ===========================
+    # Instrumentação (depois dos blueprints: endpoints pré-alocados)
+    # ===========================
+    from servicosdigitais.app.utilidades.instrumentacao import configurar_instrumentacao
+    configurar_instrumentacao(app)
+
+    # ===========================
+    # Templates (cache de bytecode; pré-compila em produção)
+    # ===========================
+    configurar_templates(app)
+
+    # ===========================
+    # Compressão (gzip/brotli) das respostas
+    # ===========================
+    configurar_compressao(app)
+
     return app
 
 def registrar_contexto_global(app):
-    from servicosdigitais.app.forms.autenticacao_forms import FormLogout
+    """
+    Variáveis globais dos templates.
+
+    form_logout é um proxy: o FormLogout (e o token CSRF) só é criado
+    quando o template usa o valor, uma vez por requisição (guardado no g).
+    Páginas de visitante não montam o formulário.
+
+    conteudo('chave', padrao) / imagens_site(): conteúdo do site em
+    memória (servicos/conteudo_servico.py).
+    """
+    from flask import g
+    from werkzeug.local import LocalProxy
+
+    def _obter_form_logout():
+        if 'form_logout' not in g:
+            from servicosdigitais.app.forms.autenticacao_forms import FormLogout
+            g.form_logout = FormLogout()
+        return g.form_logout
+
+    app.jinja_env.globals['form_logout'] = LocalProxy(_obter_form_logout)
+
+    # textos / imagens do site: dicionário do processo, sem consulta por página
+    from servicosdigitais.app.servicos.conteudo_servico import conteudo, listar_imagens
+
+    app.jinja_env.globals['conteudo'] = conteudo
+    app.jinja_env.globals['imagens_site'] = listar_imagens
+
+
+def registrar_filtros(app):
+    """
+    Filtros de formatação/máscara nos templates
+    (ex.: {{ usuario.telefone|formatar_telefone }}).
+    """
+    from servicosdigitais.app.utilidades.normalizadores import FILTROS_JINJA
 
-    @app.context_processor
-    def injetar_forms_globais():
-        return {
-            'form_logout': FormLogout()
-        }
+    app.jinja_env.filters.update(FILTROS_JINJA)
 
 
 def registrar_user_loader():
@@ -0,0 +1,103 @@
+# ========================
+# Comandos de terminal (flask <comando>)
+# ========================
+
+''' O que tem neste arquivo:
+- flask importar-prestadores ARQUIVO  → importação em lote (CSV/JSONL)
+- flask compilar-templates           → pré-compila os templates (deploy)
+- flask gerar-assets                 → static/dist com hash + .gz/.br (deploy)
+'''
+
+import csv
+import os
+
+import click
+
+
+def registrar_comandos(app):
+    """
+    Registra os comandos customizados no CLI do Flask.
+    """
+
+    @app.cli.command('importar-prestadores')
+    @click.argument('arquivo', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--formato', type=click.Choice(['csv', 'jsonl']), default=None,
+                  help='Formato do arquivo (padrão: pela extensão).')
+    @click.option('--ativar', is_flag=True, default=False,
+                  help='Cria os prestadores já aprovados.')
+    @click.option('--bloco', type=int, default=None,
+                  help='Registros por bloco/transação.')
+    @click.option('--rejeitados', type=click.Path(dir_okay=False), default=None,
+                  help='Grava as linhas rejeitadas neste CSV.')
+    def importar_prestadores_cmd(arquivo, formato, ativar, bloco, rejeitados):
+        """Importa prestadores e serviços de um arquivo CSV ou JSONL."""
+        from servicosdigitais.app.servicos.importacao_servico import (
+            importar_prestadores, TAMANHO_BLOCO_IMPORTACAO
+        )
+
+        if not formato:
+            formato = 'jsonl' if arquivo.lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+
+        def progresso(resultado):
+            click.echo(
+                f"bloco {resultado.blocos}: lidos={resultado.lidos} "
+                f"importados={resultado.importados} rejeitados={len(resultado.rejeitados)}"
+            )
+
+        with open(arquivo, 'r', encoding='utf-8-sig', newline='') as f:
+            resultado = importar_prestadores(
+                f,
+                formato=formato,
+                ativar=ativar,
+                tamanho_bloco=bloco or TAMANHO_BLOCO_IMPORTACAO,
+                ao_progresso=progresso
+            )
+
+        if rejeitados and resultado.rejeitados:
+            pasta = os.path.dirname(os.path.abspath(rejeitados))
+            os.makedirs(pasta, exist_ok=True)
+            with open(rejeitados, 'w', encoding='utf-8', newline='') as saida:
+                escritor = csv.DictWriter(saida, fieldnames=['linha', 'motivo', 'identificador'])
+                escritor.writeheader()
+                escritor.writerows(resultado.rejeitados)
+            click.echo(f"Rejeitados gravados em {rejeitados}")
+
+        click.echo(
+            f"Concluído: {resultado.importados} prestador(es), "
+            f"{resultado.servicos} serviço(s), {len(resultado.rejeitados)} rejeitado(s)."
+        )
+
+    @app.cli.command('compilar-templates')
+    @click.option('--pasta', type=click.Path(file_okay=False), default=None,
+                  help='Pasta do cache de bytecode (padrão: JINJA_CACHE_BYTECODE_DIR).')
+    def compilar_templates_cmd(pasta):
+        """Compila todos os templates e grava o bytecode em disco."""
+        from jinja2 import FileSystemBytecodeCache
+        from servicosdigitais.app.utilidades.templates import precompilar_templates
+
+        pasta = pasta or app.config.get('JINJA_CACHE_BYTECODE_DIR')
+        if not pasta:
+            raise click.ClickException(
+                'Defina JINJA_CACHE_BYTECODE_DIR (perfil de produção) ou use --pasta.'
+            )
+        os.makedirs(pasta, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(pasta)
+
+        # começa do zero: o que estiver em memória não seria gravado
+        app.jinja_env.cache.clear()
+        carregados, falhas, segundos = precompilar_templates(app)
+
+        click.echo(f"{carregados} template(s) compilado(s) em {segundos:.2f}s → {pasta}")
+        if falhas:
+            raise click.ClickException(f"Falharam: {', '.join(falhas)}")
+
+    @app.cli.command('gerar-assets')
+    def gerar_assets_cmd():
+        """Gera static/dist (nomes com hash, .gz/.br) e o manifesto."""
+        from servicosdigitais.app.utilidades.assets import gerar_assets, PASTA_DIST
+
+        manifesto = gerar_assets(app.static_folder)
+        click.echo(
+            f"{len(manifesto)} arquivo(s) em "
+            f"{os.path.join(app.static_folder, PASTA_DIST)}"
+        )
@@ -6,42 +6,250 @@ BASE_DIR = os.path.abspath(
 )
 
 # Caminho absoluto da pasta instance
+# (criada no criar_app, não na importação deste arquivo)
 INSTANCIA_DIR = os.path.join(BASE_DIR, "instance")
 
-# Garante que a pasta exista (CRÍTICO para SQLite)
-os.makedirs(INSTANCIA_DIR, exist_ok=True)
+# Variável de ambiente que escolhe o perfil (desenvolvimento | producao | teste)
+VARIAVEL_AMBIENTE = "SERVICOS_AMBIENTE"
+
+
+def _env_bool(nome, padrao):
+    valor = os.environ.get(nome)
+    if valor is None:
+        return padrao
+    return valor.strip().lower() in ("1", "true", "sim", "yes", "on")
 
 
 class ConfigPadrao:
     SECRET_KEY = os.environ.get("SECRET_KEY", "dev-key-insegura")
 
+    # Pastas criadas pelo criar_app
+    INSTANCIA_DIR = INSTANCIA_DIR
+
     # ===========================
     # Banco de dados SQLite
     # ===========================
-    SQLALCHEMY_DATABASE_URI = (
-        "sqlite:///" +
-        os.path.join(INSTANCIA_DIR, "banco_de_dados.db")
+    SQLALCHEMY_DATABASE_URI = os.environ.get(
+        "DATABASE_URL",
+        "sqlite:///" + os.path.join(INSTANCIA_DIR, "banco_de_dados.db")
     )
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Réplica / conexão somente leitura (opcional).
+    # Ex. local: "sqlite:///file:/caminho/banco_de_dados.db?mode=ro&uri=true"
+    SQLALCHEMY_BINDS = (
+        {"leitura": os.environ["DATABASE_URL_LEITURA"]}
+        if os.environ.get("DATABASE_URL_LEITURA") else {}
+    )
+    LEITURA_JANELA_ESCRITA = 10  # s no primário após uma escrita do usuário
+
 
     # ===========================
     # Proteções / Flags
     # ===========================
-    VALIDAR_CPF = False
-    VALIDAR_CNPJ = False
-    VALIDAR_PRESTADOR = False
+    VALIDAR_CPF = _env_bool("VALIDAR_CPF", False)
+    VALIDAR_CNPJ = _env_bool("VALIDAR_CNPJ", False)
+    VALIDAR_PRESTADOR = _env_bool("VALIDAR_PRESTADOR", False)
+
+    # ===========================
+    # Servidor de produção (servidor.py / wsgi.py)
+    # ===========================
+    SERVIDOR_BIND = os.environ.get("SERVIDOR_BIND", "0.0.0.0:8000")
+    SERVIDOR_WORKERS = int(os.environ.get("SERVIDOR_WORKERS", 2 * (os.cpu_count() or 1) + 1))
+    SERVIDOR_THREADS = int(os.environ.get("SERVIDOR_THREADS", 4))
+    SERVIDOR_TIMEOUT = int(os.environ.get("SERVIDOR_TIMEOUT", 30))
+
+    # ===========================
+    # Templates (utilidades/templates.py)
+    # ===========================
+    JINJA_CACHE_BYTECODE_DIR = None   # pasta do cache de bytecode (None = desligado)
+    TEMPLATES_PRECOMPILAR = False     # compilar todos no criar_app
+
+    # Arquivos estáticos com hash (utilidades/assets.py, flask gerar-assets)
+    ASSETS_USAR_MANIFESTO = False
+
+    # Fotos de perfil (utilidades/fotos.py)
+    FOTOS_MAX_AGE = 3600              # s para default.jpg/fotos antigas (as com hash: 1 ano)
+    FOTOS_ENVIO = os.environ.get("FOTOS_ENVIO") or None   # None | 'x-sendfile' | 'x-accel'
+    FOTOS_X_ACCEL_PREFIXO = os.environ.get("FOTOS_X_ACCEL_PREFIXO", "/_fotos/")
+
+    # ===========================
+    # Compressão das respostas (utilidades/compressao.py)
+    # ===========================
+    COMPRESSAO_ATIVA = _env_bool("COMPRESSAO_ATIVA", True)  # False se o proxy já comprime
+    COMPRESSAO_MIN_BYTES = 500      # corpos menores não compensam
+    COMPRESSAO_NIVEL = 6            # gzip 1-9
+    COMPRESSAO_NIVEL_BROTLI = 5     # brotli 0-11 (se o pacote existir)
+    COMPRESSAO_CACHE_ITENS = 200    # corpos comprimidos guardados (0 = sem cache)
+    COMPRESSAO_TIPOS = (
+        "text/html", "text/plain", "text/css", "text/csv",
+        "application/json", "application/javascript", "image/svg+xml",
+    )
+
+    # ===========================
+    # Uploads
+    # ===========================
+    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB (fotos e importação)
+
+    # ===========================
+    # Cache (utilidades/cache.py)
+    # ===========================
+    CACHE_TIPO = "simples"        # 'simples' (memória do processo) | 'nulo'
+    CACHE_TEMPO_PADRAO = 300      # s
+    CACHE_MAX_ITENS = 1000
+    # s, cartão do perfil público: curto porque tem dado que o dono pode ocultar
+    # (o commit limpa neste processo; os outros workers dependem da validade)
+    PERFIL_CARTAO_TEMPO = 30
+    PRINCIPAL_CACHE_TEMPO = 60    # s, (id, tipo, is_admin, ativo) usado na checagem de acesso
+    CONTEUDO_RECARGA_TEMPO = 300  # s, textos/imagens do site (edições no processo recarregam na hora)
+
+    # ===========================
+    # Busca por proximidade (/prestadores?lat=&lon=&raio=)
+    # ===========================
+    PROXIMIDADE_RAIO_PADRAO_KM = 10
+    PROXIMIDADE_RAIO_MAX_KM = 200
+    PROXIMIDADE_LIMITE = 50       # resultados por busca
+
+    # ===========================
+    # Logs (rotação por tamanho)
+    # ===========================
+    CAMINHO_LOG = os.path.join(INSTANCIA_DIR, "erros.log")
+    LOG_TAMANHO_MAXIMO = 5 * 1024 * 1024  # 5 MB por arquivo
+    LOG_QTD_BACKUPS = 5
+    LOG_NIVEL = "INFO"
+    # /admin/logs/ao-vivo: cada aba acompanhando prende uma thread do worker
+    # (2 workers x 4 threads por padrão); o EventSource reconecta sozinho
+    LOG_AO_VIVO_MAX = 2         # acompanhamentos simultâneos por processo
+    LOG_AO_VIVO_DURACAO = 60    # s por conexão
+
+    # ===========================
+    # Métricas (tempo por requisição / SQL)
+    # ===========================
+    METRICAS_ATIVAS = True
+    METRICAS_AMOSTRAGEM = 0.1      # fração das requisições com SQL contado
+    METRICAS_LIMITE_N_MAIS_1 = 10  # mesma instrução > K vezes → alerta
 
     # ===========================
     # E-mail
     # ===========================
-    MAIL_SERVER = "smtp.gmail.com"
-    MAIL_PORT = 587
-    MAIL_USE_TLS = True
-    MAIL_USERNAME = "suporteservicosdigitais@gmail.com"
-    MAIL_PASSWORD = "SUA_SENHA_APP"
+    MAIL_SERVER = os.environ.get("MAIL_SERVER", "smtp.gmail.com")
+    MAIL_PORT = int(os.environ.get("MAIL_PORT", 587))
+    MAIL_USE_TLS = _env_bool("MAIL_USE_TLS", True)
+    MAIL_USERNAME = os.environ.get("MAIL_USERNAME", "suporteservicosdigitais@gmail.com")
+    MAIL_PASSWORD = os.environ.get("MAIL_PASSWORD", "SUA_SENHA_APP")
     MAIL_DEFAULT_SENDER = (
         "Suporte Serviços Digitais",
-        "suporteservicosdigitais@gmail.com"
+        os.environ.get("MAIL_DEFAULT_SENDER", "suporteservicosdigitais@gmail.com")
     )
+
+
+class ConfigDesenvolvimento(ConfigPadrao):
+    """
+    Perfil local: recarrega templates, cache curto, métricas completas.
+    """
+    DEBUG = True
+    TEMPLATES_AUTO_RELOAD = True
+    SEND_FILE_MAX_AGE_DEFAULT = 0
+
+    CACHE_TEMPO_PADRAO = 30
+    METRICAS_AMOSTRAGEM = 1.0
+    LOG_NIVEL = "DEBUG"
+
+
+class ConfigProducao(ConfigPadrao):
+    """
+    Perfil de produção (SQLite com vários workers/threads).
+    """
+
+    # ===========================
+    # Flask / arquivos estáticos
+    # ===========================
+    DEBUG = False
+    TEMPLATES_AUTO_RELOAD = False            # sem stat() dos templates a cada render
+    SEND_FILE_MAX_AGE_DEFAULT = 30 * 24 * 3600  # 30 dias (estáticos)
+    JINJA_CACHE_BYTECODE_DIR = os.path.join(INSTANCIA_DIR, "jinja_cache")
+    TEMPLATES_PRECOMPILAR = True
+    ASSETS_USAR_MANIFESTO = True                # css/js com hash, cache de 1 ano
+
+    # ===========================
+    # Proteções / Flags
+    # ===========================
+    VALIDAR_CPF = _env_bool("VALIDAR_CPF", True)
+    VALIDAR_CNPJ = _env_bool("VALIDAR_CNPJ", True)
+    VALIDAR_PRESTADOR = _env_bool("VALIDAR_PRESTADOR", True)
+
+    # ===========================
+    # Cache
+    # ===========================
+    CACHE_TEMPO_PADRAO = 600
+    CACHE_MAX_ITENS = 5000
+
+    LOG_NIVEL = "WARNING"
+
+    # ===========================
+    # SQLite: PRAGMAs por conexão (evento "connect")
+    # ===========================
+    # WAL: leitores não bloqueiam o escritor (e vice-versa)
+    # busy_timeout: espera o lock em vez de falhar com "database is locked"
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",    # seguro com WAL, bem menos fsync
+        "busy_timeout": 5000,       # ms
+        "cache_size": -20000,       # negativo = KiB (~20 MB por conexão)
+        "mmap_size": 134217728,     # 128 MB
+        "temp_store": "MEMORY",
+    }
+
+    # ===========================
+    # Pool de conexões (banco padrão e binds, qualquer banco)
+    # ===========================
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": 10,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    }
+
+    # Só nos engines SQLite (o psycopg recusa essas opções);
+    # utilidades/banco.configurar_engines decide por URL
+    SQLITE_CONNECT_ARGS = {
+        "timeout": 15,               # s (lock no nível do driver)
+        "check_same_thread": False,  # conexões do pool trocam de thread
+    }
+
+
+class ConfigTeste(ConfigPadrao):
+    """
+    Perfil de testes: banco em memória, sem CSRF, sem cache, sem log em arquivo.
+    """
+    TESTING = True
+    INSTANCIA_DIR = None
+    SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    SQLALCHEMY_BINDS = {}
+    WTF_CSRF_ENABLED = False
+    BCRYPT_LOG_ROUNDS = 4
+
+    CACHE_TIPO = "nulo"
+    METRICAS_ATIVAS = False
+
+
+CONFIGS = {
+    "desenvolvimento": ConfigDesenvolvimento,
+    "producao": ConfigProducao,
+    "teste": ConfigTeste,
+}
+
+
+def obter_config(nome=None):
+    """
+    Retorna a classe de configuração pelo nome
+    (ou pela variável SERVICOS_AMBIENTE; padrão: desenvolvimento).
+    """
+    nome = (nome or os.environ.get(VARIAVEL_AMBIENTE) or "desenvolvimento").strip().lower()
+    if nome not in CONFIGS:
+        raise ValueError(
+            f"{VARIAVEL_AMBIENTE} inválido: {nome!r} (use: {', '.join(CONFIGS)})"
+        )
+    return CONFIGS[nome]
@@ -2,12 +2,15 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_login import LoginManager
 from flask_wtf import CSRFProtect
-from flask_migrate import Migrate
+
+from servicosdigitais.app.utilidades.roteamento_banco import SessaoRoteada
+from servicosdigitais.app.utilidades.cache import Cache
 
 # ===========================
 # Banco de dados
 # ===========================
-bancodedados = SQLAlchemy()
+# SessaoRoteada: SELECTs das views @leitura_replica vão ao bind "leitura"
+bancodedados = SQLAlchemy(session_options={'class_': SessaoRoteada})
 
 # ===========================
 # Criptografia de senhas
@@ -18,7 +21,7 @@ bcrypt = Bcrypt()
 # Gerenciamento de login
 # ===========================
 login_manager = LoginManager()
-login_manager.login_view = "auth.login"
+login_manager.login_view = "autenticacao.login"
 login_manager.login_message_category = "info"
 
 # ===========================
@@ -29,4 +32,29 @@ csrf = CSRFProtect()
 # ===========================
 # Migrações de banco
 # ===========================
-migrate = Migrate()
+class MigrateSobDemanda:
+    """
+    Adia o import do Flask-Migrate (que puxa o Alembic inteiro).
+    Só liga o Migrate quando o app é carregado pelo CLI do Flask
+    (flask db ...); workers WSGI não importam o Alembic.
+    """
+
+    def __init__(self):
+        self.migrate = None
+
+    def init_app(self, app, db, forcar=False, **kwargs):
+        import click
+        if not forcar and click.get_current_context(silent=True) is None:
+            return None
+
+        from flask_migrate import Migrate
+        self.migrate = Migrate(app, db, **kwargs)
+        return self.migrate
+
+
+migrate = MigrateSobDemanda()
+
+# ===========================
+# Cache (CACHE_TIPO: 'simples' | 'nulo')
+# ===========================
+cache = Cache()
@@ -57,13 +57,15 @@ class FormCadastroCNPJ(FlaskForm):
 # ========================
 # Formulário de Prestador
 # ========================
-# - Nome Fantasia, CNPJ, Telefone, Especialidade, Email, Senha, Confirmação de Senha
+# - Nome Fantasia, CNPJ, Telefone, Especialidade, Cidade, UF, Email, Senha, Confirmação de Senha
 class FormCadastroPrestador(FlaskForm):
     foto_perfil = FileField('Foto', validators=[FileAllowed(['jpg','jpeg','png'])])
     username = StringField('Nome Fantasia', validators=[DataRequired()])
     cnpj = StringField('CNPJ', validators=[DataRequired(), Length(min=14, max=18)])
     telefone = StringField('Telefone', validators=[Optional(), Length(min=8, max=20)])
     especialidade = StringField('Especialidade', validators=[DataRequired()])
+    cidade = StringField('Cidade', validators=[Optional(), Length(max=100)])
+    estado = StringField('UF', validators=[Optional(), Length(min=2, max=2)])
     email = StringField('E-mail', validators=[DataRequired(), Email()])
     senha = PasswordField('Senha', validators=[DataRequired(), Length(min=6, max=20)])
     confirmacao_senha = PasswordField('Confirmação da Senha', validators=[DataRequired(), EqualTo('senha')])
@@ -6,8 +6,9 @@ from flask_wtf.file import (
     FileField, FileAllowed
     )
 from wtforms import (
-    StringField, PasswordField, SubmitField, TextAreaField
+    StringField, PasswordField, SubmitField, TextAreaField, IntegerField
     )
+from wtforms.widgets import HiddenInput
 from wtforms.validators import (
     DataRequired, Length, Email, EqualTo, Optional
     )
@@ -53,6 +54,11 @@ class _BaseEditarPerfil(FlaskForm):
                     EqualTo('nova_senha', message='As senhas devem coincidir.')
                     ])
 
+    # ==========================
+    # VERSÃO LIDA (trava otimista)
+    # ==========================
+    versao = IntegerField(widget=HiddenInput(), validators=[Optional()])
+
     botao_submit = SubmitField('Salvar alterações')
 
 
@@ -96,6 +102,16 @@ class FormEditarPrestador(_BaseEditarPerfil):
                                                 Length(max=600)
                                                 ])
 
+    # cidade vazia: o prestador sai da busca por cidade
+    cidade = StringField('Cidade', validators=[
+                                    Optional(),
+                                    Length(max=100)
+                                    ])
+    estado = StringField('UF', validators=[
+                                    Optional(),
+                                    Length(min=2, max=2)
+                                    ])
+
 '''
 Mas futuramente pode entrar aqui:
 
@@ -6,8 +6,10 @@ e manter a organização do sistema.
 """
 
 from .usuario import Usuario
+from .documento import Documento
 from .clientes import ClienteCPF, ClienteCNPJ
 from .prestador import PrestadorServico, ServicoPrestado
+from .localizacao import Localizacao
 from .midia import FotoPerfil
 from .conteudo import TextosEntrada, ImagensSite
 from .suporte import SupportTicket
@@ -1,8 +1,11 @@
 # ========================
 # Banco de dados - Clientes
 # ========================
+from sqlalchemy.orm import validates
+
 from servicosdigitais.app.models.usuario import Usuario
 from servicosdigitais.app.extensoes import bancodedados
+from servicosdigitais.app.utilidades.normalizadores import normalizar_documento
 
 # ========================================
 # Tabela ClienteCPF - Subclasse de Usuario
@@ -17,12 +20,19 @@ class ClienteCPF(Usuario):
         primary_key=True
     )
 
-    cpf = bancodedados.Column(bancodedados.String(11), unique=True, index=False)
+    # Só dígitos, largura fixa: o login busca por igualdade no índice único
+    cpf = bancodedados.Column(bancodedados.CHAR(11), unique=True, index=True)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.tipo = "cpf" # Tipo automático
 
+    @validates('cpf')
+    def _normalizar_cpf(self, chave, valor):
+        numero = normalizar_documento(valor, 11)
+        self._definir_documento(numero, 'cpf')
+        return numero
+
 
     # Campos herdados: nome, sobrenome, telefone, email, senha_hash, tipo, foto_perfil, ativo
     # Métodos herdados: get_id, set_senha, checar_senha
@@ -42,11 +52,18 @@ class ClienteCNPJ(Usuario):
     )
 
     razao_social = bancodedados.Column(bancodedados.String(200), nullable=False)
-    cnpj = bancodedados.Column(bancodedados.Integer, nullable=False, unique=True, index=True)
+    # CHAR(14): como inteiro, os zeros à esquerda se perdiam
+    cnpj = bancodedados.Column(bancodedados.CHAR(14), nullable=False, unique=True, index=True)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.tipo = "cnpj" # Tipo automático
 
+    @validates('cnpj')
+    def _normalizar_cnpj(self, chave, valor):
+        numero = normalizar_documento(valor, 14)
+        self._definir_documento(numero, 'cnpj')
+        return numero
+
     # Herdado: nome, telefone, email, senha_hash, tipo, foto_perfil, ativo
     # Métodos herdados: get_id, set_senha, checar_senha
\ No newline at end of file
@@ -0,0 +1,38 @@
+# ========================
+# Banco de dados - Documentos (CPF / CNPJ de todas as contas)
+# ========================
+from servicosdigitais.app.extensoes import bancodedados
+
+# ================
+# Tabela Documento
+# ================
+# - id, numero (único entre TODOS os tipos de conta), tipo, usuario_id (FK)
+# Gravada na mesma transação da conta (ver Usuario._definir_documento):
+# o índice único garante que o mesmo CPF/CNPJ não entra duas vezes,
+# mesmo com dois cadastros ao mesmo tempo.
+class Documento(bancodedados.Model):
+    __tablename__ = "documento"
+
+    id = bancodedados.Column(bancodedados.Integer, primary_key=True, autoincrement=True)
+
+    # só dígitos: 11 (CPF) ou 14 (CNPJ)
+    numero = bancodedados.Column(bancodedados.String(14), nullable=False, unique=True, index=True)
+
+    # 'cpf' | 'cnpj'
+    tipo = bancodedados.Column(bancodedados.String(4), nullable=False)
+
+    usuario_id = bancodedados.Column(
+        bancodedados.Integer,
+        bancodedados.ForeignKey('usuario.id'),
+        nullable=False,
+        unique=True,
+        index=True
+    )
+
+    # as contas (ClienteCPF, ClienteCNPJ, PrestadorServico) herdam de Usuario
+    # sem configuração polimórfica: aceita as subclasses no flush
+    usuario = bancodedados.relationship(
+        'Usuario',
+        back_populates='documento',
+        enable_typechecks=False
+    )
@@ -0,0 +1,145 @@
+# ========================
+# Banco de dados - Localização dos prestadores
+# ========================
+from servicosdigitais.app.extensoes import bancodedados
+from servicosdigitais.app.models.usuario import Usuario
+from servicosdigitais.app.models.prestador import PrestadorServico
+from servicosdigitais.app.utilidades.normalizadores import normalizar_texto
+from sqlalchemy import DDL, event, inspect, select, update
+from sqlalchemy.orm import validates
+
+# ==================
+# Tabela Localizacao
+# ==================
+# - id, prestador_id (FK), cidade, estado
+# - cidade_norm: chave de busca (sem acento / caixa)
+# - especialidade_norm, nome: cópias do prestador, para o filtro
+#   cidade + especialidade sair inteiro do índice, já em ordem de nome
+# - latitude, longitude (graus, opcionais): busca por proximidade
+#   (no SQLite, espelhadas no R*Tree localizacao_rtree por triggers)
+class Localizacao(bancodedados.Model):
+    __tablename__ = "localizacao"
+
+    id = bancodedados.Column(bancodedados.Integer, primary_key=True, autoincrement=True)
+
+    prestador_id = bancodedados.Column(
+        bancodedados.Integer,
+        bancodedados.ForeignKey('prestador_servico.id'),
+        nullable=False,
+        unique=True,
+        index=True
+    )
+
+    cidade = bancodedados.Column(bancodedados.String(100), nullable=False)
+    # UF: 'SP', 'MG'...
+    estado = bancodedados.Column(bancodedados.CHAR(2), nullable=True, index=True)
+
+    cidade_norm = bancodedados.Column(bancodedados.String(100), nullable=False)
+    especialidade_norm = bancodedados.Column(bancodedados.String(120), nullable=False, default='')
+    nome = bancodedados.Column(bancodedados.String(100), nullable=False, default='')
+
+    latitude = bancodedados.Column(bancodedados.Float, nullable=True)
+    longitude = bancodedados.Column(bancodedados.Float, nullable=True)
+
+    prestador = bancodedados.relationship(
+        'PrestadorServico',
+        backref=bancodedados.backref('localizacao', uselist=False, cascade='all, delete-orphan')
+    )
+
+    __table_args__ = (
+        # /prestadores?cidade=&especialidade=: igualdade nas duas primeiras
+        # colunas, linhas já em ordem de nome. Só ?cidade= usa o prefixo
+        # para achar as linhas, mas o ORDER BY nome vira uma ordenação à
+        # parte (B-tree temporária no SQLite)
+        bancodedados.Index('ix_localizacao_busca', 'cidade_norm', 'especialidade_norm', 'nome'),
+        # ?lat=&lon=&raio= fora do SQLite (caixa delimitadora)
+        bancodedados.Index('ix_localizacao_coordenadas', 'latitude', 'longitude'),
+    )
+
+    @validates('cidade')
+    def _normalizar_cidade(self, chave, valor):
+        valor = ' '.join((valor or '').split())
+        self.cidade_norm = normalizar_texto(valor)
+        return valor
+
+    @validates('estado')
+    def _normalizar_estado(self, chave, valor):
+        valor = (valor or '').strip().upper()
+        return valor or None
+
+
+# ======================================================
+# R*TREE (SQLite): índice espacial das coordenadas
+# ======================================================
+# Mesmo id da localização; um ponto é uma caixa de largura zero.
+# Triggers mantêm o espelho (inclusive em bulk_insert_mappings).
+TABELA_RTREE = 'localizacao_rtree'
+
+DDL_RTREE = (
+    f"CREATE VIRTUAL TABLE {TABELA_RTREE} USING rtree(id, min_lat, max_lat, min_lon, max_lon)",
+    f"""CREATE TRIGGER {TABELA_RTREE}_ai AFTER INSERT ON localizacao
+        WHEN new.latitude IS NOT NULL AND new.longitude IS NOT NULL
+        BEGIN
+            INSERT INTO {TABELA_RTREE}
+            VALUES (new.id, new.latitude, new.latitude, new.longitude, new.longitude);
+        END""",
+    f"""CREATE TRIGGER {TABELA_RTREE}_au AFTER UPDATE OF latitude, longitude ON localizacao
+        BEGIN
+            DELETE FROM {TABELA_RTREE} WHERE id = old.id;
+            INSERT INTO {TABELA_RTREE}
+            SELECT new.id, new.latitude, new.latitude, new.longitude, new.longitude
+            WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL;
+        END""",
+    f"""CREATE TRIGGER {TABELA_RTREE}_ad AFTER DELETE ON localizacao
+        BEGIN
+            DELETE FROM {TABELA_RTREE} WHERE id = old.id;
+        END""",
+)
+
+# create_all / drop_all (testes, banco novo); em produção vem da migração
+for _comando in DDL_RTREE:
+    event.listen(Localizacao.__table__, 'after_create', DDL(_comando).execute_if(dialect='sqlite'))
+event.listen(
+    Localizacao.__table__, 'before_drop',
+    DDL(f"DROP TABLE IF EXISTS {TABELA_RTREE}").execute_if(dialect='sqlite')
+)
+
+
+# ======================================================
+# CÓPIAS DO PRESTADOR (nome / especialidade)
+# ======================================================
+@event.listens_for(Localizacao, 'before_insert')
+def _copiar_prestador(mapper, conexao, alvo):
+    # objeto já na sessão: usa direto; senão lê as duas colunas (sem lazy load no flush)
+    prestador = alvo.__dict__.get('prestador')
+    if prestador is not None:
+        nome, especialidade = prestador.nome, prestador.especialidade
+    else:
+        t_usuario, t_prestador = Usuario.__table__, PrestadorServico.__table__
+        linha = conexao.execute(
+            select(t_usuario.c.nome, t_prestador.c.especialidade)
+            .join_from(t_prestador, t_usuario, t_usuario.c.id == t_prestador.c.id)
+            .where(t_prestador.c.id == alvo.prestador_id)
+        ).first()
+        nome, especialidade = linha if linha else ('', None)
+    alvo.nome = nome or ''
+    alvo.especialidade_norm = normalizar_texto(especialidade)
+
+
+# Usuario com propagate: o current_user é carregado como Usuario (sem polimorfismo)
+@event.listens_for(Usuario, 'after_update', propagate=True)
+def _prestador_atualizado(mapper, conexao, alvo):
+    if alvo.tipo != 'prestador':
+        return
+    estado = inspect(alvo)
+    valores = {}
+    if estado.attrs.nome.history.has_changes():
+        valores['nome'] = alvo.nome or ''
+    if 'especialidade' in estado.attrs.keys() and estado.attrs.especialidade.history.has_changes():
+        valores['especialidade_norm'] = normalizar_texto(alvo.especialidade)
+    if not valores:
+        return
+    tabela = Localizacao.__table__
+    conexao.execute(
+        update(tabela).where(tabela.c.prestador_id == alvo.id).values(**valores)
+    )
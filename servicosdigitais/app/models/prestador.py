@@ -3,7 +3,9 @@
 # ========================
 from servicosdigitais.app.models.usuario import Usuario
 from servicosdigitais.app.extensoes import bancodedados
+from servicosdigitais.app.utilidades.normalizadores import normalizar_documento
 from sqlalchemy import func
+from sqlalchemy.orm import validates
 
 # ==============================================
 # Tabela PrestadorServico - Subclasse de Usuario
@@ -20,7 +22,8 @@ class PrestadorServico(Usuario):
 
     especialidade = bancodedados.Column(bancodedados.String(120), nullable=True)
 
-    cnpj = bancodedados.Column(bancodedados.Integer, nullable=False, unique=True, index=True)
+    # CHAR(14): como inteiro, os zeros à esquerda se perdiam
+    cnpj = bancodedados.Column(bancodedados.CHAR(14), nullable=False, unique=True, index=True)
     # relacionamento PARA a tabela de serviços
     servicos = bancodedados.relationship(
         "ServicoPrestado",
@@ -33,6 +36,12 @@ class PrestadorServico(Usuario):
         super().__init__(*args, **kwargs)
         self.tipo = "prestador" # Tipo automático
 
+    @validates('cnpj')
+    def _normalizar_cnpj(self, chave, valor):
+        numero = normalizar_documento(valor, 14)
+        self._definir_documento(numero, 'cnpj')
+        return numero
+
     # Herdado: nome, telefone, email, senha_hash, tipo, foto_perfil, ativo
     # Métodos herdados: get_id, set_senha, checar_senha
 
@@ -5,6 +5,9 @@ from servicosdigitais.app.extensoes import bancodedados, bcrypt
 from flask_login import UserMixin
 from sqlalchemy import func
 
+# tipos com subclasse própria (prefixo do get_id lido pelo user_loader)
+TIPOS_COM_MODELO = ('cpf', 'cnpj', 'prestador')
+
 # ===========================
 # Tabela Usuario e subclasses
 # ===========================
@@ -51,10 +54,40 @@ class Usuario(bancodedados.Model, UserMixin):
         index=True
     )
 
+    # Versão da linha (trava otimista): todo UPDATE pelo ORM leva
+    # "WHERE versao = <lida>" e soma 1; se outra requisição gravou antes,
+    # o commit falha com StaleDataError em vez de sobrescrever
+    versao = bancodedados.Column(
+        bancodedados.Integer,
+        nullable=False,
+        default=1,
+        server_default='1'
+    )
+
+    __mapper_args__ = {'version_id_col': versao}
+
+    # Um e-mail por conta, sem diferenciar caixa: o índice único pega
+    # dois cadastros simultâneos (IntegrityError no segundo commit)
+    __table_args__ = (
+        bancodedados.Index('ix_usuario_email_unico', func.lower(email), unique=True),
+    )
+
+
+    # CPF/CNPJ na tabela única de documentos (apagado junto com a conta)
+    documento = bancodedados.relationship(
+        'Documento',
+        back_populates='usuario',
+        uselist=False,
+        cascade='all, delete-orphan'
+    )
+
 
     # Pegar o ID pois pode ter nomes iguais
+    # Prefixo = tipo da conta: o user_loader devolve a subclasse
+    # (ClienteCNPJ.razao_social, PrestadorServico.especialidade...)
     def get_id(self):
-        return f"usuario:{self.id}"
+        prefixo = self.tipo if self.tipo in TIPOS_COM_MODELO else 'usuario'
+        return f"{prefixo}:{self.id}"
 
 
     # Criptografação da senha
@@ -67,4 +100,17 @@ class Usuario(bancodedados.Model, UserMixin):
 
     # Verificar senha no login (True ou False)
     def checar_senha(self, raw_password):
-        return bcrypt.check_password_hash(self.senha_hash, raw_password)
\ No newline at end of file
+        return bcrypt.check_password_hash(self.senha_hash, raw_password)
+
+
+    # Mantém a linha em "documento" igual ao CPF/CNPJ da conta
+    # (chamado pelos @validates das subclasses; entra na mesma transação)
+    def _definir_documento(self, numero, tipo):
+        if not numero:
+            self.documento = None
+        elif self.documento is None:
+            from servicosdigitais.app.models.documento import Documento
+            self.documento = Documento(numero=numero, tipo=tipo)
+        else:
+            self.documento.numero = numero
+            self.documento.tipo = tipo
@@ -3,31 +3,56 @@
 # ========================
 ''' O que tem dentro da página de admin:
 - Blueprint admin (admin_bp)
+- Ações em lote (/admin/usuarios/lote)
+- Exportação CSV/JSONL em fluxo (/admin/exportar)
+- Importação em lote de prestadores (/admin/importar-prestadores)
+- Visualização dos logs (/admin/logs) e acompanhamento ao vivo (SSE)
+- Métricas de requisições e SQL (/admin/metricas, JSON ou Prometheus;
+  zerar só por POST em /admin/metricas/limpar)
 
 '''
+import io
 import os
+from datetime import datetime
 
 from sqlalchemy import func
 
-from flask_login import current_user, login_required
+from flask_login import current_user
 from flask import current_app
 from flask import (
-    Blueprint, render_template, request, flash, redirect, url_for, send_file
+    Blueprint, render_template, request, flash, redirect, url_for, send_file,
+    jsonify, Response, stream_with_context
     )
 
 from servicosdigitais.app.utilidades.seguranca import (
     gerar_senha_hash, verificar_senha_hash, gerar_senha_temp,
     )
 
-from servicosdigitais.app.utilidades.autenticacao import verifica_inatividade, get_caminho_log
+from servicosdigitais.app.utilidades.autenticacao import get_caminho_log
 
 from servicosdigitais.app.utilidades.comunicacao.email_padrao import email_reset_senha
 from servicosdigitais.app.utilidades.comunicacao.servicos_email import enviar_email
 
-from servicosdigitais.app.utilidades.autorizacao import somente_admin
+from servicosdigitais.app.utilidades.instrumentacao import obter_metricas
+from servicosdigitais.app.utilidades.logs import (
+    NIVEIS_LOG, ler_ultimas_linhas, filtrar_logs, limpar_log, seguir_log,
+    reservar_seguidor, liberar_seguidor
+    )
 from servicosdigitais.app.utilidades.validadores import apenas_numeros
 from servicosdigitais.app.extensoes import bancodedados, bcrypt
 from servicosdigitais.app.models import Usuario
+from servicosdigitais.app.servicos.servico_usuario import (
+    ACOES_LOTE, executar_acao_em_lote
+    )
+from servicosdigitais.app.servicos.exportacao_servico import (
+    ENTIDADES_EXPORTACAO, FORMATOS_EXPORTACAO, gerar_exportacao
+    )
+from servicosdigitais.app.servicos.importacao_servico import (
+    FORMATOS_IMPORTACAO, importar_prestadores
+    )
+from servicosdigitais.app.servicos.perfil_servico import (
+    calcular_mudancas, atualizar_perfil, ConflitoDeVersao
+    )
 from servicosdigitais.app.forms.perfil_forms import (
     FormEditarCPF, FormEditarCNPJ, FormEditarPrestador
     )
@@ -39,11 +64,11 @@ admin_bp = Blueprint(
     url_prefix="/admin"
 )
 
+# Acesso: todas as rotas exigem admin logado e ativo, com checagem de
+# inatividade (POLITICAS em utilidades/autorizacao.py)
+
 # ADMIN - painel principal
 @admin_bp.route('/')
-@login_required
-@somente_admin
-@verifica_inatividade
 def admin():
     """
     Painel inicial administrativo.
@@ -61,8 +86,6 @@ def admin():
 
 # LISTAR USUÁRIOS - Base do CRUD
 @admin_bp.route('/usuarios', methods=['GET'])
-@login_required
-@somente_admin
 def listar_usuarios():
     """
     Lista TODOS os usuários do sistema,
@@ -100,9 +123,6 @@ def listar_usuarios():
 
 
 @admin_bp.route('/usuario/<int:usuario_id>', methods=['GET'])
-@login_required
-@somente_admin
-@verifica_inatividade
 def detalhe_usuario(usuario_id):
     """
     Exibe os detalhes do usuário (somente visualização).
@@ -118,9 +138,6 @@ def detalhe_usuario(usuario_id):
 
 
 @admin_bp.route('/usuario/<int:usuario_id>/editar', methods=['POST'])
-@login_required
-@somente_admin
-@verifica_inatividade
 def editar_usuario(usuario_id):
     """
     Atualiza dados básicos do usuário.
@@ -128,13 +145,16 @@ def editar_usuario(usuario_id):
 
     usuario = Usuario.query.get_or_404(usuario_id)
 
-    email = (request.form.get('email') or '').strip().lower()
-    telefone = request.form.get('telefone')
+    # só e-mail e telefone; 'versao' (opcional) é a versão que o admin viu
+    dados = {campo: request.form.get(campo) for campo in ('email', 'telefone')}
+    if not dados['email']:
+        dados.pop('email')
+    mudancas = calcular_mudancas(usuario, dados)
 
     # valida e-mail duplicado
-    if email and email != usuario.email:
+    if 'email' in mudancas:
         existe = Usuario.query.filter(
-            Usuario.email == email,
+            Usuario.email == mudancas['email'],
             Usuario.id != usuario.id
         ).first()
 
@@ -142,14 +162,13 @@ def editar_usuario(usuario_id):
             flash('Este e-mail já está em uso.', 'warning')
             return redirect(url_for('admin.detalhe_usuario', usuario_id=usuario.id))
 
-        usuario.email = email
-
-    if hasattr(usuario, 'telefone'):
-        usuario.telefone = telefone or None
-
     try:
-        bancodedados.session.commit()
-        flash('Dados atualizados com sucesso.', 'success')
+        if atualizar_perfil(usuario, mudancas, request.form.get('versao', type=int)):
+            flash('Dados atualizados com sucesso.', 'success')
+        else:
+            flash('Nenhuma alteração foi detectada.', 'info')
+    except ConflitoDeVersao:
+        flash('O usuário foi alterado por outra pessoa. Confira os dados e tente de novo.', 'warning')
     except Exception:
         bancodedados.session.rollback()
         flash('Erro ao atualizar dados.', 'danger')
@@ -158,8 +177,6 @@ def editar_usuario(usuario_id):
 
 
 @admin_bp.route('/usuarios/<int:usuario_id>/ativacao', methods=['POST'])
-@login_required
-@somente_admin
 def ativacao_usuario(usuario_id):
     """
     Ativa ou desativa um usuário.
@@ -186,8 +203,6 @@ def ativacao_usuario(usuario_id):
 
 # --== PROMOVER / REMOVER ADMINISTRADOR ==--
 @admin_bp.route('/usuario/<int:usuario_id>/admin', methods=['POST'])
-@login_required
-@somente_admin
 def alternar_admin_usuario(usuario_id):
     """
     Alterna o status de administrador do usuário.
@@ -221,9 +236,6 @@ def alternar_admin_usuario(usuario_id):
 
 
 @admin_bp.route('/usuario/<int:usuario_id>/excluir', methods=['POST'])
-@login_required
-@somente_admin
-@verifica_inatividade
 def excluir_usuario(usuario_id):
     """
     Exclui usuário do sistema.
@@ -282,8 +294,6 @@ def excluir_usuario(usuario_id):
 
 # RESETAR SENHAS - Suporte real
 @admin_bp.route('/usuarios/<int:usuario_id>/resetar_senha', methods=['POST'])
-@login_required
-@somente_admin
 def resetar_senha_usuario(usuario_id):
     """
     Reset administrativo de senha.
@@ -324,11 +334,143 @@ def resetar_senha_usuario(usuario_id):
         tipo=usuario.tipo,
         user_id=usuario.id
     ))
+
+
+# AÇÕES EM LOTE - ativar, desativar, aprovar prestadores, resetar senhas
+@admin_bp.route('/usuarios/lote', methods=['POST'])
+def acoes_em_lote():
+    """
+    Aplica uma ação a vários usuários de uma vez.
+
+    Aceita JSON ou formulário:
+    - acao: 'ativar' | 'desativar' | 'aprovar_prestadores' | 'resetar_senha'
+    - ids: lista de IDs (JSON) ou "1,2,3" / campos repetidos (form)
+    - filtro: {'tipo': ..., 'ativo': ...} quando não houver IDs
+
+    Responde JSON com o resultado por ID.
+    """
+    if request.is_json:
+        dados = request.get_json(silent=True) or {}
+        acao = dados.get('acao')
+        ids = dados.get('ids') or []
+        filtro = dados.get('filtro') or {}
+    else:
+        acao = request.form.get('acao')
+        ids = request.form.getlist('ids')
+        if len(ids) == 1 and ',' in ids[0]:
+            ids = ids[0].split(',')
+        filtro = {}
+        if request.form.get('tipo'):
+            filtro['tipo'] = request.form.get('tipo')
+        if request.form.get('ativo') in ('0', '1'):
+            filtro['ativo'] = request.form.get('ativo') == '1'
+
+    if acao not in ACOES_LOTE:
+        return jsonify({'erro': 'Ação inválida.', 'acoes': list(ACOES_LOTE)}), 400
+
+    if not ids and not filtro and acao != 'aprovar_prestadores':
+        return jsonify({'erro': 'Informe uma lista de IDs ou um filtro.'}), 400
+
+    resultado = executar_acao_em_lote(
+        acao, ids=ids, filtro=filtro, admin_id=current_user.id
+    )
+
+    resumo = {}
+    for status in resultado.values():
+        resumo[status] = resumo.get(status, 0) + 1
+
+    current_app.logger.info(
+        f"Admin {current_user.id} executou '{acao}' em lote: {resumo}"
+    )
+
+    return jsonify({
+        'acao': acao,
+        'resumo': resumo,
+        'resultados': {str(k): v for k, v in resultado.items()}
+    })
+
+
+# EXPORTAR - usuários / prestadores em CSV ou JSONL
+@admin_bp.route('/exportar', methods=['GET'])
+def exportar():
+    """
+    Exporta usuários ou prestadores em fluxo (streaming).
+    - ?entidade=usuarios|prestadores
+    - ?formato=csv|jsonl
+    - ?gzip=1 para baixar compactado (.gz)
+    E-mail, telefone e documento saem mascarados.
+    """
+    entidade = request.args.get('entidade', 'usuarios')
+    formato = request.args.get('formato', 'csv')
+    compactar = request.args.get('gzip') == '1'
+
+    if entidade not in ENTIDADES_EXPORTACAO or formato not in FORMATOS_EXPORTACAO:
+        flash('Parâmetros de exportação inválidos.', 'warning')
+        return redirect(url_for('admin.listar_usuarios'))
+
+    conteudo = gerar_exportacao(entidade, formato, gzip=compactar)
+
+    nome_arquivo = f"{entidade}.{formato}"
+    if compactar:
+        nome_arquivo += '.gz'
+        mimetype = 'application/gzip'
+    elif formato == 'csv':
+        mimetype = 'text/csv'
+    else:
+        mimetype = 'application/x-ndjson'
+
+    current_app.logger.info(
+        f"Admin {current_user.id} exportou {entidade} ({nome_arquivo})"
+    )
+
+    return Response(
+        stream_with_context(conteudo),
+        mimetype=mimetype,
+        headers={
+            'Content-Disposition': f'attachment; filename={nome_arquivo}',
+            'X-Content-Type-Options': 'nosniff',
+        }
+    )
+
+
+# IMPORTAR - prestadores e serviços em lote (CSV / JSONL)
+@admin_bp.route('/importar-prestadores', methods=['POST'])
+def importar_prestadores_upload():
+    """
+    Recebe um arquivo (campo 'arquivo') e importa em blocos.
+    - formato: 'csv' | 'jsonl' (padrão: pela extensão)
+    - ativar=1: cria os prestadores já aprovados
+    Responde JSON com o resumo e as linhas rejeitadas.
+    """
+    arquivo = request.files.get('arquivo')
+    if not arquivo or not arquivo.filename:
+        return jsonify({'erro': 'Envie um arquivo no campo "arquivo".'}), 400
+
+    formato = request.form.get('formato')
+    if not formato:
+        nome = arquivo.filename.lower()
+        formato = 'jsonl' if nome.endswith(('.jsonl', '.ndjson')) else 'csv'
+    if formato not in FORMATOS_IMPORTACAO:
+        return jsonify({'erro': 'Formato inválido.', 'formatos': list(FORMATOS_IMPORTACAO)}), 400
+
+    # lê o upload em fluxo, sem carregar tudo em memória
+    texto = io.TextIOWrapper(arquivo.stream, encoding='utf-8-sig', newline='')
+    resultado = importar_prestadores(
+        texto,
+        formato=formato,
+        ativar=request.form.get('ativar') == '1'
+    )
+
+    current_app.logger.info(
+        f"Admin {current_user.id} importou {resultado.importados} prestador(es) "
+        f"de {arquivo.filename} ({len(resultado.rejeitados)} rejeitado(s))"
+    )
+
+    return jsonify(resultado.como_dict())
+
+
 # CRIAR USUÁRIO - Útil para testes
 @admin_bp.route('/criar_usuario', methods=['GET', 'POST'])
-@login_required
-@somente_admin
-@verifica_inatividade
 def criar_usuario():
     """
     Criação de usuário.
@@ -378,23 +520,19 @@ def criar_usuario():
 
 '''# ROTA: /admin/avaliacoes  (placeholder)
 @admin_bp.route('/avaliacoes', methods=['GET'])
-@login_required
-@somente_admin
-@verifica_inatividade
 def avaliacoes_admin():
     # Modificar futuramente
     flash('Área de avaliações em implementação.', 'info')
     return render_template('admin/avaliacoes.html')
 '''
 
-'''# ROTA: /admin/logs
+# ROTA: /admin/logs
 @admin_bp.route('/logs', methods=['GET', 'POST'])
-@login_required
-@somente_admin
-@verifica_inatividade
 def visualizar_logs():
     """
     Visualização dos logs. Mantida como read-only / limpar / download.
+    - Sem filtro: últimas N linhas (?linhas=200), lidas a partir do fim
+    - Com filtro (?nivel=ERROR&inicio=...&fim=...): usa o índice auxiliar
     """
 
     caminho_log = get_caminho_log()
@@ -403,7 +541,7 @@ def visualizar_logs():
         acao = request.form.get('acao')
 
         if acao == 'limpar':
-            open(caminho_log, 'w').close()
+            limpar_log(caminho_log)
             flash('Logs limpos.', 'sucesso')
             return redirect(url_for('admin.visualizar_logs'))
 
@@ -413,13 +551,107 @@ def visualizar_logs():
             flash('Arquivo de logs não encontrado.', 'erro')
             return redirect(url_for('admin.visualizar_logs'))
 
-    # leitura simples: últimas linhas (pode ser otimizado)
-    conteudo = ''
-    if os.path.exists(caminho_log):
-        with open(caminho_log, 'r', encoding='utf-8', errors='ignore') as f:
-            conteudo = f.read()[-20000:]  # pega último bloco (ajustável)
-    else:
+    linhas = min(max(request.args.get('linhas', 200, type=int), 1), 5000)
+    niveis = [n for n in request.args.getlist('nivel') if n.upper() in NIVEIS_LOG]
+    inicio = _ler_data_filtro(request.args.get('inicio'))
+    fim = _ler_data_filtro(request.args.get('fim'))
+
+    if not os.path.exists(caminho_log):
         conteudo = 'Arquivo de log não encontrado.'
+    elif niveis or inicio or fim:
+        registros = filtrar_logs(caminho_log, niveis=niveis, inicio=inicio, fim=fim, limite=linhas)
+        conteudo = '\n'.join(r['texto'] for r in registros)
+    else:
+        conteudo = '\n'.join(ler_ultimas_linhas(caminho_log, linhas))
+
+    return render_template(
+        'admin/logs.html',
+        logs=conteudo,
+        niveis=NIVEIS_LOG,
+        niveis_selecionados=[n.upper() for n in niveis],
+        linhas=linhas,
+        inicio=request.args.get('inicio', ''),
+        fim=request.args.get('fim', '')
+    )
+
 
-    return render_template('admin/logs.html', logs=conteudo)
-'''
\ No newline at end of file
+# ROTA: /admin/logs/ao-vivo (Server-Sent Events)
+@admin_bp.route('/logs/ao-vivo', methods=['GET'])
+def acompanhar_logs():
+    """
+    Envia as novas linhas do log em tempo real (text/event-stream).
+    Aceita ?nivel=ERROR (pode repetir).
+    - Cada conexão prende uma thread do worker por até LOG_AO_VIVO_DURACAO s
+      (o navegador reconecta); no máximo LOG_AO_VIVO_MAX por processo (429)
+    - O fluxo roda sem o contexto da requisição e sem sessão do banco
+    """
+    niveis = [n for n in request.args.getlist('nivel') if n.upper() in NIVEIS_LOG]
+    caminho_log = get_caminho_log()
+    duracao = current_app.config.get('LOG_AO_VIVO_DURACAO', 60)
+
+    if not reservar_seguidor(current_app.config.get('LOG_AO_VIVO_MAX', 2)):
+        resposta = jsonify({'erro': 'Muitos acompanhamentos ao vivo abertos. Tente mais tarde.'})
+        resposta.status_code = 429
+        resposta.headers['Retry-After'] = str(duracao)
+        return resposta
+
+    # devolve a conexão ao pool antes de começar o fluxo
+    bancodedados.session.remove()
+
+    resposta = Response(
+        seguir_log(caminho_log, niveis=niveis, duracao_max=duracao),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',  # nginx: não segurar o fluxo
+        }
+    )
+    # o servidor chama close() ao fim do fluxo (ou se o cliente cair antes)
+    resposta.call_on_close(liberar_seguidor)
+    return resposta
+
+
+# ROTA: /admin/metricas
+@admin_bp.route('/metricas', methods=['GET'])
+def metricas():
+    """
+    Métricas agregadas por endpoint desde a subida do processo.
+    - ?formato=prometheus → texto de exposição do Prometheus
+    - para zerar: POST /admin/metricas/limpar (GET não muda estado)
+    Obs.: cada worker tem os próprios contadores.
+    """
+    registro = obter_metricas()
+    if registro is None:
+        return jsonify({'erro': 'Métricas desligadas (METRICAS_ATIVAS).'}), 404
+
+    if request.args.get('formato') == 'prometheus':
+        resposta = Response(
+            registro.como_prometheus(),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+    else:
+        resposta = jsonify(registro.como_dict())
+    return resposta
+
+
+# ROTA: /admin/metricas/limpar (POST, com token CSRF)
+@admin_bp.route('/metricas/limpar', methods=['POST'])
+def limpar_metricas():
+    """Zera os contadores de métricas deste worker."""
+    registro = obter_metricas()
+    if registro is None:
+        flash('Métricas desligadas (METRICAS_ATIVAS).', 'erro')
+    else:
+        registro.limpar()
+        flash('Métricas zeradas (só neste worker).', 'sucesso')
+    return redirect(url_for('admin.visualizar_logs'))
+
+
+def _ler_data_filtro(valor):
+    """Aceita 'AAAA-MM-DDTHH:MM' (input datetime-local) ou 'AAAA-MM-DD HH:MM:SS'."""
+    if not valor:
+        return None
+    try:
+        return datetime.fromisoformat(valor)
+    except ValueError:
+        return None
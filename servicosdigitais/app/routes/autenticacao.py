@@ -11,15 +11,14 @@ Conteúdo deste arquivo:
 from flask import (
     render_template, redirect, url_for, flash, request, Blueprint
 )
-from flask_login import login_required, login_user
+from flask_login import login_user
 
 from sqlalchemy.exc import SQLAlchemyError
 
 from servicosdigitais.app import bcrypt
 
 from servicosdigitais.app.models.usuario import Usuario
-from servicosdigitais.app.models.clientes import ClienteCPF, ClienteCNPJ
-from servicosdigitais.app.models.prestador import PrestadorServico
+from servicosdigitais.app.servicos.documento_servico import usuario_por_documento
 
 from servicosdigitais.app.forms.login_forms import FormLogin
 
@@ -75,16 +74,11 @@ def login():
 
             # --- LOGIN POR CPF / CNPJ ---
             else:
+                # uma busca só na tabela documento (CPF e CNPJ juntos)
                 numeros = apenas_numeros(identificador)
-                tipo_documento = detectar_tipo_por_numeros(numeros)
-
-                if tipo_documento == 'cpf':
-                    usuario = ClienteCPF.query.filter_by(cpf=numeros).first()
-
-                elif tipo_documento == 'cnpj':
-                    cliente = ClienteCNPJ.query.filter_by(cnpj=numeros).first()
-                    prestador = PrestadorServico.query.filter_by(cnpj=numeros).first()
-                    usuario = cliente or prestador
+                usuario = None
+                if detectar_tipo_por_numeros(numeros):
+                    usuario = usuario_por_documento(numeros)
 
         except SQLAlchemyError:
             flash("Erro interno ao processar o login.", "alert-danger")
@@ -164,7 +158,6 @@ def login():
 # LOGOUT
 # ======================================================
 @autenticacao_bp.route('/logout', methods=['POST'])
-@login_required
 def logout():
     logout_user()
     flash("Você foi desconectado com sucesso.", "alert-info")
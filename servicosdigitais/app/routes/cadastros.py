@@ -13,6 +13,7 @@
 from flask import (
     Blueprint, render_template, current_app, redirect, url_for, flash
     )
+from sqlalchemy.exc import IntegrityError
 from servicosdigitais.app import bancodedados, bcrypt
 from servicosdigitais.app.models.usuario import Usuario
 from servicosdigitais.app.models.clientes import ClienteCPF, ClienteCNPJ
@@ -26,6 +27,8 @@ from servicosdigitais.app.utilidades.validadores import (
 from servicosdigitais.app.utilidades.upload_imagem import (
     salvar_imagem, apagar_imagem_arquivo
     )
+from servicosdigitais.app.servicos.documento_servico import documento_em_uso
+from servicosdigitais.app.servicos.localizacao_servico import definir_localizacao
 
 
 cadastros_bp = Blueprint(
@@ -35,6 +38,19 @@ cadastros_bp = Blueprint(
 )
 
 
+# Duplicidade pega no commit (cadastros simultâneos): índices únicos de
+# lower(usuario.email) e documento.numero
+def _recusar_duplicado(nome_foto, documento):
+    bancodedados.session.rollback()
+    if nome_foto:
+        try:
+            apagar_imagem_arquivo(nome_foto, folder='perfil')
+        except Exception:
+            current_app.logger.exception("Falha ao apagar imagem após cadastro duplicado")
+    flash(f"Já existe conta com esse e-mail ou {documento}.", "alert-warning")
+    return redirect(url_for('autenticacao.login'))
+
+
 # Página inicial - Criar Conta
 @cadastros_bp.route('/criar-conta', methods=['GET'])
 def criar_conta():
@@ -63,7 +79,7 @@ def cadastrar_cpf():
                 return redirect(url_for('cadastros.cadastrar_cpf'))
 
         # Evitar duplicidade
-        if Usuario.query.filter_by(email=email).first() or ClienteCPF.query.filter_by(cpf=cpf_digits).first():
+        if Usuario.query.filter_by(email=email).first() or documento_em_uso(cpf_digits):
             flash("Já existe conta com esse e-mail ou CPF.", "alert-warning")
             return redirect(url_for('autenticacao.login'))
 
@@ -97,6 +113,9 @@ def cadastrar_cpf():
         try:
             bancodedados.session.add(novo)
             bancodedados.session.commit()
+        except IntegrityError:
+            # outro cadastro gravou o mesmo e-mail/documento entre a checagem e o commit
+            return _recusar_duplicado(saved_name, "CPF")
         except Exception:
             # se falhou e salvamos arquivo, tentar apagar para não deixar lixo
             if saved_name:
@@ -147,7 +166,7 @@ def cadastrar_cnpj():
                 return redirect(url_for('cadastros.cadastrar_cnpj'))
             
         # Checagem de duplicidade (e-mail ou cnpj já cadastrados)
-        if Usuario.query.filter_by(email=email).first() or ClienteCNPJ.query.filter_by(cnpj=cnpj_digits).first():
+        if Usuario.query.filter_by(email=email).first() or documento_em_uso(cnpj_digits):
             flash("Já existe conta com esse e-mail ou CNPJ.", "alert-warning")
             return redirect(url_for('autenticacao.login'))
 
@@ -185,6 +204,9 @@ def cadastrar_cnpj():
         try:
             bancodedados.session.add(novo)
             bancodedados.session.commit()
+        except IntegrityError:
+            # outro cadastro gravou o mesmo e-mail/documento entre a checagem e o commit
+            return _recusar_duplicado(nome_salvo, "CNPJ")
         except Exception:
             # se falhou e salvamos arquivo, tentar apagar para não deixar lixo
             if nome_salvo:
@@ -238,11 +260,8 @@ def cadastrar_prestador():
                 return redirect(url_for('cadastros.cadastrar_prestador'))
 
         # Checagem de duplicidade (e-mail ou cnpj já cadastrados)
-        existe_email = Usuario.query.filter_by(email=email).first()
-        existe_cnpj_cliente = ClienteCNPJ.query.filter_by(cnpj=cnpj_digits).first() if 'ClienteCNPJ' in globals() else None
-        existe_cnpj_prest = PrestadorServico.query.filter_by(cnpj=cnpj_digits).first()
-
-        if existe_email or existe_cnpj_cliente or existe_cnpj_prest:
+        # (CNPJ de cliente ou de prestador: uma consulta na tabela documento)
+        if Usuario.query.filter_by(email=email).first() or documento_em_uso(cnpj_digits):
             flash("Já existe conta com esse e-mail ou CNPJ.", "alert-warning")
             return redirect(url_for('autenticacao.login'))
 
@@ -261,6 +280,9 @@ def cadastrar_prestador():
             ativo = False  # precisa aprovação manual/admin
         )
 
+        # cidade/UF (opcional): entra na busca por cidade da home
+        definir_localizacao(novo, form .cidade.data, form .estado.data)
+
         # --- salvar foto ---
         nome_salvo = None
         if getattr(form , 'foto_perfil', None) and form .foto_perfil.data:
@@ -282,6 +304,9 @@ def cadastrar_prestador():
         try:
             bancodedados.session.add(novo)
             bancodedados.session.commit()
+        except IntegrityError:
+            # outro cadastro gravou o mesmo e-mail/documento entre a checagem e o commit
+            return _recusar_duplicado(nome_salvo, "CNPJ")
         except Exception:
             # se falhou e salvamos arquivo, tentar apagar para não deixar lixo
             bancodedados.session.rollback()
@@ -13,15 +13,19 @@ from wtforms.validators import EqualTo, Optional, Length
 
 from flask import (
     Blueprint, render_template, redirect,
-    url_for, flash, request, current_app
+    url_for, flash, request, current_app, abort
 )
-from flask_login import login_required, current_user
+from flask_login import current_user
 
-from servicosdigitais.app.utilidades.upload_imagem import trocar_imagem_usuario
 from servicosdigitais.app.utilidades.validadores import email_existe
-from servicosdigitais.app.utilidades.normalizadores import obter_documento_exibicao
+from servicosdigitais.app.utilidades.roteamento_banco import leitura_replica
 from servicosdigitais.app import bancodedados, bcrypt
-from servicosdigitais.app.models.usuario import Usuario
+from servicosdigitais.app.servicos.perfil_servico import (
+    obter_cartao_publico, calcular_mudancas, atualizar_perfil,
+    ConflitoDeVersao, CAMPOS_EDITAVEIS
+)
+from servicosdigitais.app.servicos.upload_servico import ler_foto, agendar_foto_perfil
+from servicosdigitais.app.servicos.localizacao_servico import definir_localizacao
 from servicosdigitais.app.forms.perfil_forms import (
     FormEditarCPF, FormEditarCNPJ, FormEditarPrestador
 )
@@ -43,7 +47,6 @@ perfil_bp = Blueprint(
 # ALTERNAR OCULTAÇÃO DE DADOS
 # ======================================================
 @perfil_bp.route('/toggle-ocultar/<int:user_id>', methods=['POST'])
-@login_required
 def toggle_ocultar(user_id):
 
     if current_user.id != user_id:
@@ -65,7 +68,6 @@ def toggle_ocultar(user_id):
 # PERFIL DO USUÁRIO LOGADO
 # ======================================================
 @perfil_bp.route('/perfil')
-@login_required
 def meu_perfil():
     """
     Redireciona sempre para o perfil público
@@ -83,71 +85,35 @@ def meu_perfil():
 # PERFIL PÚBLICO
 # ======================================================
 @perfil_bp.route('/perfil/<int:user_id>')
+@leitura_replica
 def perfil_publico(user_id):
     """
     Exibe o perfil público de um usuário.
     Aplica regras de visibilidade para dados sensíveis.
     """
 
-    # ============================
-    # USUÁRIO BASE
-    # ============================
-    usuario = Usuario.query.get_or_404(user_id)
-
     # ============================
     # CONTEXTO DE VISUALIZAÇÃO
     # ============================
     eh_logado = current_user.is_authenticated
-    eh_dono = eh_logado and current_user.id == usuario.id
+    eh_dono = eh_logado and current_user.id == user_id
     eh_admin = eh_logado and getattr(current_user, 'is_admin', False)
 
     # ============================
-    # REGRA GLOBAL DE BLUR
+    # CARTÃO PÚBLICO (CACHE)
     # ============================
-    usar_blur = (
-        usuario.ocultar_dados
-        and not eh_dono
-        and not eh_admin
-    )
+    # documento, contato e foto já vêm prontos (versão clara ou oculta);
+    # visitante não carrega o Usuario do banco
+    cartao = obter_cartao_publico(user_id, ver_tudo=eh_dono or eh_admin)
+    if cartao is None:
+        abort(404)
 
-    # ============================
-    # FOTO DE PERFIL
-    # ============================
-    foto_url = url_for(
-        'static',
-        filename=f'fotos_perfil/{usuario.foto_perfil or "default.png"}'
-    )
-
-    # ============================
-    # DOCUMENTO (CPF / CNPJ)
-    # ============================
-    documento_tipo, documento_raw = obter_documento_exibicao(usuario)
-    if documento_raw:
-        documento_display = 'Informação protegida' if usar_blur else documento_raw
-    else:
-        documento_display = 'Documento não disponível'
-        documento_tipo = 'Documento'
-
-    # ============================
-    # EMAIL (OPCIONAL)
-    # ============================
-    if usuario.email:
-        email_display = 'Informação protegida' if usar_blur else usuario.email
-    else:
-        email_display = None
-
-    # ============================
-    # TELEFONE (OPCIONAL)
-    # ============================
-    if usuario.telefone:
-        telefone_display = 'Informação protegida' if usar_blur else usuario.telefone
-    else:
-        telefone_display = 'Informação protegida' if usar_blur else 'Nenhum telefone cadastrado'
+    usar_blur = cartao['ocultar_dados'] and not eh_dono and not eh_admin
 
     # ============================
     # FORMULÁRIO POR TIPO DE USUÁRIO
     # ============================
-    tipo_usuario = usuario.tipo if eh_dono else None
+    tipo_usuario = current_user.tipo if eh_dono else None
     form = None
 
     if eh_dono:
@@ -158,32 +124,20 @@ def perfil_publico(user_id):
         else:
             form = FormEditarPrestador()
 
-        # preenchimento inicial do form
-        if form:
-            form.email.data = usuario.email
-            if hasattr(form, 'telefone'):
-                form.telefone.data = usuario.telefone
-            if hasattr(form, 'nome'):
-                form.nome.data = getattr(usuario, 'nome', '')
-            if hasattr(form, 'sobrenome'):
-                form.sobrenome.data = getattr(usuario, 'sobrenome', '')
-            if hasattr(form, 'username'):
-                form.username.data = getattr(usuario, 'username', '')
-            if hasattr(form, 'nome_empresa'):
-                form.nome_empresa.data = getattr(usuario, 'nome_empresa', '')
-            if hasattr(form, 'razao_social'):
-                form.razao_social.data = getattr(usuario, 'razao_social', '')
-            if hasattr(form, 'descricao'):
-                form.descricao.data = getattr(usuario, 'descricao', '')
+        # preenchimento inicial do form (dono = usuário já carregado)
+        for campo, coluna in CAMPOS_EDITAVEIS.items():
+            if hasattr(form, campo):
+                getattr(form, campo).data = getattr(current_user, coluna, '') or ''
+        # cidade/UF: só com o prestador carregado como PrestadorServico
+        if hasattr(form, 'cidade') and hasattr(current_user, 'localizacao'):
+            localizacao = current_user.localizacao
+            form.cidade.data = localizacao.cidade if localizacao else ''
+            form.estado.data = (localizacao.estado or '') if localizacao else ''
+        form.versao.data = current_user.versao
 
     return render_template(
         'perfils/perfil.html',
-        usuario=usuario,
-        foto_url=foto_url,
-        documento_label=documento_tipo,
-        documento_display=documento_display,
-        email_display=email_display,
-        telefone_display=telefone_display,
+        cartao=cartao,
         usar_blur=usar_blur,
         eh_dono=eh_dono,
         eh_admin=eh_admin,
@@ -195,12 +149,16 @@ def perfil_publico(user_id):
 # EDITAR PERFIL
 # ======================================================
 @perfil_bp.route('/perfil/editar', methods=['POST'])
-@login_required
 def editar_perfil():
     """
     Edita dados do perfil do usuário logado.
     Permite alterar dados básicos e senha (opcional),
     sem exigir senha atual.
+    - Grava só as colunas que mudaram (um UPDATE)
+    - Campo oculto 'versao': se a conta mudou depois que o formulário
+      foi aberto (outra aba / admin), nada é sobrescrito
+    - A foto é processada em segundo plano
+    - Prestador: cidade/UF ficam na tabela localizacao (busca por cidade)
     """
 
     tipo_usuario = current_user.tipo
@@ -208,15 +166,13 @@ def editar_perfil():
     # ==========================================================
     # SELEÇÃO DO FORMULÁRIO CORRETO
     # ==========================================================
-    if tipo_usuario == 'cpf':
-        form = FormEditarCPF(obj=current_user)
-    elif tipo_usuario == 'cnpj':
-        form = FormEditarCNPJ(obj=current_user)
+    if tipo_usuario == 'cnpj':
+        form = FormEditarCNPJ()
     elif tipo_usuario == 'prestador':
-        form = FormEditarPrestador(obj=current_user)
+        form = FormEditarPrestador()
     else:
-        # Admin ou fallback
-        form = FormEditarCPF(obj=current_user)
+        # CPF, admin ou fallback
+        form = FormEditarCPF()
 
     # ==========================================================
     # VALIDAÇÃO DO FORMULÁRIO
@@ -225,79 +181,64 @@ def editar_perfil():
         flash("Erro ao validar o formulário.", "danger")
         return redirect(url_for('perfil.meu_perfil'))
 
-    alterou_algo = False
-
     # ==========================================================
-    # NOME
+    # DIFERENÇAS (nome, sobrenome, razão social, e-mail, telefone)
     # ==========================================================
-    if hasattr(form, 'nome'):
-        nome_novo = (form.nome.data or '').strip()
-        nome_atual = (current_user.nome or '').strip()
+    mudancas = calcular_mudancas(current_user, form.data)
 
-        if nome_novo != nome_atual:
-            current_user.nome = nome_novo if nome_novo else None
-            alterou_algo = True
+    if 'email' in mudancas and email_existe(mudancas['email'], exclude_user_id=current_user.id):
+        flash("E-mail já está em uso.", "warning")
+        return redirect(url_for('perfil.meu_perfil'))
 
     # ==========================================================
-    # SOBRENOME
+    # ALTERAÇÃO DE SENHA (SEM SENHA ATUAL)
     # ==========================================================
-    if hasattr(form, 'sobrenome'):
-        sobrenome_novo = (form.sobrenome.data or '').strip()
-        sobrenome_atual = (current_user.sobrenome or '').strip()
-
-        if sobrenome_novo != sobrenome_atual:
-            current_user.sobrenome = sobrenome_novo if sobrenome_novo else None
-            alterou_algo = True
+    if form.nova_senha.data:
+        mudancas['senha_hash'] = gerar_senha_hash(form.nova_senha.data)
 
     # ==========================================================
-    # EMAIL
+    # FOTO: checagem rápida antes de gravar qualquer coisa
     # ==========================================================
-    if hasattr(form, 'email'):
-        email_novo = form.email.data.strip()
-
-        if email_novo != current_user.email:
-            if email_existe(email_novo, exclude_user_id=current_user.id):
-                flash("E-mail já está em uso.", "warning")
-                return redirect(url_for('perfil.meu_perfil'))
-
-            current_user.email = email_novo
-            alterou_algo = True
+    nova_foto = None
+    arquivo_foto = getattr(form, 'foto_perfil', None) and form.foto_perfil.data
+    if arquivo_foto:
+        try:
+            nova_foto = ler_foto(arquivo_foto)
+        except ValueError as erro:
+            flash(str(erro), "danger")
+            return redirect(url_for('perfil.meu_perfil'))
 
     # ==========================================================
-    # TELEFONE
+    # SALVAR ALTERAÇÕES
     # ==========================================================
-    if hasattr(form, 'telefone'):
-        telefone_novo = (form.telefone.data or '').strip()
-        telefone_atual = (current_user.telefone or '').strip()
 
-        if telefone_novo != telefone_atual:
-            current_user.telefone = telefone_novo if telefone_novo else None
-            alterou_algo = True
+    try:
+        alterou_dados = atualizar_perfil(current_user, mudancas, form.versao.data)
 
-    # ==========================================================
-    # ALTERAÇÃO DE SENHA (SEM SENHA ATUAL)
-    # ==========================================================
-    if form.nova_senha.data:
-        current_user.senha = gerar_senha_hash(form.nova_senha.data)
-        alterou_algo = True
+        # cidade/UF do prestador: outra tabela, fora da trava de versão
+        if (hasattr(form, 'cidade') and hasattr(current_user, 'localizacao')
+                and definir_localizacao(current_user, form.cidade.data, form.estado.data)):
+            bancodedados.session.commit()
+            alterou_dados = True
+    except ConflitoDeVersao:
+        flash("Seu perfil foi alterado em outro lugar. Confira os dados e tente de novo.", "warning")
+        return redirect(url_for('perfil.meu_perfil'))
+    except Exception:
+        bancodedados.session.rollback()
+        current_app.logger.exception("Erro ao salvar alterações do perfil")
+        flash("Erro ao salvar alterações.", "danger")
+        return redirect(url_for('perfil.meu_perfil'))
 
     # ==========================================================
-    # FOTO DE PERFIL
+    # FOTO DE PERFIL (segundo plano)
     # ==========================================================
-    if hasattr(form, 'foto_perfil') and form.foto_perfil.data:
-        trocar_imagem_usuario(current_user, form.foto_perfil.data)
-        alterou_algo = True
+    if nova_foto:
+        agendar_foto_perfil(current_user.id, nova_foto)
 
-    # ==========================================================
-    # SALVAR ALTERAÇÕES
-    # ==========================================================
-    if alterou_algo:
-        try:
-            bancodedados.session.commit()
-            flash("Perfil atualizado com sucesso.", "success")
-        except Exception:
-            bancodedados.session.rollback()
-            flash("Erro ao salvar alterações.", "danger")
+    if alterou_dados:
+        flash("Perfil atualizado com sucesso.", "success")
+    elif nova_foto:
+        flash("Foto recebida. Ela aparece no perfil em instantes.", "success")
     else:
         flash("Nenhuma alteração foi detectada.", "info")
 
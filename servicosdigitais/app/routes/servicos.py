@@ -4,28 +4,34 @@
 
 ''' O que tem dentro da Página Serviços:
 - Rota '/servicos' → lista automática e alfabética de serviços (nomes únicos)
-- Rota '/prestadores' → lista de prestadores de uma especialidade
+- Rota '/prestadores' → lista de prestadores (?especialidade= e/ou ?cidade=;
+  ?lat=&lon=&raio= → os mais próximos, em ordem de distância)
 - Rota '/prestador/<int:prestador_id>' → detalhes completos de um prestador
 - HTML final divide a tela em 20% | 20% | 60%
 - Cada rota bloqueia o acesso de usuários do tipo 'prestador'
 - Tratamento de erros com logging
+- Consultas das rotas vão ao bind "leitura" (réplica) quando configurado
 - Uso de SQLAlchemy para consultas ao banco de dados
 - Templates Jinja2 para renderização das páginas
 - Comentários explicativos em cada função
 - Uso de Blueprint para organização das rotas
 '''
 
+import math
+
 from flask_login import current_user
 from flask import (
     Blueprint, render_template, request, abort, current_app
     )
 
-from sqlalchemy import func
-
 from servicosdigitais.app.extensoes import bancodedados
-from servicosdigitais.app.utilidades.autorizacao import bloquear_tipos
+from servicosdigitais.app.utilidades.roteamento_banco import leitura_replica
 from servicosdigitais.app.models.usuario import Usuario
 from servicosdigitais.app.models.prestador import PrestadorServico, ServicoPrestado
+from servicosdigitais.app.servicos.catalogo_servico import listar_especialidades
+from servicosdigitais.app.servicos.localizacao_servico import (
+    listar_cidades, buscar_prestadores, buscar_proximos
+)
 
 
 servicos_bp = Blueprint(
@@ -35,8 +41,6 @@ servicos_bp = Blueprint(
     url_prefix=""
 )
 
-TextosEntrada = "Olá Mundo!"
-Localizacao = ""
 
 # -------------------------
 # Páginas Home
@@ -45,71 +49,35 @@ Localizacao = ""
 # rota home - ServicosDigitais
 # Teóricamente foi feita 90%
 @servicos_bp.route('/')
+@leitura_replica
 def home():
     """
     Página inicial:
-    - lista textos de entrada (tabela: TextosEntrada, coluna: textos_entrada);
-    - lista cidades cadastradas (tabela Localizacao, coluna: cidade);
+    - textos do site (TextosEntrada: 'home_banner', 'home_cadastro'):
+      lidos no template por conteudo(), em memória (conteudo_servico);
+    - lista cidades cadastradas (tabela Localizacao, coluna: cidade; em cache);
     - lista especialidades (tabela PrestadorServico, coluna: especialidade)
     - mini-painel de sugestão para cadastro:
        - linha 1: "Você ainda não tem cadastro?"
-       - linha 2: texto vindo de TextosEntrada.texto_cadastro (se existir)
+       - linha 2: conteudo('home_cadastro') (ou o texto padrão)
        - linha 3: links para cadastro CPF, prestador e CNPJ (usando nomes de rota padrão)
     """
-    texto_entrada_manual = "Olá Mundo"
-    texto_cadastro_manual = "Vamos te guiar o melhor para você!"
-
-    # ===========================
-    # TEXTOS DE ENTRADA
-    # ===========================
-    try:
-        textos = TextosEntrada.query.first()
-    except Exception:
-        textos = None
-
-    texto_entrada = (
-        textos.texto_entrada
-        if textos and getattr(textos, "texto_entrada", None)
-        else texto_entrada_manual
-    )
-
-    texto_cadastro = (
-        textos.texto_cadastro
-        if textos and getattr(textos, "texto_cadastro", None)
-        else texto_cadastro_manual
-    )
     # ===========================
-    # CIDADES (Tabela localizacao)
+    # CIDADES (Tabela localizacao, em cache)
     # ===========================
     regioes_manuais = ["Indaiatuba", "Itu", "Salto"]
 
     try:
-        cidades_q = (
-            Localizacao.query.with_entities(Localizacao.cidade)
-            .distinct()
-            .order_by(Localizacao.cidade)
-            .all()
-        )
-        regioes = [c.cidade for c in cidades_q if c.cidade]
-        if not regioes:
-            regioes = regioes_manuais
+        regioes = list(listar_cidades()) or regioes_manuais
     except Exception:
+        current_app.logger.exception("Erro ao listar cidades")
         regioes = regioes_manuais
 
     # ===========================
-    # SERVIÇOS
+    # SERVIÇOS (catálogo em cache)
     # ===========================
     try:
-        servicos_q = (
-            PrestadorServico.query.with_entities(PrestadorServico.especialidade)
-            .distinct()
-            .order_by(PrestadorServico.especialidade)
-            .all()
-        )
-        servicos = [
-            s.especialidade for s in servicos_q
-            if s.especialidade and s.especialidade.strip()
-        ]
+        servicos = list(listar_especialidades())
     except Exception:
         servicos = []
 
@@ -123,43 +91,21 @@ def home():
 
     return render_template(
         'home.html',
-        texto_entrada=texto_entrada,
-        texto_cadastro=texto_cadastro,
         regioes=regioes,
         servicos=servicos,
         usuario_logado=usuario_logado
     )
 
 @servicos_bp.route('/servicos')
-@bloquear_tipos('prestador') # Prestador não entra na página
+@leitura_replica
 def listar_servicos():
     """
     Lista automática e alfabética de serviços (nomes únicos)
     - se vazio: frase "No momento ainda não tem serviços cadastrados"
     - cada nome linka para a rota '/prestadores' com ?especialidade=<nome>
     """
-    servicos_unicos = []
     try:
-        if PrestadorServico is not None:
-            q = (
-bancodedados.session.query(func.trim(PrestadorServico.especialidade).label('esp'))
-                .filter(PrestadorServico.especialidade != None)
-                .filter(func.trim(PrestadorServico.especialidade) != '')
-                .distinct()
-            .order_by(func.upper(func.trim(PrestadorServico.especialidade)))
-            )
-            servicos_unicos = [row.esp for row in q.all()]
-        else:
-            # fallback: tenta obter das especialidades dos prestadores
-            if PrestadorServico is not None:
-                q = (
-bancodedados.session.query(func.trim(PrestadorServico.especialidade).label('esp'))
-                    .filter(PrestadorServico.especialidade != None)
-                    .filter(func.trim(PrestadorServico.especialidade) != '')
-                    .distinct()
-            .order_by(func.upper(func.trim(PrestadorServico.especialidade)))
-            )
-                servicos_unicos = [row.esp for row in q.all()]
+        servicos_unicos = list(listar_especialidades())
     except Exception as e:
         # registra no logger da aplicação e devolve lista vazia (evita 500)
         current_app.logger.exception("Erro ao listar serviços únicos: %s", e)
@@ -171,44 +117,49 @@ bancodedados.session.query(func.trim(PrestadorServico.especialidade).label('esp'
     )
 
 
+def _ponto_da_busca():
+    """
+    Lê ?lat=&lon=&raio= (graus / km).
+    Retorna (lat, lon, raio) ou None se faltar ou for inválido.
+    """
+    lat = request.args.get('lat', type=float)
+    lon = request.args.get('lon', type=float)
+    if lat is None or lon is None:
+        return None
+    if not (math.isfinite(lat) and math.isfinite(lon)) or abs(lat) > 90 or abs(lon) > 180:
+        return None
+
+    raio = request.args.get('raio', type=float)
+    if raio is None or not math.isfinite(raio) or raio <= 0:
+        raio = current_app.config.get('PROXIMIDADE_RAIO_PADRAO_KM', 10)
+    raio = min(raio, current_app.config.get('PROXIMIDADE_RAIO_MAX_KM', 200))
+    return lat, lon, raio
+
+
 @servicos_bp.route('/prestadores')
-@bloquear_tipos('prestador') # Prestador não entra na página
+@leitura_replica
 def listar_prestadores():
     """
     Segunda coluna (20%) — Lista de prestadores de uma especialidade.
     Também envia a lista de serviços (coluna 1), pois o layout é fixo.
     """
     especialidade = request.args.get('especialidade', None)
+    cidade = (request.args.get('cidade') or '').strip() or None
 
-    # --- Coluna 1: lista de serviços únicos ---
+    # --- Coluna 1: lista de serviços únicos (catálogo em cache) ---
     try:
-        q = (
-            bancodedados.session.query(func.trim(PrestadorServico.especialidade).label('esp'))
-            .filter(PrestadorServico.especialidade != None)
-            .filter(func.trim(PrestadorServico.especialidade) != '')
-            .distinct()
-            .order_by(func.upper(func.trim(PrestadorServico.especialidade)))
-        )
-        todos_servicos = [row.esp for row in q.all()]
+        todos_servicos = list(listar_especialidades())
     except Exception as e:
         current_app.logger.exception("Erro ao listar serviços únicos: %s", e)
         todos_servicos = []
 
-    # --- Coluna 2: lista de prestadores daquela especialidade ---
+    # --- Coluna 2: prestadores (proximidade, ou cidade e/ou especialidade) ---
+    ponto = _ponto_da_busca()
     try:
-        if especialidade:
-            prestadores = (
-                PrestadorServico.query
-                .filter(PrestadorServico.especialidade == especialidade)
-                .order_by(PrestadorServico.nome)
-                .all()
-            )
+        if ponto:
+            prestadores = buscar_proximos(*ponto, especialidade=especialidade)
         else:
-            prestadores = (
-                PrestadorServico.query
-                .order_by(PrestadorServico.nome)
-                .all()
-            )
+            prestadores = buscar_prestadores(cidade=cidade, especialidade=especialidade)
     except Exception as e:
         current_app.logger.exception("Erro ao buscar prestadores: %s", e)
         prestadores = []
@@ -217,12 +168,14 @@ def listar_prestadores():
         'servicos/lista_prestadores.html',
         todos_servicos=todos_servicos,   # coluna 1
         prestadores=prestadores,         # coluna 2
-        especialidade=especialidade or 'Todos'
+        especialidade=especialidade or 'Todos',
+        cidade=cidade,
+        raio=ponto[2] if ponto else None
     )
 
 
 @servicos_bp.route('/prestador/<int:prestador_id>')
-@bloquear_tipos('prestador') # Prestador não entra na página
+@leitura_replica
 def detalhes_prestador(prestador_id):
     """
     Exibe detalhes completos de um prestador.
@@ -0,0 +1,60 @@
+# ========================
+# Serviços - Catálogo de especialidades
+# ========================
+
+''' O que tem neste arquivo:
+- listar_especialidades: nomes únicos (sem espaços extras), em ordem alfabética
+- Resultado guardado no cache da aplicação (extensoes.cache)
+- limpar_cache_catalogo: chamado quando prestadores mudam
+- Eventos do ORM em PrestadorServico limpam o cache sozinhos
+  (inserções em lote pelo bulk_insert_mappings chamam limpar_cache_catalogo)
+'''
+
+from sqlalchemy import event, func, inspect, select
+
+from servicosdigitais.app.extensoes import bancodedados, cache
+from servicosdigitais.app.models import PrestadorServico
+
+CHAVE_ESPECIALIDADES = 'catalogo:especialidades'
+
+
+def _consultar_especialidades():
+    especialidade = func.trim(PrestadorServico.especialidade)
+    consulta = (
+        select(especialidade.label('esp'))
+        .where(PrestadorServico.especialidade.is_not(None))
+        .where(especialidade != '')
+        .distinct()
+        .order_by(func.upper(especialidade))
+    )
+    return [linha.esp for linha in bancodedados.session.execute(consulta)]
+
+
+def listar_especialidades():
+    """
+    Lista de especialidades cadastradas (tupla, para não ser alterada
+    por quem usa o valor do cache).
+    """
+    return cache.obter_ou_calcular(
+        CHAVE_ESPECIALIDADES,
+        lambda: tuple(_consultar_especialidades())
+    )
+
+
+def limpar_cache_catalogo():
+    cache.delete(CHAVE_ESPECIALIDADES)
+
+
+# ======================================================
+# INVALIDAÇÃO AUTOMÁTICA (ORM)
+# ======================================================
+@event.listens_for(PrestadorServico, 'after_insert')
+@event.listens_for(PrestadorServico, 'after_delete')
+def _prestador_mudou(mapper, conexao, alvo):
+    limpar_cache_catalogo()
+
+
+@event.listens_for(PrestadorServico, 'after_update')
+def _prestador_atualizado(mapper, conexao, alvo):
+    if inspect(alvo).attrs.especialidade.history.has_changes():
+        limpar_cache_catalogo()
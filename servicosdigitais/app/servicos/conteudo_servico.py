@@ -0,0 +1,153 @@
+# ========================
+# Serviços - Conteúdo do site (TextosEntrada / ImagensSite)
+# ========================
+
+''' O que tem neste arquivo:
+- Textos (por chave) e imagens do site carregados UMA vez num dicionário
+  do processo (app.extensions['conteudo']); templates leem sem consulta
+- conteudo('home_banner', padrao): texto da chave (global do Jinja)
+- obter_texto: Texto(chave, titulo, conteudo) ou None
+- listar_imagens: Imagem(nome_arquivo, descricao), mais recentes primeiro
+  (global do Jinja: imagens_site)
+- invalidar_conteudo: sobe a versão; a próxima leitura recarrega
+- Eventos do ORM em TextosEntrada / ImagensSite sobem a versão sozinhos,
+  depois do commit (utilidades/banco.limpar_apos_commit)
+
+Obs.: a versão é por processo (como o cache 'simples'); os outros workers
+recarregam no máximo a cada CONTEUDO_RECARGA_TEMPO segundos.
+'''
+
+import threading
+import time
+from collections import namedtuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, select
+
+from servicosdigitais.app.extensoes import bancodedados
+from servicosdigitais.app.models import TextosEntrada, ImagensSite
+from servicosdigitais.app.utilidades.banco import registrar_limpeza, limpar_apos_commit
+
+Texto = namedtuple('Texto', 'chave titulo conteudo')
+Imagem = namedtuple('Imagem', 'nome_arquivo descricao')
+
+
+# ======================================================
+# ARMAZÉM (um por app)
+# ======================================================
+class _Armazem:
+    """Fotografia imutável do conteúdo + versão pedida pelos eventos."""
+
+    __slots__ = ('versao', 'versao_carregada', 'carregado_em', 'textos', 'imagens', 'lock')
+
+    def __init__(self):
+        self.versao = 0
+        self.versao_carregada = None
+        self.carregado_em = 0.0
+        self.textos = {}
+        self.imagens = ()
+        self.lock = threading.Lock()
+
+
+def _armazem(app=None):
+    app = app or current_app
+    armazem = app.extensions.get('conteudo')
+    if armazem is None:
+        armazem = app.extensions.setdefault('conteudo', _Armazem())
+    return armazem
+
+
+def _consultar():
+    textos = {
+        linha.chave: Texto(linha.chave, linha.titulo, linha.conteudo)
+        for linha in bancodedados.session.execute(
+            select(TextosEntrada.chave, TextosEntrada.titulo, TextosEntrada.conteudo)
+        )
+    }
+    imagens = tuple(
+        Imagem(linha.nome_arquivo, linha.descricao)
+        for linha in bancodedados.session.execute(
+            select(ImagensSite.nome_arquivo, ImagensSite.descricao)
+            .order_by(ImagensSite.carregado_em.desc(), ImagensSite.id.desc())
+        )
+    )
+    return textos, imagens
+
+
+def _atual():
+    """Armazém em dia: recarrega se a versão subiu ou se passou do tempo."""
+    armazem = _armazem()
+    tempo = current_app.config.get('CONTEUDO_RECARGA_TEMPO', 300)
+
+    if (armazem.versao_carregada == armazem.versao
+            and time.monotonic() - armazem.carregado_em < tempo):
+        return armazem
+
+    with armazem.lock:
+        # outra thread pode ter recarregado enquanto esperávamos
+        versao = armazem.versao
+        if (armazem.versao_carregada != versao
+                or time.monotonic() - armazem.carregado_em >= tempo):
+            try:
+                armazem.textos, armazem.imagens = _consultar()
+            except Exception:
+                # mantém o que já tinha; tenta de novo na próxima leitura
+                current_app.logger.exception("Erro ao carregar o conteúdo do site")
+                return armazem
+            armazem.versao_carregada = versao
+            armazem.carregado_em = time.monotonic()
+    return armazem
+
+
+# ======================================================
+# LEITURA (rotas e templates)
+# ======================================================
+def obter_texto(chave):
+    """Texto(chave, titulo, conteudo) da chave, ou None se não existir."""
+    return _atual().textos.get(chave)
+
+
+def conteudo(chave, padrao=''):
+    """Conteúdo do texto da chave (ou o padrão se não houver / estiver vazio)."""
+    texto = _atual().textos.get(chave)
+    if texto is None or not texto.conteudo:
+        return padrao
+    return texto.conteudo
+
+
+def listar_imagens():
+    """Imagens do site (tupla), das mais recentes para as mais antigas."""
+    return _atual().imagens
+
+
+def invalidar_conteudo(app=None):
+    """Sobe a versão: a próxima leitura neste processo recarrega tudo."""
+    armazem = _armazem(app)
+    with armazem.lock:
+        armazem.versao += 1
+
+
+# ======================================================
+# INVALIDAÇÃO AUTOMÁTICA (ORM)
+# ======================================================
+# Sobe a versão só depois do commit: no flush, uma leitura concorrente
+# recarregaria as linhas antigas e as guardaria como a versão nova.
+LIMPEZA_CONTEUDO = 'conteudo_site'
+
+
+def _conteudo_commitado(_chaves):
+    if has_app_context():
+        invalidar_conteudo()
+
+
+registrar_limpeza(LIMPEZA_CONTEUDO, _conteudo_commitado)
+
+
+@event.listens_for(TextosEntrada, 'after_insert')
+@event.listens_for(TextosEntrada, 'after_update')
+@event.listens_for(TextosEntrada, 'after_delete')
+@event.listens_for(ImagensSite, 'after_insert')
+@event.listens_for(ImagensSite, 'after_update')
+@event.listens_for(ImagensSite, 'after_delete')
+def _conteudo_mudou(mapper, conexao, alvo):
+    limpar_apos_commit(alvo, LIMPEZA_CONTEUDO)
@@ -0,0 +1,36 @@
+# ========================
+# Serviços - Documentos (CPF / CNPJ)
+# ========================
+
+''' O que tem neste arquivo:
+- documento_em_uso: UMA consulta na tabela documento (índice único)
+  em vez de uma por tabela de conta
+- usuario_por_documento: conta dona do CPF/CNPJ (login por documento)
+A garantia de verdade é o índice único: quem cadastra ainda precisa
+tratar IntegrityError no commit (dois cadastros ao mesmo tempo).
+'''
+
+from sqlalchemy import exists, select
+
+from servicosdigitais.app.extensoes import bancodedados
+from servicosdigitais.app.models import Documento, Usuario
+
+
+def documento_em_uso(numero):
+    """True se o CPF/CNPJ (só dígitos) já pertence a alguma conta."""
+    if not numero:
+        return False
+    consulta = select(exists().where(Documento.numero == numero))
+    return bool(bancodedados.session.scalar(consulta))
+
+
+def usuario_por_documento(numero):
+    """Usuario dono do CPF/CNPJ (só dígitos) ou None."""
+    if not numero:
+        return None
+    consulta = (
+        select(Usuario)
+        .join(Documento, Documento.usuario_id == Usuario.id)
+        .where(Documento.numero == numero)
+    )
+    return bancodedados.session.scalars(consulta).first()
@@ -0,0 +1,159 @@
+# ========================
+# Serviços - Exportação de usuários e prestadores
+# ========================
+
+''' O que tem neste arquivo:
+- Consultas com projeção de colunas (sem carregar objetos ORM)
+- Leitura em blocos com yield_per (memória constante)
+- Geradores CSV e JSONL, com máscara de dados sensíveis
+- Compactação gzip opcional feita em fluxo (sem montar o arquivo inteiro)
+'''
+
+import csv
+import io
+import json
+import zlib
+
+from sqlalchemy import select, func
+
+from servicosdigitais.app.extensoes import bancodedados
+from servicosdigitais.app.models import (
+    Usuario, ClienteCPF, ClienteCNPJ, PrestadorServico
+)
+from servicosdigitais.app.utilidades.normalizadores import (
+    _mask_doc, _mask_email, _mask_phone
+)
+
+ENTIDADES_EXPORTACAO = ('usuarios', 'prestadores')
+FORMATOS_EXPORTACAO = ('csv', 'jsonl')
+
+# Linhas buscadas por ida ao banco
+TAMANHO_BLOCO_EXPORTACAO = 1000
+
+# Colunas que passam pela máscara antes de sair
+_MASCARAS = {
+    'email': _mask_email,
+    'telefone': _mask_phone,
+    'documento': _mask_doc,
+}
+
+
+# Tabelas das subclasses (joined inheritance): juntar pela tabela evita
+# que o ORM repita o JOIN com "usuario" para cada subclasse.
+_cpf = ClienteCPF.__table__
+_cnpj = ClienteCNPJ.__table__
+_prestador = PrestadorServico.__table__
+
+
+def _consulta_usuarios():
+    documento = func.coalesce(
+        _cpf.c.cpf, _cnpj.c.cnpj, _prestador.c.cnpj
+    ).label('documento')
+
+    return (
+        select(
+            Usuario.id, Usuario.nome, Usuario.sobrenome, Usuario.email,
+            Usuario.telefone, Usuario.tipo, documento,
+            Usuario.ativo, Usuario.is_admin, Usuario.created_at
+        )
+        .outerjoin(_cpf, _cpf.c.id == Usuario.id)
+        .outerjoin(_cnpj, _cnpj.c.id == Usuario.id)
+        .outerjoin(_prestador, _prestador.c.id == Usuario.id)
+        .order_by(Usuario.id)
+    )
+
+
+def _consulta_prestadores():
+    return (
+        select(
+            Usuario.id, Usuario.nome, Usuario.email, Usuario.telefone,
+            _prestador.c.cnpj.label('documento'),
+            _prestador.c.especialidade,
+            Usuario.ativo, Usuario.created_at
+        )
+        .join(_prestador, _prestador.c.id == Usuario.id)
+        .order_by(Usuario.id)
+    )
+
+
+_CONSULTAS = {
+    'usuarios': _consulta_usuarios,
+    'prestadores': _consulta_prestadores,
+}
+
+
+def _linhas_mascaradas(entidade):
+    """
+    Gera (colunas, blocos de linhas) já mascaradas.
+    O yield_per faz o driver buscar em blocos; nada é acumulado.
+    """
+    consulta = _CONSULTAS[entidade]().execution_options(
+        yield_per=TAMANHO_BLOCO_EXPORTACAO
+    )
+    resultado = bancodedados.session.execute(consulta)
+    colunas = list(resultado.keys())
+    mascaras = [_MASCARAS.get(nome) for nome in colunas]
+
+    def _blocos():
+        for bloco in resultado.partitions():
+            yield [
+                [
+                    mascara(valor) if mascara and valor is not None else valor
+                    for valor, mascara in zip(linha, mascaras)
+                ]
+                for linha in bloco
+            ]
+
+    return colunas, _blocos()
+
+
+def _gerar_csv(entidade):
+    colunas, blocos = _linhas_mascaradas(entidade)
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+
+    escritor.writerow(colunas)
+    for bloco in blocos:
+        escritor.writerows(bloco)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+    # cabeçalho sozinho (tabela vazia)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _gerar_jsonl(entidade):
+    colunas, blocos = _linhas_mascaradas(entidade)
+    for bloco in blocos:
+        yield ''.join(
+            json.dumps(dict(zip(colunas, linha)), ensure_ascii=False, default=str) + '\n'
+            for linha in bloco
+        )
+
+
+def _compactar_gzip(pedacos, nivel=6):
+    """Compacta um gerador de texto em gzip, pedaço a pedaço."""
+    compressor = zlib.compressobj(nivel, zlib.DEFLATED, 31)  # 31 = cabeçalho gzip
+    for pedaco in pedacos:
+        dados = compressor.compress(pedaco.encode('utf-8'))
+        if dados:
+            yield dados
+    yield compressor.flush()
+
+
+def gerar_exportacao(entidade, formato, gzip=False):
+    """
+    Retorna um gerador com o conteúdo da exportação.
+    - entidade: 'usuarios' | 'prestadores'
+    - formato: 'csv' | 'jsonl'
+    - gzip: se True, gera bytes gzip; senão, texto
+    """
+    if entidade not in ENTIDADES_EXPORTACAO:
+        raise ValueError(f"Entidade inválida: {entidade}")
+    if formato not in FORMATOS_EXPORTACAO:
+        raise ValueError(f"Formato inválido: {formato}")
+
+    pedacos = _gerar_csv(entidade) if formato == 'csv' else _gerar_jsonl(entidade)
+    return _compactar_gzip(pedacos) if gzip else pedacos
@@ -0,0 +1,433 @@
+# ========================
+# Serviços - Importação em lote de prestadores e serviços
+# ========================
+
+''' O que tem neste arquivo:
+- Leitura em fluxo de CSV ou JSONL (linha a linha, sem carregar o arquivo)
+- Validação dos CNPJs por bloco
+- Duplicidade contra o banco com UMA consulta por bloco (CNPJ + e-mail)
+- Inserção com bulk_insert_mappings em blocos (prestadores, documentos,
+  localizações e serviços)
+- Relatório de progresso e de linhas rejeitadas
+
+Campos aceitos por registro:
+    nome, email, cnpj (obrigatórios)
+    telefone, especialidade, senha (opcionais)
+    cidade, estado (opcionais; com cidade, cria a Localizacao)
+    latitude, longitude (opcionais, em graus; exigem cidade)
+    servicos: lista de {nome_servico, preco_servico, descricao} (JSONL)
+    servico, preco, descricao: um serviço por linha (CSV)
+'''
+
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+
+from flask import current_app
+from sqlalchemy import select, literal, union_all, func
+
+from servicosdigitais.app.extensoes import bancodedados
+from servicosdigitais.app.models import (
+    Usuario, Documento, Localizacao, PrestadorServico, ServicoPrestado
+)
+from servicosdigitais.app.utilidades.validadores import (
+    apenas_numeros, parece_email, validar_cnpjs
+)
+from servicosdigitais.app.utilidades.normalizadores import normalizar_texto
+from servicosdigitais.app.utilidades.seguranca import (
+    gerar_senha_temp, gerar_senhas_hash_em_paralelo
+)
+from servicosdigitais.app.utilidades.comunicacao.email_padrao import (
+    email_boas_vindas_importacao
+)
+from servicosdigitais.app.utilidades.comunicacao.servicos_email import enfileirar_emails
+from servicosdigitais.app.servicos.catalogo_servico import limpar_cache_catalogo
+from servicosdigitais.app.servicos.localizacao_servico import limpar_cache_cidades
+
+
+FORMATOS_IMPORTACAO = ('csv', 'jsonl')
+TAMANHO_BLOCO_IMPORTACAO = 500
+
+
+class ResultadoImportacao:
+    """
+    Acumula o andamento da importação.
+    Só guarda contadores e a lista de rejeitados (linha, motivo).
+    """
+
+    def __init__(self):
+        self.lidos = 0
+        self.importados = 0
+        self.servicos = 0
+        self.blocos = 0
+        self.rejeitados = []
+
+    def rejeitar(self, linha, motivo, identificador=None):
+        self.rejeitados.append({
+            'linha': linha,
+            'motivo': motivo,
+            'identificador': identificador,
+        })
+
+    def como_dict(self):
+        return {
+            'lidos': self.lidos,
+            'importados': self.importados,
+            'servicos': self.servicos,
+            'blocos': self.blocos,
+            'rejeitados': len(self.rejeitados),
+            'detalhes_rejeitados': self.rejeitados,
+        }
+
+
+# ======================================================
+# LEITURA EM FLUXO
+# ======================================================
+def ler_registros(arquivo_texto, formato):
+    """
+    Gera (numero_linha, registro_dict) a partir de um arquivo de texto.
+    Registros ilegíveis saem como (numero_linha, None).
+    """
+    if formato == 'csv':
+        leitor = csv.DictReader(arquivo_texto)
+        # linha 1 é o cabeçalho
+        for numero, registro in enumerate(leitor, start=2):
+            yield numero, registro
+        return
+
+    for numero, linha in enumerate(arquivo_texto, start=1):
+        linha = linha.strip()
+        if not linha:
+            continue
+        try:
+            registro = json.loads(linha)
+        except ValueError:
+            registro = None
+        yield numero, registro if isinstance(registro, dict) else None
+
+
+def _em_blocos(registros, tamanho):
+    bloco = []
+    for item in registros:
+        bloco.append(item)
+        if len(bloco) >= tamanho:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+# ======================================================
+# NORMALIZAÇÃO / VALIDAÇÃO
+# ======================================================
+def _texto(registro, campo):
+    valor = registro.get(campo)
+    if valor is None:
+        return ''
+    return str(valor).strip()
+
+
+def _preco(valor):
+    if valor in (None, ''):
+        return Decimal('0')
+    try:
+        return Decimal(str(valor).replace(',', '.'))
+    except InvalidOperation:
+        return None
+
+
+def _coordenadas(registro):
+    """
+    (latitude, longitude) do registro, (None, None) se vierem vazias
+    ou None se inválidas (só uma, fora da faixa, texto).
+    """
+    lat, lon = _texto(registro, 'latitude'), _texto(registro, 'longitude')
+    if not lat and not lon:
+        return None, None
+    try:
+        lat, lon = float(lat.replace(',', '.')), float(lon.replace(',', '.'))
+    except ValueError:
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):  # NaN também cai aqui
+        return None
+    return lat, lon
+
+
+def _servicos_do_registro(registro):
+    """Extrai a lista de serviços (formato JSONL ou colunas do CSV)."""
+    brutos = registro.get('servicos')
+    if not isinstance(brutos, list):
+        brutos = []
+        if _texto(registro, 'servico'):
+            brutos.append({
+                'nome_servico': registro.get('servico'),
+                'preco_servico': registro.get('preco'),
+                'descricao': registro.get('descricao'),
+            })
+
+    servicos = []
+    for bruto in brutos:
+        if not isinstance(bruto, dict):
+            return None
+        nome = _texto(bruto, 'nome_servico') or _texto(bruto, 'nome')
+        preco = _preco(bruto.get('preco_servico', bruto.get('preco')))
+        if not nome or preco is None:
+            return None
+        servicos.append({
+            'nome_servico': nome[:150],
+            'preco_servico': preco,
+            'descricao': _texto(bruto, 'descricao') or None,
+        })
+    return servicos
+
+
+def _preparar_bloco(bloco, resultado, vistos_cnpj, vistos_email, validar_digitos):
+    """
+    Normaliza e valida um bloco de registros.
+    Retorna a lista de candidatos (dicts) que passaram.
+    """
+    candidatos = []
+
+    for numero, registro in bloco:
+        resultado.lidos += 1
+
+        if registro is None:
+            resultado.rejeitar(numero, 'registro_ilegivel')
+            continue
+
+        nome = _texto(registro, 'nome')
+        email = _texto(registro, 'email').lower()
+        cnpj = apenas_numeros(_texto(registro, 'cnpj'))
+
+        if not nome or not email or not cnpj:
+            resultado.rejeitar(numero, 'campos_obrigatorios', email or cnpj or None)
+            continue
+        if not parece_email(email):
+            resultado.rejeitar(numero, 'email_invalido', email)
+            continue
+        if len(cnpj) != 14:
+            resultado.rejeitar(numero, 'cnpj_invalido', cnpj)
+            continue
+
+        servicos = _servicos_do_registro(registro)
+        if servicos is None:
+            resultado.rejeitar(numero, 'servico_invalido', cnpj)
+            continue
+
+        cidade = ' '.join(_texto(registro, 'cidade').split())[:100] or None
+        coordenadas = _coordenadas(registro)
+        if coordenadas is None or (coordenadas[0] is not None and not cidade):
+            resultado.rejeitar(numero, 'coordenada_invalida', cnpj)
+            continue
+
+        candidatos.append({
+            'linha': numero,
+            'nome': nome[:100],
+            'email': email,
+            'cnpj': cnpj,
+            'telefone': apenas_numeros(_texto(registro, 'telefone')) or None,
+            'especialidade': _texto(registro, 'especialidade') or None,
+            'senha': _texto(registro, 'senha') or None,
+            'cidade': cidade,
+            'estado': _texto(registro, 'estado').upper()[:2] or None,
+            'latitude': coordenadas[0],
+            'longitude': coordenadas[1],
+            'servicos': servicos,
+        })
+
+    # dígitos verificadores: todos de uma vez (NumPy, se houver)
+    if validar_digitos and candidatos:
+        validos = validar_cnpjs([c['cnpj'] for c in candidatos])
+        aprovados = []
+        for candidato, ok in zip(candidatos, validos):
+            if ok:
+                aprovados.append(candidato)
+            else:
+                resultado.rejeitar(candidato['linha'], 'cnpj_invalido', candidato['cnpj'])
+        candidatos = aprovados
+
+    # duplicidade dentro do próprio arquivo
+    unicos = []
+    for candidato in candidatos:
+        if candidato['cnpj'] in vistos_cnpj:
+            resultado.rejeitar(candidato['linha'], 'cnpj_repetido_no_arquivo', candidato['cnpj'])
+        elif candidato['email'] in vistos_email:
+            resultado.rejeitar(candidato['linha'], 'email_repetido_no_arquivo', candidato['email'])
+        else:
+            vistos_cnpj.add(candidato['cnpj'])
+            vistos_email.add(candidato['email'])
+            unicos.append(candidato)
+
+    return unicos
+
+
+# ======================================================
+# DUPLICIDADE NO BANCO (uma consulta por bloco)
+# ======================================================
+def _existentes_no_banco(cnpjs, emails):
+    """
+    Uma única consulta (UNION ALL) que devolve os CNPJs e e-mails
+    do bloco que já existem (CNPJs de qualquer conta ficam em "documento").
+    """
+    consulta = union_all(
+        select(literal('cnpj').label('campo'), Documento.numero.label('valor'))
+        .where(Documento.numero.in_(cnpjs)),
+        select(literal('email'), func.lower(Usuario.email))
+        .where(func.lower(Usuario.email).in_(emails)),
+    )
+
+    cnpjs_existentes, emails_existentes = set(), set()
+    for campo, valor in bancodedados.session.execute(consulta):
+        if campo == 'cnpj':
+            cnpjs_existentes.add(valor)
+        else:
+            emails_existentes.add(valor)
+    return cnpjs_existentes, emails_existentes
+
+
+# ======================================================
+# INSERÇÃO
+# ======================================================
+def _inserir_bloco(candidatos, ativar):
+    """
+    Calcula as senhas em paralelo e insere prestadores e serviços
+    com bulk_insert_mappings. Retorna (qtd_servicos, emails_a_enviar).
+    """
+    senhas = [c['senha'] or gerar_senha_temp() for c in candidatos]
+    hashes = gerar_senhas_hash_em_paralelo(senhas)
+
+    prestadores = [
+        {
+            'nome': c['nome'],
+            'email': c['email'],
+            'telefone': c['telefone'],
+            'cnpj': c['cnpj'],
+            'especialidade': c['especialidade'],
+            'senha_hash': senha_hash,
+            'senha_temp': not c['senha'],
+            'tipo': 'prestador',
+            'ativo': ativar,
+        }
+        for c, senha_hash in zip(candidatos, hashes)
+    ]
+
+    # return_defaults preenche 'id' em cada dict (necessário para os serviços)
+    bancodedados.session.bulk_insert_mappings(
+        PrestadorServico, prestadores, return_defaults=True
+    )
+
+    # bulk_insert_mappings não passa pelos @validates: documento à parte
+    bancodedados.session.bulk_insert_mappings(Documento, [
+        {'numero': p['cnpj'], 'tipo': 'cnpj', 'usuario_id': p['id']}
+        for p in prestadores
+    ])
+
+    # idem para a localização: colunas normalizadas e cópias calculadas aqui
+    # (o R*Tree das coordenadas é mantido pelos triggers do SQLite)
+    localizacoes = [
+        {
+            'prestador_id': prestador['id'],
+            'cidade': candidato['cidade'],
+            'estado': candidato['estado'],
+            'cidade_norm': normalizar_texto(candidato['cidade']),
+            'especialidade_norm': normalizar_texto(candidato['especialidade']),
+            'nome': prestador['nome'],
+            'latitude': candidato['latitude'],
+            'longitude': candidato['longitude'],
+        }
+        for candidato, prestador in zip(candidatos, prestadores)
+        if candidato['cidade']
+    ]
+    if localizacoes:
+        bancodedados.session.bulk_insert_mappings(Localizacao, localizacoes)
+
+    servicos = [
+        {**servico, 'prestador_id': prestador['id']}
+        for candidato, prestador in zip(candidatos, prestadores)
+        for servico in candidato['servicos']
+    ]
+    if servicos:
+        bancodedados.session.bulk_insert_mappings(ServicoPrestado, servicos)
+
+    emails = [
+        (c['email'], *email_boas_vindas_importacao(c['nome'], senha))
+        for c, senha in zip(candidatos, senhas)
+        if not c['senha']
+    ]
+    return len(servicos), emails
+
+
+def importar_prestadores(
+    arquivo_texto,
+    formato='csv',
+    ativar=False,
+    tamanho_bloco=TAMANHO_BLOCO_IMPORTACAO,
+    ao_progresso=None
+):
+    """
+    Importa prestadores (e seus serviços) a partir de um arquivo de texto.
+
+    - arquivo_texto: arquivo aberto em modo texto (ou qualquer iterável de linhas)
+    - formato: 'csv' | 'jsonl'
+    - ativar: cria os prestadores já aprovados (padrão: aguardando aprovação)
+    - ao_progresso: callback(resultado) chamado ao fim de cada bloco
+
+    Cada bloco é uma transação: se falhar, só ele é desfeito
+    e suas linhas entram como rejeitadas ('erro_banco').
+    """
+    if formato not in FORMATOS_IMPORTACAO:
+        raise ValueError(f"Formato inválido: {formato}")
+
+    resultado = ResultadoImportacao()
+    vistos_cnpj, vistos_email = set(), set()
+    validar_digitos = current_app.config.get('VALIDAR_PRESTADOR', True)
+
+    registros = ler_registros(arquivo_texto, formato)
+    for bloco in _em_blocos(registros, tamanho_bloco):
+        resultado.blocos += 1
+
+        candidatos = _preparar_bloco(
+            bloco, resultado, vistos_cnpj, vistos_email, validar_digitos
+        )
+
+        if candidatos:
+            cnpjs_existentes, emails_existentes = _existentes_no_banco(
+                [c['cnpj'] for c in candidatos],
+                [c['email'] for c in candidatos]
+            )
+
+            novos = []
+            for candidato in candidatos:
+                if candidato['cnpj'] in cnpjs_existentes:
+                    resultado.rejeitar(candidato['linha'], 'cnpj_ja_cadastrado', candidato['cnpj'])
+                elif candidato['email'] in emails_existentes:
+                    resultado.rejeitar(candidato['linha'], 'email_ja_cadastrado', candidato['email'])
+                else:
+                    novos.append(candidato)
+
+            if novos:
+                try:
+                    qtd_servicos, emails = _inserir_bloco(novos, ativar)
+                    bancodedados.session.commit()
+                except Exception:
+                    bancodedados.session.rollback()
+                    current_app.logger.exception(
+                        "Erro ao inserir bloco %s da importação", resultado.blocos
+                    )
+                    for candidato in novos:
+                        resultado.rejeitar(candidato['linha'], 'erro_banco', candidato['cnpj'])
+                else:
+                    resultado.importados += len(novos)
+                    resultado.servicos += qtd_servicos
+                    if emails:
+                        enfileirar_emails(emails)
+
+        if ao_progresso:
+            ao_progresso(resultado)
+
+    # bulk_insert_mappings não dispara os eventos do ORM
+    if resultado.importados:
+        limpar_cache_catalogo()
+        limpar_cache_cidades()
+
+    return resultado
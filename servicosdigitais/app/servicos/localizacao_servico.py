@@ -0,0 +1,261 @@
+# ========================
+# Serviços - Cidades e busca de prestadores por região
+# ========================
+
+''' O que tem neste arquivo:
+- listar_cidades: cidades com prestador (uma grafia por cidade_norm),
+  em ordem alfabética, guardadas no cache da aplicação (home)
+- limpar_cache_cidades: chamado quando localizações mudam
+- definir_localizacao: cria / troca / remove a cidade do prestador
+  (cadastro e edição de perfil; sem commit)
+- buscar_prestadores: /prestadores?cidade=&especialidade=
+    - com cidade: busca no índice ix_localizacao_busca
+      (cidade_norm, especialidade_norm, nome); com as duas colunas já sai
+      em ordem de nome, só com a cidade o banco ainda ordena o resultado
+    - sem cidade: filtro por especialidade em PrestadorServico
+- buscar_proximos: /prestadores?lat=&lon=&raio=
+    - caixa delimitadora do raio no índice espacial
+      (R*Tree no SQLite; índice (latitude, longitude) nos demais bancos)
+    - refinamento pela distância de haversine, em ordem de distância
+- Eventos do ORM em Localizacao limpam o cache sozinhos,
+  depois do commit (utilidades/banco.limpar_apos_commit)
+'''
+
+import heapq
+import math
+from collections import namedtuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import column, event, func, inspect, select, table
+
+from servicosdigitais.app.extensoes import bancodedados, cache
+from servicosdigitais.app.models import Localizacao, PrestadorServico
+from servicosdigitais.app.models.localizacao import TABELA_RTREE
+from servicosdigitais.app.utilidades.banco import registrar_limpeza, limpar_apos_commit
+from servicosdigitais.app.utilidades.normalizadores import normalizar_texto
+
+CHAVE_CIDADES = 'localizacao:cidades'
+
+
+# ======================================================
+# CIDADES (home)
+# ======================================================
+def _consultar_cidades():
+    consulta = (
+        select(func.min(Localizacao.cidade).label('cidade'))
+        .group_by(Localizacao.cidade_norm)
+        .order_by(Localizacao.cidade_norm)
+    )
+    return [linha.cidade for linha in bancodedados.session.execute(consulta)]
+
+
+def listar_cidades():
+    """Cidades com prestador cadastrado (tupla, vinda do cache)."""
+    return cache.obter_ou_calcular(
+        CHAVE_CIDADES,
+        lambda: tuple(_consultar_cidades())
+    )
+
+
+def limpar_cache_cidades():
+    cache.delete(CHAVE_CIDADES)
+
+
+# ======================================================
+# CIDADE DO PRESTADOR (cadastro / edição de perfil)
+# ======================================================
+def definir_localizacao(prestador, cidade, estado=None):
+    """
+    Cria, troca ou remove (cidade vazia) a localização do prestador.
+    Não faz commit: entra no commit de quem chamou.
+    Retorna True se algo mudou.
+    """
+    cidade = ' '.join((cidade or '').split())
+    estado = (estado or '').strip().upper() or None
+    atual = prestador.localizacao
+
+    if not cidade:
+        if atual is None:
+            return False
+        prestador.localizacao = None  # delete-orphan apaga a linha
+        return True
+
+    if atual is None:
+        prestador.localizacao = Localizacao(cidade=cidade, estado=estado)
+        return True
+
+    if atual.cidade == cidade and atual.estado == estado:
+        return False
+    atual.cidade = cidade
+    atual.estado = estado
+    return True
+
+
+# ======================================================
+# BUSCA DE PRESTADORES
+# ======================================================
+def buscar_prestadores(cidade=None, especialidade=None):
+    """
+    Prestadores (id, nome) em ordem de nome.
+    - cidade / especialidade: texto como o usuário digitou
+      (acento e caixa não importam quando há cidade)
+    """
+    cidade_norm = normalizar_texto(cidade)
+
+    if cidade_norm:
+        consulta = (
+            select(Localizacao.prestador_id.label('id'), Localizacao.nome)
+            .where(Localizacao.cidade_norm == cidade_norm)
+            .order_by(Localizacao.nome)
+        )
+        if especialidade:
+            consulta = consulta.where(
+                Localizacao.especialidade_norm == normalizar_texto(especialidade)
+            )
+        return bancodedados.session.execute(consulta).all()
+
+    consulta = select(PrestadorServico.id, PrestadorServico.nome).order_by(PrestadorServico.nome)
+    if especialidade:
+        consulta = consulta.where(PrestadorServico.especialidade == especialidade)
+    return bancodedados.session.execute(consulta).all()
+
+
+# ======================================================
+# PROXIMIDADE (lat / lon / raio)
+# ======================================================
+RAIO_TERRA_KM = 6371.0088
+KM_POR_GRAU = math.pi * RAIO_TERRA_KM / 180  # ~111,2 km por grau de latitude
+
+Proximo = namedtuple('Proximo', 'id nome distancia_km')
+
+_rtree = table(
+    TABELA_RTREE,
+    column('id'), column('min_lat'), column('max_lat'), column('min_lon'), column('max_lon'),
+)
+
+
+def distancia_km(lat1, lon1, lat2, lon2):
+    """Distância de haversine (km) entre dois pontos em graus."""
+    fi1, fi2 = math.radians(lat1), math.radians(lat2)
+    d_fi = fi2 - fi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_fi / 2) ** 2 + math.cos(fi1) * math.cos(fi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * RAIO_TERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _caixa(lat, lon, raio_km):
+    """
+    Caixa (lat_min, lat_max, lon_min, lon_max) que contém o círculo do raio.
+    Perto dos polos a longitude abre para o mundo todo;
+    não trata a virada do antimeridiano (±180°).
+    """
+    d_lat = raio_km / KM_POR_GRAU
+    cos_lat = math.cos(math.radians(lat))
+    d_lon = 180.0 if cos_lat < 1e-6 else min(180.0, d_lat / cos_lat)
+    return lat - d_lat, lat + d_lat, lon - d_lon, lon + d_lon
+
+
+def _usa_rtree():
+    """O R*Tree só existe no SQLite (criado pela migração / create_all)."""
+    return bancodedados.session.get_bind(Localizacao).dialect.name == 'sqlite'
+
+
+def _candidatos_na_caixa(lat_min, lat_max, lon_min, lon_max, especialidade_norm):
+    """
+    Localizações dentro da caixa: (prestador_id, latitude, longitude).
+    Colunas da tabela (Core): centenas de linhas por busca, sem o
+    custo de carregamento do ORM por linha.
+    """
+    t = Localizacao.__table__
+    consulta = select(t.c.prestador_id, t.c.latitude, t.c.longitude)
+
+    if _usa_rtree():
+        consulta = consulta.join(_rtree, _rtree.c.id == t.c.id).where(
+            _rtree.c.min_lat <= lat_max, _rtree.c.max_lat >= lat_min,
+            _rtree.c.min_lon <= lon_max, _rtree.c.max_lon >= lon_min,
+        )
+    else:
+        consulta = consulta.where(
+            t.c.latitude.between(lat_min, lat_max),
+            t.c.longitude.between(lon_min, lon_max),
+        )
+
+    if especialidade_norm:
+        consulta = consulta.where(t.c.especialidade_norm == especialidade_norm)
+    return bancodedados.session.execute(consulta, bind_arguments={'mapper': Localizacao})
+
+
+def _nomes(prestador_ids):
+    consulta = (
+        select(Localizacao.prestador_id, Localizacao.nome)
+        .where(Localizacao.prestador_id.in_(prestador_ids))
+    )
+    return dict(bancodedados.session.execute(consulta).all())
+
+
+def buscar_proximos(lat, lon, raio_km, especialidade=None, limite=None):
+    """
+    Prestadores a até raio_km de (lat, lon), do mais perto ao mais longe.
+    Retorna lista de Proximo(id, nome, distancia_km).
+    - limite: máximo de resultados (padrão: PROXIMIDADE_LIMITE)
+    """
+    if limite is None:
+        limite = current_app.config.get('PROXIMIDADE_LIMITE', 50)
+
+    linhas = _candidatos_na_caixa(*_caixa(lat, lon, raio_km), normalizar_texto(especialidade))
+
+    # a caixa tem cantos fora do círculo: a distância real decide.
+    # Compara o termo "a" do haversine (cresce junto com a distância),
+    # sem asin/sqrt por linha; a distância em km sai só para os escolhidos.
+    a_maximo = math.sin(min(raio_km / RAIO_TERRA_KM, math.pi) / 2) ** 2
+    fi0, lambda0 = math.radians(lat), math.radians(lon)
+    cos_fi0 = math.cos(fi0)
+    sin, cos, radians = math.sin, math.cos, math.radians
+
+    dentro = []
+    for prestador_id, p_lat, p_lon in linhas:
+        fi = radians(p_lat)
+        s_fi = sin((fi - fi0) / 2)
+        s_lambda = sin((radians(p_lon) - lambda0) / 2)
+        a = s_fi * s_fi + cos_fi0 * cos(fi) * s_lambda * s_lambda
+        if a <= a_maximo:
+            dentro.append((a, prestador_id))
+
+    escolhidos = heapq.nsmallest(limite, dentro)
+    if not escolhidos:
+        return []
+
+    nomes = _nomes([prestador_id for _a, prestador_id in escolhidos])
+    return [
+        Proximo(prestador_id, nomes.get(prestador_id, ''),
+                2 * RAIO_TERRA_KM * math.asin(min(1.0, math.sqrt(a))))
+        for a, prestador_id in escolhidos
+    ]
+
+
+# ======================================================
+# INVALIDAÇÃO AUTOMÁTICA (ORM)
+# ======================================================
+# Limpa só depois do commit: no flush, uma leitura concorrente da home
+# guardaria de novo a lista antiga no cache.
+LIMPEZA_CIDADES = 'localizacao_cidades'
+
+
+def _cidades_commitadas(_chaves):
+    if has_app_context():
+        limpar_cache_cidades()
+
+
+registrar_limpeza(LIMPEZA_CIDADES, _cidades_commitadas)
+
+
+@event.listens_for(Localizacao, 'after_insert')
+@event.listens_for(Localizacao, 'after_delete')
+def _localizacao_mudou(mapper, conexao, alvo):
+    limpar_apos_commit(alvo, LIMPEZA_CIDADES)
+
+
+@event.listens_for(Localizacao, 'after_update')
+def _localizacao_atualizada(mapper, conexao, alvo):
+    if inspect(alvo).attrs.cidade.history.has_changes():
+        limpar_apos_commit(alvo, LIMPEZA_CIDADES)
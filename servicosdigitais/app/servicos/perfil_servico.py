@@ -0,0 +1,220 @@
+# ========================
+# Serviços - Perfil (cartão público e atualização)
+# ========================
+
+''' O que tem neste arquivo:
+- obter_cartao_publico: dados do perfil público já prontos para exibir
+  (nome, documento, contato, foto, especialidade), em duas versões:
+    - 'claro': dono do perfil / admin
+    - 'oculto': visitantes quando ocultar_dados está ligado
+- As duas versões saem de UMA consulta e ficam no cache da aplicação
+- limpar_cartao_publico: chamado quando o dono edita o perfil
+- Eventos do ORM (Usuario e subclasses, Documento) limpam o cache sozinhos,
+  depois do commit (utilidades/banco.limpar_apos_commit)
+- calcular_mudancas / atualizar_perfil: grava só as colunas alteradas,
+  com trava otimista pela coluna usuario.versao
+'''
+
+from flask import current_app
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm.exc import StaleDataError
+
+from servicosdigitais.app.extensoes import bancodedados, cache
+from servicosdigitais.app.models import Usuario, Documento, PrestadorServico
+from servicosdigitais.app.utilidades.banco import registrar_limpeza, limpar_apos_commit
+from servicosdigitais.app.utilidades.fotos import url_foto
+from servicosdigitais.app.utilidades.normalizadores import formatar_documento
+
+PREFIXO_CARTAO = 'perfil:cartao:'
+
+PROTEGIDO = 'Informação protegida'
+
+# colunas de Usuario que aparecem no cartão (mudou uma → cache limpo)
+CAMPOS_CARTAO = (
+    'nome', 'sobrenome', 'email', 'telefone',
+    'foto_perfil', 'ocultar_dados', 'tipo', 'ativo'
+)
+
+
+def _chave(user_id):
+    return f'{PREFIXO_CARTAO}{user_id}'
+
+
+# ======================================================
+# PROJEÇÃO
+# ======================================================
+def _consultar_cartoes(user_id):
+    """Uma consulta (conta + documento + especialidade) → as duas versões."""
+    prestador = PrestadorServico.__table__
+    consulta = (
+        select(
+            Usuario.id, Usuario.nome, Usuario.sobrenome, Usuario.email,
+            Usuario.telefone, Usuario.foto_perfil, Usuario.ocultar_dados,
+            Documento.tipo.label('documento_tipo'),
+            Documento.numero.label('documento_numero'),
+            prestador.c.especialidade,
+        )
+        .outerjoin(Documento, Documento.usuario_id == Usuario.id)
+        .outerjoin(prestador, prestador.c.id == Usuario.id)
+        .where(Usuario.id == user_id)
+    )
+    linha = bancodedados.session.execute(consulta).first()
+    if linha is None:
+        return None
+
+    nome = ' '.join(p for p in (linha.nome, linha.sobrenome) if p)
+
+    if linha.documento_numero:
+        documento_label = linha.documento_tipo.upper()
+        documento = formatar_documento(linha.documento_numero)
+    else:
+        documento_label = 'Documento'
+        documento = None
+
+    comum = {
+        'id': linha.id,
+        'nome': nome,
+        'foto_url': url_foto(linha.foto_perfil),
+        'especialidade': linha.especialidade,
+        'ocultar_dados': bool(linha.ocultar_dados),
+        'documento_label': documento_label,
+    }
+
+    claro = {
+        **comum,
+        'documento': documento or 'Documento não disponível',
+        'email': linha.email,
+        'telefone': linha.telefone or 'Nenhum telefone cadastrado',
+    }
+
+    # sem ocultar_dados, visitante vê o mesmo que o dono
+    if not linha.ocultar_dados:
+        return {'claro': claro, 'oculto': claro}
+
+    oculto = {
+        **comum,
+        'documento': PROTEGIDO if documento else 'Documento não disponível',
+        'email': PROTEGIDO if linha.email else None,
+        'telefone': PROTEGIDO,
+    }
+    return {'claro': claro, 'oculto': oculto}
+
+
+def obter_cartao_publico(user_id, ver_tudo=False):
+    """
+    Cartão do perfil público (dict) ou None se o usuário não existe.
+    - ver_tudo: True para o dono do perfil e admins (versão 'clara')
+    """
+    cartoes = cache.obter_ou_calcular(
+        _chave(user_id),
+        lambda: _consultar_cartoes(user_id),
+        current_app.config.get('PERFIL_CARTAO_TEMPO')
+    )
+    if cartoes is None:
+        return None
+    return cartoes['claro' if ver_tudo else 'oculto']
+
+
+def limpar_cartao_publico(user_id):
+    cache.delete(_chave(user_id))
+
+
+# ======================================================
+# INVALIDAÇÃO AUTOMÁTICA (ORM)
+# ======================================================
+LIMPEZA_CARTAO = 'perfil_cartao'
+
+
+def _limpar_cartoes(user_ids):
+    for user_id in user_ids:
+        limpar_cartao_publico(user_id)
+
+
+registrar_limpeza(LIMPEZA_CARTAO, _limpar_cartoes)
+
+
+@event.listens_for(Usuario, 'after_delete', propagate=True)
+def _usuario_removido(mapper, conexao, alvo):
+    limpar_apos_commit(alvo, LIMPEZA_CARTAO, alvo.id)
+
+
+@event.listens_for(Usuario, 'after_update', propagate=True)
+def _usuario_atualizado(mapper, conexao, alvo):
+    estado = inspect(alvo)
+    campos = CAMPOS_CARTAO + (('especialidade',) if isinstance(alvo, PrestadorServico) else ())
+    if any(estado.attrs[campo].history.has_changes() for campo in campos):
+        limpar_apos_commit(alvo, LIMPEZA_CARTAO, alvo.id)
+
+
+@event.listens_for(Documento, 'after_insert')
+@event.listens_for(Documento, 'after_update')
+@event.listens_for(Documento, 'after_delete')
+def _documento_mudou(mapper, conexao, alvo):
+    limpar_apos_commit(alvo, LIMPEZA_CARTAO, alvo.usuario_id)
+
+
+# ======================================================
+# ATUALIZAÇÃO (só o que mudou + versão)
+# ======================================================
+# campo do formulário → coluna do modelo
+CAMPOS_EDITAVEIS = {
+    'nome': 'nome',
+    'nome_empresa': 'nome',
+    'sobrenome': 'sobrenome',
+    'razao_social': 'razao_social',
+    'email': 'email',
+    'telefone': 'telefone',
+}
+
+
+class ConflitoDeVersao(Exception):
+    """O perfil foi alterado por outra requisição depois de ser lido."""
+
+
+def _limpar_texto(valor):
+    valor = (valor or '').strip()
+    return valor or None
+
+
+def calcular_mudancas(usuario, dados):
+    """
+    Compara os dados recebidos (campo do formulário → valor) com o usuário.
+    Retorna {coluna: valor_novo} só com o que mudou.
+    Campos sem coluna no tipo de conta são ignorados.
+    """
+    mudancas = {}
+    for campo, coluna in CAMPOS_EDITAVEIS.items():
+        if campo not in dados or not hasattr(usuario, coluna):
+            continue
+        novo = _limpar_texto(dados[campo])
+        if coluna == 'email' and novo:
+            novo = novo.lower()
+        if novo != getattr(usuario, coluna):
+            mudancas[coluna] = novo
+    return mudancas
+
+
+def atualizar_perfil(usuario, mudancas, versao_lida=None):
+    """
+    Grava as mudanças num UPDATE só das colunas alteradas
+    (mais "versao = versao + 1" e "WHERE versao = <atual>").
+    - versao_lida: versão que o formulário mostrou; se já mudou
+      (outra aba / admin gravou antes), nada é gravado
+    Levanta ConflitoDeVersao nos dois casos de concorrência.
+    Retorna True se gravou, False se não havia mudanças.
+    """
+    if not mudancas:
+        return False
+
+    if versao_lida is not None and versao_lida != usuario.versao:
+        raise ConflitoDeVersao()
+
+    for coluna, valor in mudancas.items():
+        setattr(usuario, coluna, valor)
+
+    try:
+        bancodedados.session.commit()
+    except StaleDataError:
+        bancodedados.session.rollback()
+        raise ConflitoDeVersao()
+    return True
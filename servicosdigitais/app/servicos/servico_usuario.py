@@ -0,0 +1,212 @@
+# ========================
+# Serviços - Usuários (operações administrativas em lote)
+# ========================
+
+''' O que tem neste arquivo:
+- Seleção de usuários por lista de IDs ou por filtro (tipo / ativo)
+- Ações em lote: ativar, desativar, aprovar prestadores, resetar senha
+- Cada ação faz UPDATE ... WHERE id IN (...) numa única transação
+- Resultado por ID (ok, nao_encontrado, ignorado_filtro, ignorado_*)
+- Limpa o cache de acesso (principal) dos usuários ativados/desativados
+'''
+
+from flask import current_app
+from sqlalchemy import and_, func, select, true, update
+
+from servicosdigitais.app.extensoes import bancodedados
+from servicosdigitais.app.models import Usuario
+from servicosdigitais.app.utilidades.seguranca import (
+    gerar_senha_temp, gerar_senhas_hash_em_paralelo
+)
+from servicosdigitais.app.utilidades.comunicacao.email_padrao import email_reset_senha
+from servicosdigitais.app.utilidades.comunicacao.servicos_email import enfileirar_emails
+from servicosdigitais.app.utilidades.autorizacao import limpar_principal
+
+
+ACOES_LOTE = ('ativar', 'desativar', 'aprovar_prestadores', 'resetar_senha')
+
+# Limite de parâmetros por cláusula IN (SQLite antigo aceita 999)
+TAMANHO_BLOCO_IN = 500
+
+
+def _em_blocos(itens, tamanho=TAMANHO_BLOCO_IN):
+    for i in range(0, len(itens), tamanho):
+        yield itens[i:i + tamanho]
+
+
+def _normalizar_ids(ids):
+    """Converte para int, descarta lixo e repetições (mantém a ordem)."""
+    vistos = {}
+    for valor in ids or []:
+        try:
+            vistos.setdefault(int(valor), None)
+        except (TypeError, ValueError):
+            continue
+    return list(vistos)
+
+
+def _carregar_alvos(ids=None, filtro=None):
+    """
+    Busca só as colunas necessárias dos usuários alvo.
+    - ids: lista de IDs (consulta em blocos)
+    - filtro: dict opcional com 'tipo' e/ou 'ativo'
+    Retorna dict {id: Row}; Row.no_filtro diz se o usuário passa no filtro
+    (com IDs, quem existe mas não passa volta também, para o resultado
+    separar 'ignorado_filtro' de 'nao_encontrado').
+    """
+    condicoes = []
+    filtro = filtro or {}
+
+    if filtro.get('tipo'):
+        condicoes.append(
+            func.lower(func.trim(Usuario.tipo)) == str(filtro['tipo']).strip().lower()
+        )
+    if filtro.get('ativo') is not None:
+        condicoes.append(Usuario.ativo == bool(filtro['ativo']))
+
+    no_filtro = and_(*condicoes) if condicoes else true()
+    colunas = (
+        Usuario.id, Usuario.tipo, Usuario.is_admin,
+        Usuario.ativo, Usuario.nome, Usuario.email, Usuario.versao,
+        no_filtro.label('no_filtro')
+    )
+
+    alvos = {}
+    if ids:
+        for bloco in _em_blocos(ids):
+            consulta = select(*colunas).where(Usuario.id.in_(bloco))
+            for linha in bancodedados.session.execute(consulta):
+                alvos[linha.id] = linha
+    elif condicoes:
+        consulta = select(*colunas).where(*condicoes)
+        for linha in bancodedados.session.execute(consulta):
+            alvos[linha.id] = linha
+
+    return alvos
+
+
+def _classificar(acao, ids, alvos, admin_id):
+    """
+    Aplica as regras de segurança das rotas individuais
+    e devolve (resultado_por_id, ids_aptos).
+    """
+    resultado = {}
+    aptos = []
+
+    for usuario_id in ids:
+        linha = alvos.get(usuario_id)
+
+        if linha is None:
+            resultado[usuario_id] = 'nao_encontrado'
+        elif not linha.no_filtro:
+            # existe, mas o filtro (tipo / ativo) deixou de fora
+            resultado[usuario_id] = 'ignorado_filtro'
+        elif usuario_id == admin_id:
+            # Mesma regra de ativacao_usuario / resetar_senha_usuario
+            resultado[usuario_id] = 'ignorado_propria_conta'
+        elif acao == 'aprovar_prestadores' and (linha.tipo or '').strip().lower() != 'prestador':
+            resultado[usuario_id] = 'ignorado_nao_prestador'
+        else:
+            resultado[usuario_id] = 'ok'
+            aptos.append(usuario_id)
+
+    return resultado, aptos
+
+
+def _atualizar_ativo(ids, valor):
+    for bloco in _em_blocos(ids):
+        bancodedados.session.execute(
+            update(Usuario)
+            .where(Usuario.id.in_(bloco))
+            .values(ativo=valor, versao=Usuario.versao + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _resetar_senhas(ids, alvos):
+    """
+    Gera senhas temporárias, calcula os hashes em paralelo e grava
+    tudo com um UPDATE em lote por chave primária.
+    Retorna a lista de e-mails a enviar (após o commit).
+    """
+    senhas = [gerar_senha_temp() for _ in ids]
+    hashes = gerar_senhas_hash_em_paralelo(senhas)
+
+    # 'versao' = versão lida: o UPDATE confere e soma 1 (trava otimista)
+    bancodedados.session.execute(
+        update(Usuario),
+        [
+            {
+                'id': usuario_id, 'versao': alvos[usuario_id].versao,
+                'senha_hash': senha_hash, 'senha_temp': True
+            }
+            for usuario_id, senha_hash in zip(ids, hashes)
+        ]
+    )
+
+    emails = []
+    for usuario_id, senha in zip(ids, senhas):
+        linha = alvos[usuario_id]
+        if linha.email:
+            assunto, corpo = email_reset_senha(linha.nome, senha)
+            emails.append((linha.email, assunto, corpo))
+    return emails
+
+
+def executar_acao_em_lote(acao, ids=None, filtro=None, admin_id=None):
+    """
+    Executa uma ação administrativa sobre vários usuários.
+
+    - acao: uma de ACOES_LOTE
+    - ids: lista de IDs; se vazia, usa o filtro
+    - filtro: dict com 'tipo' e/ou 'ativo' (ex.: prestadores pendentes)
+    - admin_id: ID do admin logado (nunca é afetado)
+
+    Retorna dict {id: status}. Em caso de erro no banco
+    a transação é desfeita e todos os aptos recebem 'erro'.
+    """
+    if acao not in ACOES_LOTE:
+        raise ValueError(f"Ação inválida: {acao}")
+
+    ids = _normalizar_ids(ids)
+
+    # aprovar = ativar prestadores pendentes; sem IDs, o filtro padrão é esse
+    if acao == 'aprovar_prestadores' and not ids:
+        filtro = {'tipo': 'prestador', 'ativo': False, **(filtro or {})}
+
+    alvos = _carregar_alvos(ids=ids, filtro=filtro)
+    if not ids:
+        ids = sorted(alvos)
+
+    resultado, aptos = _classificar(acao, ids, alvos, admin_id)
+    if not aptos:
+        return resultado
+
+    emails = []
+    try:
+        if acao in ('ativar', 'aprovar_prestadores'):
+            _atualizar_ativo(aptos, True)
+        elif acao == 'desativar':
+            _atualizar_ativo(aptos, False)
+        elif acao == 'resetar_senha':
+            emails = _resetar_senhas(aptos, alvos)
+
+        bancodedados.session.commit()
+    except Exception:
+        bancodedados.session.rollback()
+        current_app.logger.exception("Erro na ação em lote '%s'", acao)
+        for usuario_id in aptos:
+            resultado[usuario_id] = 'erro'
+        return resultado
+
+    # UPDATE em lote não dispara os eventos do ORM: limpa o principal
+    # usado na checagem de acesso (ativo mudou)
+    if acao != 'resetar_senha':
+        for usuario_id in aptos:
+            limpar_principal(usuario_id)
+
+    # E-mails só depois do commit, todos de uma vez
+    if emails:
+        enfileirar_emails(emails)
+
+    return resultado
@@ -0,0 +1,82 @@
+# ========================
+# Serviços - Upload de fotos (fora da requisição)
+# ========================
+
+''' O que tem neste arquivo:
+- ler_foto: lê os bytes enviados e faz a checagem rápida (validar_imagem)
+  ainda na requisição, para o erro chegar ao usuário
+- agendar_foto_perfil: deixa o processamento (Pillow: redimensionar,
+  tirar metadados, WEBP) para uma tarefa de segundo plano
+- A tarefa grava só foto_perfil (UPDATE com trava de versão)
+  e apaga o arquivo antigo depois do commit
+'''
+
+from io import BytesIO
+
+from sqlalchemy.orm.exc import StaleDataError
+from werkzeug.datastructures import FileStorage
+
+from flask import current_app
+
+from servicosdigitais.app.extensoes import bancodedados
+from servicosdigitais.app.models import Usuario
+from servicosdigitais.app.utilidades.tarefas import executar_em_segundo_plano
+from servicosdigitais.app.utilidades.upload_imagem import (
+    salvar_imagem, apagar_imagem_arquivo, validar_imagem
+)
+
+# tentativas se a conta for alterada enquanto a foto é processada
+TENTATIVAS_FOTO = 3
+
+
+def _trocar_foto(usuario_id, dados, nome_arquivo, prefixo):
+    """Tarefa de fundo: processa a imagem e troca a foto do usuário."""
+    arquivo = FileStorage(stream=BytesIO(dados), filename=nome_arquivo)
+    nome_salvo, _thumb = salvar_imagem(
+        arquivo,
+        folder='perfil',
+        prefix=f"{prefixo}{usuario_id}",
+        gerar_thumb=False
+    )
+
+    for _ in range(TENTATIVAS_FOTO):
+        usuario = bancodedados.session.get(Usuario, usuario_id)
+        if usuario is None:
+            break
+        antiga = usuario.foto_perfil
+        usuario.foto_perfil = nome_salvo
+        try:
+            bancodedados.session.commit()
+        except StaleDataError:
+            # outra gravação no meio: relê a versão e tenta de novo
+            bancodedados.session.rollback()
+            continue
+        apagar_imagem_arquivo(antiga, folder='perfil')
+        return nome_salvo
+
+    bancodedados.session.rollback()
+    apagar_imagem_arquivo(nome_salvo, folder='perfil')
+    current_app.logger.warning("Foto do usuário %s não foi trocada", usuario_id)
+    return None
+
+
+def ler_foto(file_storage):
+    """
+    Lê o upload e confere se é uma imagem aceita.
+    Retorna (dados, nome_arquivo); levanta ValueError (mensagem para o usuário).
+    """
+    dados = file_storage.read()
+    validar_imagem(dados)
+    return dados, file_storage.filename
+
+
+def agendar_foto_perfil(usuario_id, foto, prefixo='user'):
+    """
+    Agenda a troca da foto de perfil.
+    - foto: (dados, nome_arquivo) devolvido por ler_foto
+    Retorna o Future da tarefa.
+    """
+    dados, nome_arquivo = foto
+    return executar_em_segundo_plano(
+        _trocar_foto, usuario_id, dados, nome_arquivo, prefixo
+    )
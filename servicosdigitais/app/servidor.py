@@ -0,0 +1,136 @@
+# ========================
+# Servidor de produção (WSGI)
+# ========================
+
+''' O que tem neste arquivo:
+- criar_app_producao: cria o app uma vez e aquece antes do fork
+    - pré-carrega (compila) todos os templates .html
+    - carrega o catálogo de especialidades no cache
+    - fecha as conexões do pai e registra dispose(close=False) no filho
+- executar: sobe o Gunicorn com preload (workers/threads pela config);
+  sem Gunicorn instalado, usa o servidor do Werkzeug com threads
+
+Uso:
+    python wsgi.py
+    gunicorn --preload wsgi:app   (lê só o app; workers/threads pela linha de comando)
+
+Os workers nascem por fork do processo já aquecido e compartilham
+essa memória (copy-on-write).
+'''
+
+import os
+
+from servicosdigitais.app import criar_app
+from servicosdigitais.app.config import VARIAVEL_AMBIENTE
+from servicosdigitais.app.extensoes import bancodedados
+from servicosdigitais.app.utilidades.templates import precompilar_templates
+
+
+# ======================================================
+# AQUECIMENTO (no processo pai)
+# ======================================================
+def aquecer_templates(app):
+    """Compila os templates (se o criar_app ainda não compilou)."""
+    if 'templates_precompilados' in app.extensions:
+        return app.extensions['templates_precompilados']
+    carregados, _falhas, _segundos = precompilar_templates(app)
+    return carregados
+
+
+def aquecer_catalogo(app):
+    """Carrega o catálogo de especialidades no cache."""
+    from servicosdigitais.app.servicos.catalogo_servico import listar_especialidades
+
+    with app.app_context():
+        try:
+            return len(listar_especialidades())
+        except Exception:
+            app.logger.exception("Falha ao aquecer o catálogo de especialidades")
+            return 0
+        finally:
+            bancodedados.session.remove()
+
+
+# ======================================================
+# FORK: cada worker com o próprio pool de conexões
+# ======================================================
+def preparar_fork(app):
+    """
+    - Pai: fecha as conexões abertas no aquecimento (nada é herdado)
+    - Filho: dispose(close=False) descarta o pool herdado sem fechar
+      os sockets/arquivos do pai
+    """
+    with app.app_context():
+        engines = list(bancodedados.engines.values())
+
+    for engine in engines:
+        engine.dispose()
+
+    def _no_filho():
+        for engine in engines:
+            engine.dispose(close=False)
+
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_no_filho)
+
+
+def criar_app_producao(config=None):
+    """
+    Cria e aquece o app para servir com workers pré-forkados.
+    config: classe ou nome do perfil (padrão: SERVICOS_AMBIENTE ou 'producao').
+    """
+    app = criar_app(config or os.environ.get(VARIAVEL_AMBIENTE) or 'producao')
+
+    templates = aquecer_templates(app)
+    especialidades = aquecer_catalogo(app)
+    preparar_fork(app)
+
+    app.logger.info(
+        "App aquecido: %d template(s), %d especialidade(s) em cache",
+        templates, especialidades
+    )
+    return app
+
+
+# ======================================================
+# EXECUÇÃO
+# ======================================================
+def executar(app=None):
+    """Sobe o servidor com SERVIDOR_BIND / WORKERS / THREADS / TIMEOUT."""
+    app = app or criar_app_producao()
+
+    bind = app.config.get('SERVIDOR_BIND', '0.0.0.0:8000')
+    workers = app.config.get('SERVIDOR_WORKERS', 2)
+    threads = app.config.get('SERVIDOR_THREADS', 4)
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        app.logger.warning("Gunicorn não instalado: usando o servidor do Werkzeug (1 processo).")
+        from werkzeug.serving import run_simple
+        host, porta = bind.rsplit(':', 1)
+        run_simple(host, int(porta), app, threaded=threads > 1)
+        return
+
+    class _ServidorGunicorn(BaseApplication):
+        def __init__(self, aplicacao, opcoes):
+            self.aplicacao = aplicacao
+            self.opcoes = opcoes
+            super().__init__()
+
+        def load_config(self):
+            for chave, valor in self.opcoes.items():
+                self.cfg.set(chave, valor)
+
+        def load(self):
+            # app já criado e aquecido neste processo (preload)
+            return self.aplicacao
+
+    _ServidorGunicorn(app, {
+        'bind': bind,
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'timeout': app.config.get('SERVIDOR_TIMEOUT', 30),
+        'preload_app': True,
+    }).run()
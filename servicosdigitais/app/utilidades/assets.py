@@ -0,0 +1,169 @@
+# ========================
+# Utilidades - arquivos estáticos com hash (cache longo)
+# ========================
+
+''' O que tem neste arquivo:
+- gerar_assets: copia os arquivos de static/ para static/dist/ com o hash
+  do conteúdo no nome (css/main.3f2a9c1b4d5e.css) + versões .gz/.br
+  e grava static/dist/manifesto.json (nome original → nome com hash)
+- configurar_assets: rota /assets/<arquivo> e função url_static nos templates
+- url_static(filename): igual a url_for('static', filename=...), mas usa
+  o nome com hash quando o manifesto existe (ASSETS_USAR_MANIFESTO)
+
+Como o nome muda quando o conteúdo muda, os arquivos com hash podem ser
+guardados pelo navegador por 1 ano (immutable), sem revalidar.
+Comando de deploy: flask gerar-assets
+'''
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+
+from flask import current_app, request, send_file, url_for, abort
+from werkzeug.security import safe_join
+
+PASTA_DIST = 'dist'
+ARQUIVO_MANIFESTO = 'manifesto.json'
+
+# Pastas de static/ que não entram (saída do build e fotos enviadas)
+PASTAS_IGNORADAS = {PASTA_DIST, 'fotos_perfil', 'uploads'}
+
+# Tipos que valem a pena pré-comprimir (imagens já são comprimidas)
+EXTENSOES_COMPRIMIVEIS = {'.css', '.js', '.svg', '.json', '.txt', '.map', '.html', '.ico'}
+
+CACHE_IMUTAVEL = 31536000  # 1 ano
+TAMANHO_HASH = 12
+
+
+# ======================================================
+# BUILD (flask gerar-assets)
+# ======================================================
+def _hash_arquivo(caminho):
+    resumo = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(65536), b''):
+            resumo.update(bloco)
+    return resumo.hexdigest()[:TAMANHO_HASH]
+
+
+def _comprimir(origem, dados):
+    """Grava origem.gz (e origem.br, se o pacote brotli existir)."""
+    with open(origem + '.gz', 'wb') as saida:
+        # mtime=0: mesmo conteúdo → mesmo .gz (build reprodutível)
+        with gzip.GzipFile(fileobj=saida, mode='wb', compresslevel=9, mtime=0) as gz:
+            gz.write(dados)
+
+    try:
+        import brotli
+    except ImportError:
+        return
+    with open(origem + '.br', 'wb') as saida:
+        saida.write(brotli.compress(dados, quality=11))
+
+
+def gerar_assets(pasta_static):
+    """
+    Gera static/dist/ do zero. Retorna o manifesto {original: com_hash}.
+    """
+    pasta_dist = os.path.join(pasta_static, PASTA_DIST)
+    shutil.rmtree(pasta_dist, ignore_errors=True)
+    os.makedirs(pasta_dist)
+
+    manifesto = {}
+    for raiz, pastas, arquivos in os.walk(pasta_static):
+        relativo_raiz = os.path.relpath(raiz, pasta_static)
+        if relativo_raiz == '.':
+            pastas[:] = [p for p in pastas if p not in PASTAS_IGNORADAS]
+
+        for nome in sorted(arquivos):
+            if nome.startswith('.'):
+                continue
+            origem = os.path.join(raiz, nome)
+            relativo = os.path.normpath(os.path.join(relativo_raiz, nome)).replace(os.sep, '/')
+
+            base, ext = os.path.splitext(relativo)
+            com_hash = f"{base}.{_hash_arquivo(origem)}{ext}"
+
+            destino = os.path.join(pasta_dist, com_hash)
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            shutil.copy2(origem, destino)
+
+            if ext.lower() in EXTENSOES_COMPRIMIVEIS:
+                with open(origem, 'rb') as f:
+                    _comprimir(destino, f.read())
+
+            manifesto[relativo] = com_hash
+
+    with open(os.path.join(pasta_dist, ARQUIVO_MANIFESTO), 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, indent=2, sort_keys=True)
+
+    return manifesto
+
+
+def _ler_manifesto(pasta_static):
+    caminho = os.path.join(pasta_static, PASTA_DIST, ARQUIVO_MANIFESTO)
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ======================================================
+# USO NOS TEMPLATES
+# ======================================================
+def url_static(filename):
+    """url_for('static', ...) com o nome com hash, se houver no manifesto."""
+    manifesto = current_app.extensions.get('assets_manifesto') or {}
+    com_hash = manifesto.get(filename)
+    if com_hash:
+        return url_for('servir_asset', filename=com_hash)
+    return url_for('static', filename=filename)
+
+
+# ======================================================
+# ROTA /assets/<arquivo> (só arquivos com hash)
+# ======================================================
+def _escolher_codificacao(caminho):
+    """Retorna (caminho, codificação) conforme o Accept-Encoding do cliente."""
+    aceitas = request.accept_encodings
+    for codificacao, sufixo in (('br', '.br'), ('gzip', '.gz')):
+        if aceitas[codificacao] and os.path.exists(caminho + sufixo):
+            return caminho + sufixo, codificacao
+    return caminho, None
+
+
+def servir_asset(filename):
+    pasta_dist = os.path.join(current_app.static_folder, PASTA_DIST)
+    caminho = safe_join(pasta_dist, filename)
+    if caminho is None or filename == ARQUIVO_MANIFESTO or not os.path.isfile(caminho):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(caminho)[0] or 'application/octet-stream'
+    arquivo, codificacao = _escolher_codificacao(caminho)
+
+    resposta = send_file(arquivo, mimetype=mimetype, max_age=CACHE_IMUTAVEL, conditional=True)
+    resposta.cache_control.public = True
+    resposta.cache_control.immutable = True
+    resposta.vary.add('Accept-Encoding')
+    if codificacao:
+        resposta.headers['Content-Encoding'] = codificacao
+    return resposta
+
+
+def configurar_assets(app):
+    """
+    Registra /assets/<arquivo> e url_static nos templates.
+    O manifesto só é usado se ASSETS_USAR_MANIFESTO (produção).
+    """
+    manifesto = {}
+    if app.config.get('ASSETS_USAR_MANIFESTO'):
+        manifesto = _ler_manifesto(app.static_folder)
+        if not manifesto:
+            app.logger.warning("Manifesto de assets não encontrado: rode 'flask gerar-assets'.")
+
+    app.extensions['assets_manifesto'] = manifesto
+    app.add_url_rule('/assets/<path:filename>', 'servir_asset', servir_asset)
+    app.jinja_env.globals['url_static'] = url_static
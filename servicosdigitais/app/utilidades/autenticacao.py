@@ -33,30 +33,42 @@ def atualiza_atividade():
     session['ultima_atividade'] = datetime.now(timezone.utc).isoformat()
 
 
+def checar_inatividade():
+    """
+    Derruba o usuário se estiver inativo por mais que _TEMPO_INATIVIDADE_MIN.
+    - Expirou: logout_user(), flash e retorna o redirect para 'login'
+    - Ainda válido: atualiza o timestamp e retorna None
+    """
+    ultima = session.get('ultima_atividade')
+    agora = datetime.now(timezone.utc)
+    if ultima:
+        try:
+            ts = datetime.fromisoformat(ultima)
+        except Exception:
+            ts = agora
+    else:
+        ts = agora
+    if (agora - ts) > timedelta(minutes=_TEMPO_INATIVIDADE_MIN):
+        # expira sessão
+        logout_user()
+        session.pop('ultima_atividade', None)
+        flash(f'Logout automático por inatividade ({_TEMPO_INATIVIDADE_MIN} minutos).', 'alert-warning')
+        return redirect(url_for('autenticacao.login'))
+    # se ainda válido, atualiza o timestamp e segue
+    session['ultima_atividade'] = agora.isoformat()
+    return None
+
+
 def verifica_inatividade(func):
     """
-    Decorator: derruba o usuário se estiver inativo por mais que _TEMPO_INATIVIDADE_MIN.
-    Ao derrubar faz logout_user() e redireciona para 'login' com flash.
+    Decorator: mesma regra do checar_inatividade.
+    As rotas do app usam a política central (utilidades/autorizacao.py).
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        ultima = session.get('ultima_atividade')
-        agora = datetime.now(timezone.utc)
-        if ultima:
-            try:
-                ts = datetime.fromisoformat(ultima)
-            except Exception:
-                ts = agora
-        else:
-            ts = agora
-        if (agora - ts) > timedelta(minutes=_TEMPO_INATIVIDADE_MIN):
-            # expira sessão
-            logout_user()
-            session.pop('ultima_atividade', None)
-            flash(f'Logout automático por inatividade ({_TEMPO_INATIVIDADE_MIN} minutos).', 'alert-warning')
-            return redirect(url_for('autenticacao.login'))  # ajuste se sua rota de login tiver outro nome
-        # se ainda válido, atualiza o timestamp e segue
-        session['ultima_atividade'] = agora.isoformat()
+        resposta = checar_inatividade()
+        if resposta is not None:
+            return resposta
         return func(*args, **kwargs)
     return wrapper
 
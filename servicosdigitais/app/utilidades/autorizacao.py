@@ -1,23 +1,242 @@
 # ========================
-# Utilidades - Decorators de Permissões
+# Utilidades - Permissões (política central por rota + decorators)
 # ========================
-from flask_login import  current_user
+
+''' O que tem neste arquivo:
+- POLITICAS: tabela rota/blueprint → Politica (login, admin, tipos bloqueados,
+  inatividade), compilada uma vez na subida do app (configurar_autorizacao)
+- verificar_acesso: UM before_request que aplica a política da rota
+    - rota pública: um dict.get e pronto
+    - rota protegida: usa o "principal" (id, tipo, is_admin, ativo) em cache,
+      sem carregar o objeto Usuario do ORM
+- Decorators antigos (bloquear_tipos, somente_*) para rotas fora da tabela
+'''
+
+from collections import namedtuple
+from functools import wraps
+
+from flask_login import current_user, logout_user
+from flask_login.utils import _create_identifier
 from flask import (
-     flash, redirect, url_for, session
+     flash, redirect, url_for, session, request, current_app
     )
-from functools import wraps
+from sqlalchemy import event, inspect, select
+
+from servicosdigitais.app.extensoes import bancodedados, cache, login_manager
+from servicosdigitais.app.models import Usuario
+from servicosdigitais.app.utilidades.autenticacao import checar_inatividade
+from servicosdigitais.app.utilidades.banco import registrar_limpeza, limpar_apos_commit
+
+
+# ======================================================
+# POLÍTICAS
+# ======================================================
+class Politica:
+    """
+    Regras de acesso de uma rota.
+    - login: exige usuário logado (e conta ativa)
+    - admin: só administradores
+    - tipos_bloqueados: tipos de conta barrados (admin sempre entra)
+    - inatividade: derruba a sessão parada há muito tempo
+    """
+    __slots__ = ('login', 'admin', 'tipos_bloqueados', 'inatividade')
+
+    def __init__(self, login=True, admin=False, tipos_bloqueados=(), inatividade=False):
+        self.login = login or admin or bool(tipos_bloqueados)
+        self.admin = admin
+        self.tipos_bloqueados = frozenset(tipos_bloqueados)
+        self.inatividade = inatividade
+
+
+LOGADO = Politica()
+SO_ADMIN = Politica(admin=True, inatividade=True)
+SEM_PRESTADOR = Politica(tipos_bloqueados=('prestador',))  # prestador não entra
+
+# chave: 'blueprint.endpoint' (uma rota) ou 'blueprint' (todas as rotas dele)
+# a rota tem prioridade sobre o blueprint; fora da tabela = pública
+POLITICAS = {
+    'admin': SO_ADMIN,
+
+    'autenticacao.logout': LOGADO,
+
+    'perfil.meu_perfil': LOGADO,
+    'perfil.editar_perfil': LOGADO,
+    'perfil.toggle_ocultar': LOGADO,
+
+    'servicos.listar_servicos': SEM_PRESTADOR,
+    'servicos.listar_prestadores': SEM_PRESTADOR,
+    'servicos.detalhes_prestador': SEM_PRESTADOR,
+}
+
+
+def compilar_politicas(app, politicas=POLITICAS):
+    """
+    Resolve a política de cada endpoint registrado.
+    Retorna {endpoint: Politica} só com as rotas protegidas.
+    Chave da tabela que não existe no app → ValueError (erro de digitação).
+    """
+    desconhecidas = [
+        chave for chave in politicas
+        if chave not in app.view_functions and chave not in app.blueprints
+    ]
+    if desconhecidas:
+        raise ValueError(f"Políticas para rotas inexistentes: {', '.join(sorted(desconhecidas))}")
+
+    compiladas = {}
+    for endpoint in app.view_functions:
+        politica = politicas.get(endpoint)
+        if politica is None and '.' in endpoint:
+            politica = politicas.get(endpoint.rpartition('.')[0])
+        if politica is not None:
+            compiladas[endpoint] = politica
+    return compiladas
+
+
+# ======================================================
+# PRINCIPAL (quem está logado, sem o ORM)
+# ======================================================
+Principal = namedtuple('Principal', 'id tipo is_admin ativo')
+
+PREFIXO_PRINCIPAL = 'autorizacao:principal:'
+
+# colunas de Usuario usadas no Principal (mudou uma → cache limpo)
+CAMPOS_PRINCIPAL = ('tipo', 'is_admin', 'ativo')
+
+
+def _consultar_principal(usuario_id):
+    linha = bancodedados.session.execute(
+        select(Usuario.id, Usuario.tipo, Usuario.is_admin, Usuario.ativo)
+        .where(Usuario.id == usuario_id)
+    ).first()
+    return Principal(*linha) if linha else None
+
+
+def _id_da_sessao():
+    """
+    ID do usuário guardado pelo Flask-Login na sessão ('usuario:<id>').
+    None quando o Flask-Login precisa agir (cookie "lembrar-me",
+    proteção de sessão 'strong') ou não há login.
+    """
+    dado = session.get('_user_id')
+    if not dado:
+        return None
+    if login_manager.session_protection == 'strong' and session.get('_id') != _create_identifier():
+        return None
+    try:
+        return int(dado.rpartition(':')[2])
+    except ValueError:
+        return None
+
+
+def obter_principal():
+    """Principal do usuário logado (cache da aplicação) ou None."""
+    usuario_id = _id_da_sessao()
+
+    if usuario_id is None:
+        # restaura pelo caminho normal do Flask-Login (remember cookie etc.)
+        nome_cookie = current_app.config.get('REMEMBER_COOKIE_NAME', 'remember_token')
+        if nome_cookie not in request.cookies or not current_user.is_authenticated:
+            return None
+        usuario_id = current_user.id
+
+    return cache.obter_ou_calcular(
+        f'{PREFIXO_PRINCIPAL}{usuario_id}',
+        lambda: _consultar_principal(usuario_id),
+        current_app.config.get('PRINCIPAL_CACHE_TEMPO')
+    )
+
+
+def limpar_principal(usuario_id):
+    cache.delete(f'{PREFIXO_PRINCIPAL}{usuario_id}')
+
+
+# eventos do ORM: anotam no flush, limpam depois do commit
+# (senão uma leitura concorrente recolocaria o principal antigo no cache)
+LIMPEZA_PRINCIPAL = 'autorizacao_principal'
+
+
+def _limpar_principais(usuario_ids):
+    for usuario_id in usuario_ids:
+        limpar_principal(usuario_id)
+
+
+registrar_limpeza(LIMPEZA_PRINCIPAL, _limpar_principais)
+
+
+@event.listens_for(Usuario, 'after_delete', propagate=True)
+def _usuario_removido(mapper, conexao, alvo):
+    limpar_apos_commit(alvo, LIMPEZA_PRINCIPAL, alvo.id)
+
+
+@event.listens_for(Usuario, 'after_update', propagate=True)
+def _usuario_atualizado(mapper, conexao, alvo):
+    estado = inspect(alvo)
+    if any(estado.attrs[campo].history.has_changes() for campo in CAMPOS_PRINCIPAL):
+        limpar_apos_commit(alvo, LIMPEZA_PRINCIPAL, alvo.id)
+
+
+# ======================================================
+# VERIFICAÇÃO CENTRAL (before_request)
+# ======================================================
+def _pedir_login():
+    flash("Acesso negado: você precisa fazer login para acessar esta página.", "danger")
+    destino = request.full_path.rstrip('?') if request.method == 'GET' else None
+    return redirect(url_for('autenticacao.login', next=destino))
+
+
+def verificar_acesso():
+    """Aplica a política compilada da rota atual (None = segue para a view)."""
+    politica = current_app.extensions['politicas'].get(request.endpoint)
+    if politica is None:
+        return None
+
+    principal = obter_principal()
+
+    if principal is None:
+        return _pedir_login()
+
+    if not principal.ativo:
+        logout_user()
+        flash("Conta desativada ou pendente de ativação.", "alert-warning")
+        return redirect(url_for('autenticacao.login'))
+
+    if politica.inatividade:
+        resposta = checar_inatividade()
+        if resposta is not None:
+            return resposta
+
+    if principal.is_admin:
+        return None
+
+    if politica.admin:
+        flash("Acesso restrito: apenas administradores podem acessar.", "danger")
+        return redirect(url_for('servicos.home'))
+
+    if principal.tipo in politica.tipos_bloqueados:
+        flash("Acesso negado: sua conta não tem permissão para esta página.", "danger")
+        return redirect(url_for('servicos.home'))
+
+    return None
+
+
+def configurar_autorizacao(app):
+    """
+    Compila POLITICAS (depois dos blueprints) e registra o before_request.
+    """
+    app.extensions['politicas'] = compilar_politicas(app)
+    app.before_request(verificar_acesso)
 
 
 # =========================
 # BLOQUEAR TIPOS ESPECÍFICOS
 # =========================
-def bloquear_tipos(*tipos_bloqueados, redirect_endpoint='home'):
+def bloquear_tipos(*tipos_bloqueados, redirect_endpoint='servicos.home'):
     """
     Bloqueia acesso para os tipos listados em tipos_bloqueados.
     - Se NÃO autenticado: redireciona para 'login' com flash.
     - Admin sempre tem acesso.
     - Se o tipo do usuário estiver em tipos_bloqueados:
-        - flash e redirect para redirect_endpoint (padrão: 'home').
+        - flash e redirect para redirect_endpoint (padrão: 'servicos.home').
     """
     def decorator(funcao):
         @wraps(funcao)
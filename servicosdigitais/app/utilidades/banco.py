@@ -0,0 +1,146 @@
+# ========================
+# Utilidades - ajustes do banco (SQLite)
+# ========================
+
+''' O que tem neste arquivo:
+- aplicar_pragmas: executa os PRAGMAs numa conexão DBAPI do sqlite3
+- configurar_engines: opções de engine por banco/bind (antes do init_app);
+  SQLITE_CONNECT_ARGS só entra nas URLs sqlite
+- configurar_sqlite: liga o evento "connect" nos engines SQLite do app
+- registrar_limpeza / limpar_apos_commit: limpeza de cache pedida pelos
+  eventos do ORM (durante o flush) e feita só depois do commit
+
+Os PRAGMAs vêm de SQLITE_PRAGMAS (config). O journal_mode=WAL fica gravado
+no arquivo; os demais (busy_timeout, cache_size, ...) valem só para a
+conexão, por isso são aplicados a cada conexão nova do pool.
+'''
+
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, object_session
+
+from servicosdigitais.app.extensoes import bancodedados
+
+logger = logging.getLogger(__name__)
+
+
+def aplicar_pragmas(conexao_dbapi, pragmas, sem_journal=False):
+    """
+    Executa os PRAGMAs na ordem recebida.
+    sem_journal: ignora o journal_mode (banco :memory: ou conexão
+    somente leitura, que não pode gravar o modo no arquivo).
+    """
+    cursor = conexao_dbapi.cursor()
+    try:
+        for nome, valor in pragmas.items():
+            if sem_journal and nome == 'journal_mode':
+                continue
+            cursor.execute(f'PRAGMA {nome}={valor}')
+    finally:
+        cursor.close()
+
+
+def _opcoes_engine(url, comuns, connect_args_sqlite):
+    opcoes = dict(comuns)
+    if connect_args_sqlite and make_url(url).get_backend_name() == 'sqlite':
+        opcoes['connect_args'] = {**connect_args_sqlite, **opcoes.get('connect_args', {})}
+    return opcoes
+
+
+def configurar_engines(app):
+    """
+    Monta as opções de cada engine antes do bancodedados.init_app:
+    - SQLALCHEMY_ENGINE_OPTIONS (pool) valem para o banco padrão e os binds
+      (o Flask-SQLAlchemy só as aplica no padrão)
+    - SQLITE_CONNECT_ARGS só nos engines cuja URL é sqlite
+    Gera dicionários novos: não altera os da classe de configuração.
+    """
+    comuns = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+    connect_args = app.config.get('SQLITE_CONNECT_ARGS') or {}
+
+    uri = app.config.get('SQLALCHEMY_DATABASE_URI')
+    if uri:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = _opcoes_engine(uri, comuns, connect_args)
+
+    binds = {}
+    for chave, valor in (app.config.get('SQLALCHEMY_BINDS') or {}).items():
+        if not isinstance(valor, dict):
+            valor = {'url': valor}
+        binds[chave] = {**_opcoes_engine(valor['url'], comuns, connect_args), **valor}
+    app.config['SQLALCHEMY_BINDS'] = binds
+
+
+def configurar_sqlite(app):
+    """
+    Registra os PRAGMAs de SQLITE_PRAGMAS em todo engine SQLite do app
+    (bind padrão e binds extras). Sem SQLITE_PRAGMAS, não faz nada.
+    """
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    if not pragmas:
+        return
+
+    with app.app_context():
+        engines = list(bancodedados.engines.values())
+
+    for engine in engines:
+        if engine.dialect.name != 'sqlite':
+            continue
+
+        sem_journal = (
+            engine.url.database in (None, '', ':memory:')
+            or engine.url.query.get('mode') == 'ro'  # bind de leitura
+        )
+
+        @event.listens_for(engine, 'connect')
+        def _ao_conectar(conexao_dbapi, registro, sem_journal=sem_journal):
+            aplicar_pragmas(conexao_dbapi, pragmas, sem_journal)
+
+
+# ======================================================
+# LIMPEZA DE CACHE DEPOIS DO COMMIT
+# ======================================================
+# Os eventos do mapper rodam no flush, antes do commit: limpar ali deixa
+# uma leitura concorrente recolocar no cache o dado antigo (ainda
+# visível para as outras conexões). Os eventos só anotam o que limpar
+# em session.info; a limpeza roda no after_commit (e some no rollback).
+CHAVE_PENDENTES = 'limpezas_pendentes'
+
+_LIMPEZAS = {}  # nome → função(conjunto de chaves)
+
+
+def registrar_limpeza(nome, funcao):
+    """funcao(chaves) é chamada depois do commit com as chaves anotadas."""
+    _LIMPEZAS[nome] = funcao
+
+
+def limpar_apos_commit(alvo, nome, chave=None):
+    """
+    Anota uma limpeza na sessão do objeto (alvo) para depois do commit.
+    Objeto fora de sessão: limpa na hora.
+    """
+    sessao = object_session(alvo)
+    if sessao is None:
+        _LIMPEZAS[nome]({chave})
+        return
+    pendentes = sessao.info.setdefault(CHAVE_PENDENTES, {})
+    pendentes.setdefault(nome, set()).add(chave)
+
+
+@event.listens_for(Session, 'after_commit')
+def _limpar_pendentes(sessao):
+    pendentes = sessao.info.pop(CHAVE_PENDENTES, None)
+    if not pendentes:
+        return
+    for nome, chaves in pendentes.items():
+        try:
+            _LIMPEZAS[nome](chaves)
+        except Exception:
+            # o commit já aconteceu: só registra (o cache expira sozinho)
+            logger.exception("Erro ao limpar o cache '%s' depois do commit", nome)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_pendentes(sessao):
+    sessao.info.pop(CHAVE_PENDENTES, None)
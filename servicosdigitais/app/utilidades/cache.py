@@ -0,0 +1,160 @@
+# ========================
+# Utilidades - cache da aplicação
+# ========================
+
+''' O que tem neste arquivo:
+- Cache: extensão (init_app) com backend escolhido por CACHE_TIPO
+    - 'simples': dicionário em memória do processo, com validade e limite
+    - 'nulo': não guarda nada (testes / depuração)
+- get / set / delete / clear / obter_ou_calcular
+- memorizar: decorator para funções sem argumentos ou com argumentos simples
+
+Obs.: o cache 'simples' é por processo (cada worker tem o seu).
+'''
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+
+# ======================================================
+# BACKENDS
+# ======================================================
+class CacheSimples:
+    """Dicionário em memória com validade por item e limite de itens (LRU)."""
+
+    def __init__(self, tempo_padrao=300, max_itens=1000):
+        self.tempo_padrao = tempo_padrao
+        self.max_itens = max_itens
+        self._itens = OrderedDict()  # chave → (expira_em, valor)
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            expira_em, valor = item
+            if expira_em and expira_em < time.monotonic():
+                del self._itens[chave]
+                return None
+            self._itens.move_to_end(chave)
+            return valor
+
+    def set(self, chave, valor, tempo=None):
+        tempo = self.tempo_padrao if tempo is None else tempo
+        expira_em = time.monotonic() + tempo if tempo else 0  # 0 = sem validade
+        with self._lock:
+            self._itens[chave] = (expira_em, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def delete(self, chave):
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def delete_prefixo(self, prefixo):
+        with self._lock:
+            for chave in [c for c in self._itens if c.startswith(prefixo)]:
+                del self._itens[chave]
+
+    def clear(self):
+        with self._lock:
+            self._itens.clear()
+
+
+class CacheNulo:
+    """Não guarda nada: toda leitura é um 'miss'."""
+
+    def get(self, chave):
+        return None
+
+    def set(self, chave, valor, tempo=None):
+        pass
+
+    def delete(self, chave):
+        pass
+
+    def delete_prefixo(self, prefixo):
+        pass
+
+    def clear(self):
+        pass
+
+
+BACKENDS_CACHE = {
+    'simples': CacheSimples,
+    'nulo': CacheNulo,
+}
+
+
+# ======================================================
+# EXTENSÃO
+# ======================================================
+class Cache:
+    """
+    Extensão de cache. Uso:
+        cache = Cache()          (extensoes.py)
+        cache.init_app(app)      (criar_app)
+    Config: CACHE_TIPO, CACHE_TEMPO_PADRAO, CACHE_MAX_ITENS
+    """
+
+    def __init__(self, app=None):
+        self._backend = CacheNulo()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        tipo = app.config.get('CACHE_TIPO', 'simples')
+        if tipo not in BACKENDS_CACHE:
+            raise ValueError(f"CACHE_TIPO inválido: {tipo}")
+
+        if tipo == 'simples':
+            self._backend = CacheSimples(
+                tempo_padrao=app.config.get('CACHE_TEMPO_PADRAO', 300),
+                max_itens=app.config.get('CACHE_MAX_ITENS', 1000)
+            )
+        else:
+            self._backend = BACKENDS_CACHE[tipo]()
+
+        app.extensions['cache'] = self
+
+    def get(self, chave):
+        return self._backend.get(chave)
+
+    def set(self, chave, valor, tempo=None):
+        self._backend.set(chave, valor, tempo)
+
+    def delete(self, chave):
+        self._backend.delete(chave)
+
+    def delete_prefixo(self, prefixo):
+        self._backend.delete_prefixo(prefixo)
+
+    def clear(self):
+        self._backend.clear()
+
+    def obter_ou_calcular(self, chave, funcao, tempo=None):
+        """Retorna o valor em cache ou calcula, guarda e retorna."""
+        valor = self.get(chave)
+        if valor is None:
+            valor = funcao()
+            if valor is not None:
+                self.set(chave, valor, tempo)
+        return valor
+
+    def memorizar(self, prefixo, tempo=None):
+        """
+        Decorator: guarda o retorno da função.
+        A chave é prefixo + argumentos posicionais (devem ser simples).
+        """
+        def decorador(funcao):
+            @wraps(funcao)
+            def wrapper(*args):
+                chave = prefixo + ''.join(f':{a}' for a in args)
+                return self.obter_ou_calcular(chave, lambda: funcao(*args), tempo)
+            wrapper.limpar = lambda: self.delete_prefixo(prefixo)
+            return wrapper
+        return decorador
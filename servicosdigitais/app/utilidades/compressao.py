@@ -0,0 +1,178 @@
+# ========================
+# Utilidades - compressão das respostas (gzip / brotli)
+# ========================
+
+''' O que tem neste arquivo:
+- configurar_compressao: after_request que comprime HTML/JSON/texto
+  conforme o Accept-Encoding (br se o pacote brotli existir, senão gzip)
+- Limites: só tipos de COMPRESSAO_TIPOS e corpos >= COMPRESSAO_MIN_BYTES
+- Nível configurável (COMPRESSAO_NIVEL gzip 1-9, COMPRESSAO_NIVEL_BROTLI 0-11)
+- Respostas em streaming são comprimidas pedaço a pedaço (flush a cada
+  pedaço, o navegador recebe o HTML conforme é gerado)
+- Corpos comprimidos ficam num cache próprio (chave = hash do corpo):
+  páginas que saem iguais (cache de páginas, listas públicas) não são
+  comprimidas de novo
+
+Não mexe em:
+- respostas já codificadas, send_file (/assets, /fotos, downloads)
+- text/event-stream (logs ao vivo), Cache-Control: no-transform
+- status diferente de 200, HEAD
+'''
+
+import hashlib
+import zlib
+
+from flask import current_app, request
+
+from servicosdigitais.app.utilidades.cache import CacheSimples
+
+
+def _brotli():
+    """Pacote brotli é opcional: sem ele, só gzip."""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+# ======================================================
+# COMPRESSORES
+# ======================================================
+def _novo_compressor(codificacao, config):
+    """Retorna (comprimir(pedaço), finalizar()) no modo streaming."""
+    if codificacao == 'br':
+        compressor = _brotli().Compressor(quality=config['COMPRESSAO_NIVEL_BROTLI'])
+        return (
+            lambda pedaco: compressor.process(pedaco) + compressor.flush(),
+            compressor.finish,
+        )
+
+    # wbits 31 = formato gzip (cabeçalho + crc)
+    compressor = zlib.compressobj(config['COMPRESSAO_NIVEL'], zlib.DEFLATED, 31)
+    return (
+        lambda pedaco: compressor.compress(pedaco) + compressor.flush(zlib.Z_SYNC_FLUSH),
+        compressor.flush,
+    )
+
+
+def comprimir_bytes(dados, codificacao, config):
+    if codificacao == 'br':
+        return _brotli().compress(dados, quality=config['COMPRESSAO_NIVEL_BROTLI'])
+    compressor = zlib.compressobj(config['COMPRESSAO_NIVEL'], zlib.DEFLATED, 31)
+    return compressor.compress(dados) + compressor.flush()
+
+
+def _comprimir_stream(iteravel, codificacao, config):
+    comprimir, finalizar = _novo_compressor(codificacao, config)
+    try:
+        for pedaco in iteravel:
+            if isinstance(pedaco, str):
+                pedaco = pedaco.encode('utf-8')
+            if pedaco:
+                yield comprimir(pedaco)
+        yield finalizar()
+    finally:
+        fechar = getattr(iteravel, 'close', None)
+        if fechar:
+            fechar()
+
+
+# ======================================================
+# ESCOLHAS
+# ======================================================
+def escolher_codificacao(aceitas, tem_brotli):
+    """'br', 'gzip' ou None, pela qualidade que o cliente informou."""
+    opcoes = ['gzip']
+    if tem_brotli:
+        opcoes.insert(0, 'br')  # em empate, br primeiro
+    melhor = aceitas.best_match(opcoes)
+    if melhor and aceitas[melhor]:
+        return melhor
+    return None
+
+
+def _comprimivel(resposta, config):
+    if request.method == 'HEAD' or resposta.status_code != 200:
+        return False
+    if resposta.direct_passthrough or 'Content-Encoding' in resposta.headers:
+        return False
+    if resposta.cache_control.no_transform:
+        return False
+    return resposta.mimetype in config['COMPRESSAO_TIPOS']
+
+
+def _ajustar_etag(resposta, codificacao):
+    """O ETag do corpo original não vale para o comprimido."""
+    etag, fraco = resposta.get_etag()
+    if etag:
+        resposta.set_etag(f'{etag}-{codificacao}', weak=fraco)
+
+
+# ======================================================
+# AFTER_REQUEST
+# ======================================================
+def comprimir_resposta(resposta):
+    app = current_app
+    config = app.config
+
+    if not _comprimivel(resposta, config):
+        return resposta
+
+    resposta.vary.add('Accept-Encoding')
+    codificacao = escolher_codificacao(
+        request.accept_encodings, app.extensions['compressao_brotli']
+    )
+    if codificacao is None:
+        return resposta
+
+    # ---------- streaming ----------
+    if resposta.is_streamed:
+        resposta.response = _comprimir_stream(resposta.response, codificacao, config)
+        resposta.headers.pop('Content-Length', None)
+        resposta.headers['Content-Encoding'] = codificacao
+        _ajustar_etag(resposta, codificacao)
+        return resposta
+
+    # ---------- corpo inteiro ----------
+    dados = resposta.get_data()
+    if len(dados) < config['COMPRESSAO_MIN_BYTES']:
+        return resposta
+
+    cache = app.extensions['compressao_cache']
+    chave = None
+    comprimido = None
+    if cache is not None:
+        chave = (codificacao, hashlib.sha1(dados).digest())
+        comprimido = cache.get(chave)
+
+    if comprimido is None:
+        comprimido = comprimir_bytes(dados, codificacao, config)
+        if cache is not None:
+            cache.set(chave, comprimido)
+
+    if len(comprimido) >= len(dados):
+        return resposta
+
+    resposta.set_data(comprimido)
+    resposta.headers['Content-Encoding'] = codificacao
+    _ajustar_etag(resposta, codificacao)
+    return resposta
+
+
+def configurar_compressao(app):
+    """
+    Liga a compressão se COMPRESSAO_ATIVA (desligue quando o proxy já comprime).
+    """
+    if not app.config.get('COMPRESSAO_ATIVA'):
+        return
+
+    app.extensions['compressao_brotli'] = _brotli() is not None
+
+    itens = app.config.get('COMPRESSAO_CACHE_ITENS', 0)
+    app.extensions['compressao_cache'] = (
+        CacheSimples(app.config.get('CACHE_TEMPO_PADRAO', 300), itens)
+        if itens and app.config.get('CACHE_TIPO') != 'nulo' else None
+    )
+
+    app.after_request(comprimir_resposta)
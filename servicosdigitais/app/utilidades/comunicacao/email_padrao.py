@@ -27,3 +27,27 @@ Equipe Serviços Digitais
 """
 
     return assunto, corpo
+
+
+def email_boas_vindas_importacao(nome_usuario, senha_temporaria):
+    """
+    Template de e-mail para contas criadas por importação em lote.
+    """
+
+    assunto = "Sua conta foi criada - Serviços Digitais"
+
+    corpo = f"""
+Olá, {nome_usuario}.
+
+Sua conta de prestador foi criada pela equipe do Serviços Digitais.
+
+Senha temporária:
+{senha_temporaria}
+
+Por segurança, altere sua senha no primeiro acesso.
+
+Atenciosamente,
+Equipe Serviços Digitais
+"""
+
+    return assunto, corpo
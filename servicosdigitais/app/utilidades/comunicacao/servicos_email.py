@@ -2,6 +2,8 @@
 # SERVIÇO DE ENVIO DE E-MAIL
 # ========================
 # envio real (SMTP, API, etc.)
+from servicosdigitais.app.utilidades.tarefas import executar_em_segundo_plano
+
 
 def enviar_email(destinatario, assunto, corpo):
     """
@@ -16,3 +18,20 @@ def enviar_email(destinatario, assunto, corpo):
     print("Para:", destinatario)
     print("Assunto:", assunto)
     print(corpo)
+
+
+def enfileirar_emails(mensagens):
+    """
+    Enfileira vários e-mails de uma vez.
+    mensagens: lista de tuplas (destinatario, assunto, corpo).
+    O envio acontece em segundo plano, fora da requisição.
+    """
+    mensagens = list(mensagens)
+    if not mensagens:
+        return None
+
+    def _enviar_todos(lote):
+        for destinatario, assunto, corpo in lote:
+            enviar_email(destinatario, assunto, corpo)
+
+    return executar_em_segundo_plano(_enviar_todos, mensagens)
@@ -0,0 +1,131 @@
+# ========================
+# Utilidades - entrega das fotos de perfil
+# ========================
+
+''' O que tem neste arquivo:
+- resolver_foto: acha o arquivo real do nome gravado em Usuario.foto_perfil
+  (static/fotos_perfil/perfil/, uploads/ antigos ou a raiz; senão default.jpg)
+- servir_foto: rota /fotos/<nome> com ETag, Last-Modified, Range e GET
+  condicional (304); atrás de proxy usa X-Sendfile ou X-Accel-Redirect
+- url_foto(nome): URL da foto nos templates
+- configurar_fotos: registra a rota e o url_foto
+
+Cache:
+- Nomes gerados pelo salvar_imagem (prefixo_<hash>_<timestamp>.webp) nunca
+  são reaproveitados: trocar a foto gera outro nome → cache de 1 ano (immutable)
+- default.jpg e fotos antigas: cache curto (FOTOS_MAX_AGE) + revalidação por ETag
+
+Proxy (FOTOS_ENVIO):
+- None: o Flask envia o arquivo
+- 'x-sendfile': Apache (mod_xsendfile) / lighttpd
+- 'x-accel': nginx; FOTOS_X_ACCEL_PREFIXO é a location "internal" que
+  aponta para static/fotos_perfil/ (ex.: location /_fotos/ { internal; alias ...; })
+'''
+
+import mimetypes
+import os
+import re
+
+from flask import current_app, request, url_for, abort
+from werkzeug.security import safe_join
+from werkzeug.utils import send_file
+
+from servicosdigitais.app.utilidades.upload_imagem import pasta_imagens
+
+FOTO_PADRAO = 'default.jpg'
+
+# Onde procurar (em ordem), relativo a static/fotos_perfil/
+PASTAS_FOTOS = ('perfil', 'uploads', '')
+
+# Nome gerado pelo salvar_imagem: [prefixo_]<16 hex>_<timestamp>[_thumb].<ext>
+NOME_GERADO = re.compile(
+    r'^(?:[A-Za-z0-9]+_)?[0-9a-f]{16}_\d+(?:_thumb)?\.(?:webp|jpe?g|png)$'
+)
+
+CACHE_IMUTAVEL = 31536000  # 1 ano
+
+
+# ======================================================
+# RESOLUÇÃO DO NOME
+# ======================================================
+def resolver_foto(nome):
+    """
+    Retorna (caminho_absoluto, caminho_relativo) da foto ou (None, None).
+    O relativo é em relação a static/fotos_perfil/ (usado no X-Accel-Redirect).
+    """
+    nome = os.path.basename(nome or '')
+    if not nome or nome.startswith('.'):
+        return None, None
+
+    for pasta in PASTAS_FOTOS:
+        caminho = safe_join(pasta_imagens(pasta), nome)
+        if caminho and os.path.isfile(caminho):
+            relativo = f"{pasta}/{nome}" if pasta else nome
+            return caminho, relativo
+    return None, None
+
+
+def nome_imutavel(nome):
+    return bool(NOME_GERADO.match(nome or ''))
+
+
+# ======================================================
+# ROTA /fotos/<nome>
+# ======================================================
+def _environ_sem_range():
+    """Atrás do proxy quem atende o Range é ele (o corpo não passa pelo Flask)."""
+    environ = dict(request.environ)
+    environ.pop('HTTP_RANGE', None)
+    environ.pop('HTTP_IF_RANGE', None)
+    return environ
+
+
+def servir_foto(nome):
+    caminho, relativo = resolver_foto(nome)
+    if caminho is None:
+        # foto apagada ou nome antigo no banco → avatar padrão
+        caminho, relativo = resolver_foto(FOTO_PADRAO)
+        if caminho is None:
+            abort(404)
+        nome = FOTO_PADRAO
+
+    config = current_app.config
+    modo = config.get('FOTOS_ENVIO')
+    imutavel = nome_imutavel(nome)
+    max_age = CACHE_IMUTAVEL if imutavel else config.get('FOTOS_MAX_AGE', 3600)
+
+    resposta = send_file(
+        caminho,
+        _environ_sem_range() if modo else request.environ,
+        mimetype=mimetypes.guess_type(caminho)[0] or 'application/octet-stream',
+        use_x_sendfile=bool(modo),
+        response_class=current_app.response_class,
+        conditional=True,
+        etag=True,
+        max_age=max_age,
+    )
+
+    if modo == 'x-accel':
+        resposta.headers.pop('X-Sendfile', None)
+        prefixo = config.get('FOTOS_X_ACCEL_PREFIXO', '/_fotos/')
+        resposta.headers['X-Accel-Redirect'] = prefixo.rstrip('/') + '/' + relativo
+
+    if imutavel:
+        resposta.cache_control.immutable = True
+    else:
+        # pode guardar, mas confere o ETag depois do max-age
+        resposta.cache_control.must_revalidate = True
+    return resposta
+
+
+# ======================================================
+# USO NOS TEMPLATES
+# ======================================================
+def url_foto(nome=None):
+    """URL da foto de perfil (default.jpg se o usuário não tiver foto)."""
+    return url_for('servir_foto', nome=os.path.basename(nome or '') or FOTO_PADRAO)
+
+
+def configurar_fotos(app):
+    app.add_url_rule('/fotos/<nome>', 'servir_foto', servir_foto)
+    app.jinja_env.globals['url_foto'] = url_foto
@@ -0,0 +1,363 @@
+# ========================
+# Utilidades - instrumentação (tempo por requisição e SQL)
+# ========================
+
+''' O que tem neste arquivo:
+- configurar_instrumentacao: ganchos before/after/teardown_request no criar_app
+- Eventos before/after_cursor_execute do SQLAlchemy (quantidade e tempo de SQL)
+- Detecção de N+1: mesma instrução executada mais de K vezes na requisição
+- Histogramas por endpoint, pré-alocados (sem criar estrutura a cada requisição)
+- Exportação em dicionário (JSON) e em texto no formato Prometheus
+
+Custo:
+- Toda requisição: 2 perf_counter + 1 bisect + incremento sob lock
+- SQL: só nas requisições amostradas (METRICAS_AMOSTRAGEM, 0.0 a 1.0)
+'''
+
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Limites (em segundos) dos baldes do histograma de duração
+LIMITES_DURACAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Limites (em quantidade) do histograma de consultas SQL por requisição
+LIMITES_CONSULTAS = (1, 2, 5, 10, 20, 50, 100)
+
+# Endpoint usado quando a URL não casa com nenhuma rota (404)
+ENDPOINT_SEM_ROTA = '<sem_rota>'
+
+# Quantos alertas de N+1 recentes ficam guardados para o painel
+QTD_ALERTAS_N_MAIS_1 = 50
+
+
+# ======================================================
+# ESTRUTURAS PRÉ-ALOCADAS
+# ======================================================
+class Histograma:
+    """
+    Histograma de baldes fixos. Os baldes são contagens simples
+    (não acumuladas); o acúmulo só é feito na exportação.
+    """
+
+    __slots__ = ('limites', 'baldes', 'soma', 'total')
+
+    def __init__(self, limites):
+        self.limites = limites
+        self.baldes = [0] * (len(limites) + 1)  # último = +Inf
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.baldes[bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+    def acumulado(self):
+        total = 0
+        for limite, qtd in zip(self.limites + (float('inf'),), self.baldes):
+            total += qtd
+            yield limite, total
+
+
+class MetricasEndpoint:
+    """Contadores de um endpoint."""
+
+    __slots__ = (
+        'endpoint', 'blueprint', 'duracao', 'consultas',
+        'erros', 'amostradas', 'sql_qtd', 'sql_tempo', 'n_mais_1'
+    )
+
+    def __init__(self, endpoint, blueprint):
+        self.endpoint = endpoint
+        self.blueprint = blueprint
+        self.duracao = Histograma(LIMITES_DURACAO)
+        self.consultas = Histograma(LIMITES_CONSULTAS)
+        self.erros = 0
+        self.amostradas = 0
+        self.sql_qtd = 0
+        self.sql_tempo = 0.0
+        self.n_mais_1 = 0
+
+
+class RegistroMetricas:
+    """
+    Guarda as métricas de todos os endpoints do app.
+    Os endpoints são criados no início (a partir do url_map),
+    então o caminho da requisição só incrementa números.
+    """
+
+    def __init__(self, app, amostragem=0.1, limite_n_mais_1=10):
+        self.amostragem = amostragem
+        self.limite_n_mais_1 = limite_n_mais_1
+        self.iniciado_em = time.time()
+        self.alertas = deque(maxlen=QTD_ALERTAS_N_MAIS_1)
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+        for endpoint in app.view_functions:
+            self._criar(endpoint)
+        self._criar(ENDPOINT_SEM_ROTA)
+
+    def _criar(self, endpoint):
+        blueprint = endpoint.rsplit('.', 1)[0] if '.' in endpoint else ''
+        metricas = MetricasEndpoint(endpoint, blueprint)
+        self._endpoints[endpoint] = metricas
+        return metricas
+
+    def _obter(self, endpoint):
+        metricas = self._endpoints.get(endpoint or ENDPOINT_SEM_ROTA)
+        if metricas is None:
+            # rota registrada depois do criar_app (raro)
+            metricas = self._criar(endpoint)
+        return metricas
+
+    def registrar(self, endpoint, duracao, erro, sql=None):
+        with self._lock:
+            metricas = self._obter(endpoint)
+            metricas.duracao.observar(duracao)
+            if erro:
+                metricas.erros += 1
+            if sql is not None:
+                metricas.amostradas += 1
+                metricas.sql_qtd += sql.qtd
+                metricas.sql_tempo += sql.tempo
+                metricas.consultas.observar(sql.qtd)
+                if sql.repetidas:
+                    metricas.n_mais_1 += 1
+
+    def registrar_alerta(self, endpoint, instrucao, vezes):
+        self.alertas.append({
+            'quando': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'endpoint': endpoint,
+            'vezes': vezes,
+            'instrucao': instrucao[:300],
+        })
+
+    def limpar(self):
+        with self._lock:
+            for endpoint in list(self._endpoints):
+                self._criar(endpoint)
+            self.alertas.clear()
+            self.iniciado_em = time.time()
+
+    # ===========================
+    # Exportação
+    # ===========================
+    def como_dict(self):
+        """Resumo por endpoint (só os que receberam requisições)."""
+        with self._lock:
+            endpoints = []
+            for m in self._endpoints.values():
+                if not m.duracao.total:
+                    continue
+                endpoints.append({
+                    'endpoint': m.endpoint,
+                    'blueprint': m.blueprint,
+                    'requisicoes': m.duracao.total,
+                    'erros': m.erros,
+                    'tempo_total_s': round(m.duracao.soma, 6),
+                    'tempo_medio_ms': round(m.duracao.soma / m.duracao.total * 1000, 3),
+                    'histograma': {
+                        _rotulo_limite(limite): qtd for limite, qtd in m.duracao.acumulado()
+                    },
+                    'amostradas': m.amostradas,
+                    'sql_por_requisicao': (
+                        round(m.sql_qtd / m.amostradas, 2) if m.amostradas else None
+                    ),
+                    'sql_tempo_medio_ms': (
+                        round(m.sql_tempo / m.amostradas * 1000, 3) if m.amostradas else None
+                    ),
+                    'n_mais_1': m.n_mais_1,
+                })
+
+        endpoints.sort(key=lambda e: e['tempo_total_s'], reverse=True)
+        return {
+            'desde': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.iniciado_em)),
+            'amostragem': self.amostragem,
+            'limite_n_mais_1': self.limite_n_mais_1,
+            'endpoints': endpoints,
+            'alertas_n_mais_1': list(self.alertas),
+        }
+
+    def como_prometheus(self, prefixo='servicosdigitais'):
+        """Texto no formato de exposição do Prometheus (versão 0.0.4)."""
+        linhas = []
+
+        def cabecalho(nome, tipo, ajuda):
+            linhas.append(f'# HELP {prefixo}_{nome} {ajuda}')
+            linhas.append(f'# TYPE {prefixo}_{nome} {tipo}')
+
+        with self._lock:
+            ativos = [m for m in self._endpoints.values() if m.duracao.total]
+
+            cabecalho('requisicao_segundos', 'histogram', 'Duração das requisições por endpoint.')
+            for m in ativos:
+                rotulos = _rotulos(m)
+                for limite, qtd in m.duracao.acumulado():
+                    linhas.append(
+                        f'{prefixo}_requisicao_segundos_bucket{{{rotulos},le="{_rotulo_limite(limite)}"}} {qtd}'
+                    )
+                linhas.append(f'{prefixo}_requisicao_segundos_sum{{{rotulos}}} {m.duracao.soma:.6f}')
+                linhas.append(f'{prefixo}_requisicao_segundos_count{{{rotulos}}} {m.duracao.total}')
+
+            cabecalho('sql_consultas_por_requisicao', 'histogram',
+                      'Consultas SQL por requisição (só requisições amostradas).')
+            for m in ativos:
+                if not m.amostradas:
+                    continue
+                rotulos = _rotulos(m)
+                for limite, qtd in m.consultas.acumulado():
+                    linhas.append(
+                        f'{prefixo}_sql_consultas_por_requisicao_bucket{{{rotulos},le="{_rotulo_limite(limite)}"}} {qtd}'
+                    )
+                linhas.append(f'{prefixo}_sql_consultas_por_requisicao_sum{{{rotulos}}} {m.consultas.soma:.0f}')
+                linhas.append(f'{prefixo}_sql_consultas_por_requisicao_count{{{rotulos}}} {m.consultas.total}')
+
+            contadores = (
+                ('requisicao_erros_total', 'erros', 'Requisições com erro (5xx ou exceção).'),
+                ('requisicoes_amostradas_total', 'amostradas', 'Requisições com SQL instrumentado.'),
+                ('sql_segundos_total', 'sql_tempo', 'Tempo acumulado em SQL (amostradas).'),
+                ('n_mais_1_total', 'n_mais_1', 'Requisições com padrão N+1 detectado.'),
+            )
+            for nome, atributo, ajuda in contadores:
+                cabecalho(nome, 'counter', ajuda)
+                for m in ativos:
+                    valor = getattr(m, atributo)
+                    valor = f'{valor:.6f}' if isinstance(valor, float) else valor
+                    linhas.append(f'{prefixo}_{nome}{{{_rotulos(m)}}} {valor}')
+
+        return '\n'.join(linhas) + '\n'
+
+
+def _rotulo_limite(limite):
+    return '+Inf' if limite == float('inf') else repr(limite)
+
+
+def _rotulos(metricas):
+    endpoint = metricas.endpoint.replace('\\', '\\\\').replace('"', '\\"')
+    return f'endpoint="{endpoint}",blueprint="{metricas.blueprint}"'
+
+
+# ======================================================
+# SQL DA REQUISIÇÃO (só quando amostrada)
+# ======================================================
+class SqlRequisicao:
+    """Acumulador de SQL de uma requisição amostrada."""
+
+    __slots__ = ('qtd', 'tempo', 'formatos', 'repetidas')
+
+    def __init__(self):
+        self.qtd = 0
+        self.tempo = 0.0
+        self.formatos = {}   # instrução (já com placeholders) → vezes
+        self.repetidas = []  # [(instrução, vezes)] acima do limite
+
+
+def _sql_atual():
+    if not has_request_context():
+        return None
+    return g.get('_sql_metricas')
+
+
+def _antes_do_cursor(conn, cursor, statement, parameters, context, executemany):
+    if _sql_atual() is not None and context is not None:
+        context._inicio_metricas = time.perf_counter()
+
+
+def _depois_do_cursor(conn, cursor, statement, parameters, context, executemany):
+    sql = _sql_atual()
+    if sql is None or context is None:
+        return
+    inicio = getattr(context, '_inicio_metricas', None)
+    if inicio is None:
+        return
+
+    sql.qtd += 1
+    sql.tempo += time.perf_counter() - inicio
+    # a instrução já vem com placeholders (?), então o texto é o "formato"
+    sql.formatos[statement] = sql.formatos.get(statement, 0) + 1
+
+
+_eventos_registrados = False
+
+
+def _registrar_eventos_sql():
+    """Os eventos valem para todo Engine; registrados uma vez por processo."""
+    global _eventos_registrados
+    if _eventos_registrados:
+        return
+    event.listen(Engine, 'before_cursor_execute', _antes_do_cursor)
+    event.listen(Engine, 'after_cursor_execute', _depois_do_cursor)
+    _eventos_registrados = True
+
+
+# ======================================================
+# CONFIGURAÇÃO (chamada no criar_app, depois dos blueprints)
+# ======================================================
+def configurar_instrumentacao(app):
+    """
+    Liga a instrumentação se METRICAS_ATIVAS.
+    - METRICAS_AMOSTRAGEM: fração das requisições com SQL contado
+    - METRICAS_LIMITE_N_MAIS_1: repetições da mesma instrução que geram alerta
+    """
+    if not app.config.get('METRICAS_ATIVAS', True):
+        return None
+
+    registro = RegistroMetricas(
+        app,
+        amostragem=app.config.get('METRICAS_AMOSTRAGEM', 0.1),
+        limite_n_mais_1=app.config.get('METRICAS_LIMITE_N_MAIS_1', 10)
+    )
+    app.extensions['metricas'] = registro
+    _registrar_eventos_sql()
+
+    @app.before_request
+    def _iniciar_medicao():
+        g._inicio_requisicao = time.perf_counter()
+        if registro.amostragem >= 1.0 or random.random() < registro.amostragem:
+            g._sql_metricas = SqlRequisicao()
+
+    @app.after_request
+    def _guardar_status(resposta):
+        g._status_metricas = resposta.status_code
+        return resposta
+
+    @app.teardown_request
+    def _finalizar_medicao(erro=None):
+        inicio = g.pop('_inicio_requisicao', None)
+        if inicio is None:
+            return
+        duracao = time.perf_counter() - inicio
+        status = g.pop('_status_metricas', 500)
+        sql = g.pop('_sql_metricas', None)
+        endpoint = request.endpoint
+
+        if sql is not None:
+            for instrucao, vezes in sql.formatos.items():
+                if vezes > registro.limite_n_mais_1:
+                    sql.repetidas.append((instrucao, vezes))
+                    registro.registrar_alerta(endpoint, instrucao, vezes)
+                    app.logger.warning(
+                        'Possível N+1 em %s: %d execuções de %s',
+                        endpoint, vezes, ' '.join(instrucao.split())[:200]
+                    )
+
+        registro.registrar(
+            endpoint, duracao,
+            erro=erro is not None or status >= 500,
+            sql=sql
+        )
+
+    return registro
+
+
+def obter_metricas():
+    """Registro de métricas do app atual (None se desligado)."""
+    return current_app.extensions.get('metricas')
@@ -0,0 +1,335 @@
+# ========================
+# Utilidades - arquivo de log (gravação, leitura e acompanhamento)
+# ========================
+
+''' O que tem neste arquivo:
+- configurar_logs: RotatingFileHandler (rotação por tamanho) no criar_app
+- ler_ultimas_linhas: lê as N últimas linhas a partir do fim (sem ler tudo)
+- filtrar_logs: filtro por nível e período usando índice auxiliar (.idx)
+- seguir_log: acompanhamento ao vivo (Server-Sent Events)
+- reservar_seguidor / liberar_seguidor: limite de acompanhamentos ao vivo
+  abertos no processo (cada um prende uma thread do worker)
+
+Índice auxiliar (<log>.idx), uma linha por registro:
+    offset<TAB>epoch<TAB>NIVEL
+A primeira linha guarda o inode do log; se o arquivo rodar
+(inode diferente ou menor que o índice), o índice é refeito.
+'''
+
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+FORMATO_LOG = '%(asctime)s %(levelname)s [%(name)s] %(message)s'
+FORMATO_DATA_LOG = '%Y-%m-%d %H:%M:%S'
+NIVEIS_LOG = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+
+# Início de um registro; linhas sem esse padrão (ex.: traceback)
+# pertencem ao registro anterior.
+_INICIO_REGISTRO = re.compile(
+    rb'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) (DEBUG|INFO|WARNING|ERROR|CRITICAL) '
+)
+
+TAMANHO_BLOCO_LEITURA = 8192
+
+
+# ======================================================
+# CONFIGURAÇÃO (chamada no criar_app)
+# ======================================================
+def configurar_logs(app):
+    """
+    Liga o log da aplicação a um arquivo com rotação por tamanho.
+    Usa CAMINHO_LOG, LOG_TAMANHO_MAXIMO, LOG_QTD_BACKUPS e LOG_NIVEL.
+    O app.logger é o mesmo em todo criar_app() do processo: se o arquivo
+    já tem handler, reaproveita (senão cada registro sairia repetido).
+    """
+    caminho = app.config.get('CAMINHO_LOG')
+    if not caminho or app.testing:
+        return None
+
+    caminho_absoluto = os.path.abspath(caminho)
+    for existente in app.logger.handlers:
+        if (isinstance(existente, RotatingFileHandler)
+                and existente.baseFilename == caminho_absoluto):
+            existente.setLevel(app.config.get('LOG_NIVEL', 'INFO'))
+            app.logger.setLevel(app.config.get('LOG_NIVEL', 'INFO'))
+            return existente
+
+    os.makedirs(os.path.dirname(caminho_absoluto), exist_ok=True)
+
+    handler = RotatingFileHandler(
+        caminho,
+        maxBytes=app.config.get('LOG_TAMANHO_MAXIMO', 5 * 1024 * 1024),
+        backupCount=app.config.get('LOG_QTD_BACKUPS', 5),
+        encoding='utf-8',
+        delay=True
+    )
+    handler.setFormatter(logging.Formatter(FORMATO_LOG, FORMATO_DATA_LOG))
+    handler.setLevel(app.config.get('LOG_NIVEL', 'INFO'))
+
+    app.logger.addHandler(handler)
+    app.logger.setLevel(app.config.get('LOG_NIVEL', 'INFO'))
+    return handler
+
+
+# ======================================================
+# ÚLTIMAS LINHAS (leitura de trás para frente)
+# ======================================================
+def ler_ultimas_linhas(caminho, n=200, tamanho_bloco=TAMANHO_BLOCO_LEITURA):
+    """
+    Retorna as últimas n linhas do arquivo (lista de str).
+    Lê blocos a partir do fim até achar n quebras de linha,
+    então o custo depende de n, não do tamanho do arquivo.
+    """
+    if n <= 0 or not os.path.exists(caminho):
+        return []
+
+    with open(caminho, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        posicao = f.tell()
+        blocos = []
+        quebras = 0
+
+        # n linhas completas precisam de n+1 quebras (ou chegar ao início)
+        while posicao > 0 and quebras <= n:
+            leitura = min(tamanho_bloco, posicao)
+            posicao -= leitura
+            f.seek(posicao)
+            bloco = f.read(leitura)
+            blocos.append(bloco)
+            quebras += bloco.count(b'\n')
+
+    dados = b''.join(reversed(blocos))
+    linhas = dados.decode('utf-8', errors='replace').splitlines()
+    return linhas[-n:]
+
+
+# ======================================================
+# ÍNDICE AUXILIAR (offset / horário / nível)
+# ======================================================
+def _caminho_indice(caminho):
+    return caminho + '.idx'
+
+
+def _ler_indice(caminho_idx):
+    """Retorna (inode, offsets, epochs, niveis) do índice salvo."""
+    offsets, epochs, niveis = [], [], []
+    inode = None
+
+    if not os.path.exists(caminho_idx):
+        return inode, offsets, epochs, niveis
+
+    with open(caminho_idx, 'r', encoding='ascii', errors='ignore') as f:
+        for linha in f:
+            if linha.startswith('#'):
+                try:
+                    inode = int(linha[1:].strip())
+                except ValueError:
+                    inode = None
+                continue
+            partes = linha.rstrip('\n').split('\t')
+            if len(partes) != 3:
+                continue
+            offsets.append(int(partes[0]))
+            epochs.append(int(partes[1]))
+            niveis.append(partes[2])
+
+    return inode, offsets, epochs, niveis
+
+
+def _epoch(texto_data):
+    return int(time.mktime(time.strptime(texto_data, FORMATO_DATA_LOG)))
+
+
+def atualizar_indice(caminho):
+    """
+    Indexa só o trecho novo do log (a partir do último registro indexado).
+    Retorna (offsets, epochs, niveis) de todos os registros do arquivo atual.
+    """
+    caminho_idx = _caminho_indice(caminho)
+    if not os.path.exists(caminho):
+        return [], [], []
+
+    estado = os.stat(caminho)
+    inode, offsets, epochs, niveis = _ler_indice(caminho_idx)
+
+    # arquivo rodou/foi limpo → recomeça o índice
+    refazer = inode != estado.st_ino or (offsets and offsets[-1] >= estado.st_size)
+    if refazer:
+        offsets, epochs, niveis = [], [], []
+
+    inicio = offsets[-1] if offsets else 0
+    novos = []
+
+    with open(caminho, 'rb') as f:
+        f.seek(inicio)
+        posicao = inicio
+        for linha in f:
+            if not linha.endswith(b'\n'):
+                break  # linha ainda sendo escrita
+            achou = _INICIO_REGISTRO.match(linha)
+            if achou and not (offsets and posicao == offsets[-1]):
+                novos.append((
+                    posicao,
+                    _epoch(achou.group(1).decode('ascii')),
+                    achou.group(2).decode('ascii')
+                ))
+            posicao += len(linha)
+
+    if refazer:
+        with open(caminho_idx, 'w', encoding='ascii') as f:
+            f.write(f'#{estado.st_ino}\n')
+            f.writelines(f'{o}\t{e}\t{n}\n' for o, e, n in novos)
+    elif novos:
+        with open(caminho_idx, 'a', encoding='ascii') as f:
+            f.writelines(f'{o}\t{e}\t{n}\n' for o, e, n in novos)
+
+    for offset, epoch, nivel in novos:
+        offsets.append(offset)
+        epochs.append(epoch)
+        niveis.append(nivel)
+
+    return offsets, epochs, niveis
+
+
+def filtrar_logs(caminho, niveis=None, inicio=None, fim=None, limite=200):
+    """
+    Retorna os últimos `limite` registros que batem com o filtro.
+    - niveis: coleção de níveis (ex.: {'ERROR', 'CRITICAL'})
+    - inicio / fim: datetime (horário local, mesmo do log)
+    Só lê do log os trechos dos registros selecionados.
+    """
+    offsets, epochs, niveis_idx = atualizar_indice(caminho)
+    if not offsets:
+        return []
+
+    # índice está em ordem de gravação → busca binária pelo horário
+    primeiro = bisect_left(epochs, int(inicio.timestamp())) if inicio else 0
+    ultimo = bisect_right(epochs, int(fim.timestamp())) if fim else len(epochs)
+
+    niveis = {n.upper() for n in niveis} if niveis else None
+    selecionados = []
+    for i in range(ultimo - 1, primeiro - 1, -1):
+        if niveis is None or niveis_idx[i] in niveis:
+            selecionados.append(i)
+            if len(selecionados) >= limite:
+                break
+    selecionados.reverse()
+
+    registros = []
+    with open(caminho, 'rb') as f:
+        for i in selecionados:
+            f.seek(offsets[i])
+            if i + 1 < len(offsets):
+                bruto = f.read(offsets[i + 1] - offsets[i])
+            else:
+                bruto = f.read()
+            registros.append({
+                'quando': datetime.fromtimestamp(epochs[i]),
+                'nivel': niveis_idx[i],
+                'texto': bruto.decode('utf-8', errors='replace').rstrip('\n'),
+            })
+    return registros
+
+
+def limpar_log(caminho):
+    """Esvazia o log e descarta o índice auxiliar."""
+    open(caminho, 'w').close()
+    caminho_idx = _caminho_indice(caminho)
+    if os.path.exists(caminho_idx):
+        os.remove(caminho_idx)
+
+
+# ======================================================
+# ACOMPANHAMENTO AO VIVO (SSE)
+# ======================================================
+# Com worker de threads (Gunicorn gthread / Werkzeug), cada acompanhamento
+# ocupa uma thread em sleep enquanto dura: o contador limita quantos ficam
+# abertos por processo. Para muitos, use um worker assíncrono (gevent).
+_seguidores = 0
+_trava_seguidores = threading.Lock()
+
+
+def reservar_seguidor(limite):
+    """Conta mais um acompanhamento; False se já há `limite` abertos."""
+    global _seguidores
+    with _trava_seguidores:
+        if _seguidores >= limite:
+            return False
+        _seguidores += 1
+        return True
+
+
+def liberar_seguidor():
+    global _seguidores
+    with _trava_seguidores:
+        _seguidores = max(0, _seguidores - 1)
+
+
+def seguir_log(caminho, niveis=None, intervalo=1.0, duracao_max=60, batimento=15):
+    """
+    Gerador de eventos SSE com as linhas novas do log.
+    - Começa do fim do arquivo (só mostra o que chegar)
+    - Percebe rotação (inode novo ou arquivo menor) e reabre
+    - Envia comentário de batimento para manter a conexão
+    - Encerra após duracao_max segundos (o EventSource reconecta sozinho)
+    Não usa a requisição nem o banco: pode rodar sem stream_with_context.
+    """
+    niveis = {n.upper() for n in niveis} if niveis else None
+    arquivo = None
+    ultimo_envio = time.monotonic()
+    limite = ultimo_envio + duracao_max
+    nivel_atual = None
+
+    try:
+        while time.monotonic() < limite:
+            if arquivo is None:
+                if not os.path.exists(caminho):
+                    time.sleep(intervalo)
+                    continue
+                arquivo = open(caminho, 'rb')
+                arquivo.seek(0, os.SEEK_END)
+
+            linhas = []
+            while True:
+                linha = arquivo.readline()
+                if not linha or not linha.endswith(b'\n'):
+                    if linha:
+                        arquivo.seek(-len(linha), os.SEEK_CUR)
+                    break
+                linhas.append(linha)
+
+            for linha in linhas:
+                achou = _INICIO_REGISTRO.match(linha)
+                if achou:
+                    nivel_atual = achou.group(2).decode('ascii')
+                if niveis is None or nivel_atual in niveis:
+                    texto = linha.decode('utf-8', errors='replace').rstrip('\r\n')
+                    yield f'data: {texto}\n\n'
+                    ultimo_envio = time.monotonic()
+
+            if not linhas:
+                # rotação: o caminho agora aponta para outro arquivo
+                try:
+                    estado = os.stat(caminho)
+                    rodou = (estado.st_ino != os.fstat(arquivo.fileno()).st_ino
+                             or estado.st_size < arquivo.tell())
+                except FileNotFoundError:
+                    rodou = True
+                if rodou:
+                    arquivo.close()
+                    arquivo = open(caminho, 'rb') if os.path.exists(caminho) else None
+                    continue
+
+                if time.monotonic() - ultimo_envio >= batimento:
+                    yield ': ping\n\n'
+                    ultimo_envio = time.monotonic()
+                time.sleep(intervalo)
+    finally:
+        if arquivo is not None:
+            arquivo.close()
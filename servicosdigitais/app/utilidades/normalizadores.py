@@ -4,6 +4,67 @@
 
 # Funções que transformam dados, sem validar se estão certos ou errados.
 
+''' O que tem neste arquivo:
+- apenas_numeros: bytes.translate com tabela de exclusão pronta (sem loop
+  por caractere); valor que já é só dígitos volta direto
+- normalizar_documento: CPF/CNPJ no formato das colunas (só dígitos, largura fixa)
+- normalizar_texto: chave de busca sem acento/caixa (cidade, especialidade)
+- Máscaras (_mask_doc, _mask_phone, _mask_email) para exportação/perfis
+- Formatação (formatar_cpf, formatar_cnpj, formatar_documento, formatar_telefone)
+  com lru_cache (listas e importações repetem os mesmos valores)
+- FILTROS_JINJA: registrados no criar_app (registrar_filtros)
+'''
+
+import string
+import unicodedata
+from functools import lru_cache
+
+TAMANHO_CACHE_FORMATOS = 4096
+
+# Tabela de exclusão: todo byte ASCII que não é dígito
+_NAO_DIGITOS = bytes(c for c in range(128) if chr(c) not in string.digits)
+
+
+def apenas_numeros(valor) -> str:
+    """Remove tudo que não for dígito (0-9) e retorna só os números."""
+    if not valor:
+        return ''
+    if not isinstance(valor, str):
+        valor = str(valor)
+    if valor.isascii():
+        if valor.isdigit():
+            return valor
+        return valor.encode('ascii').translate(None, _NAO_DIGITOS).decode('ascii')
+    # caminho raro: texto com caracteres fora do ASCII
+    return ''.join(ch for ch in valor if '0' <= ch <= '9')
+
+
+def normalizar_documento(valor, tamanho):
+    """
+    CPF (tamanho 11) / CNPJ (tamanho 14) como é gravado no banco: só dígitos.
+    Inteiros (colunas antigas) voltam com os zeros à esquerda.
+    Vazio → None.
+    """
+    numeros = apenas_numeros(valor)
+    if not numeros:
+        return None
+    if isinstance(valor, int) and len(numeros) < tamanho:
+        return numeros.zfill(tamanho)
+    return numeros
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_FORMATOS)
+def normalizar_texto(valor) -> str:
+    """
+    Chave de busca para nomes (cidade, especialidade): sem acentos,
+    minúsculas, espaços simples. ' São  Paulo ' → 'sao paulo'. Vazio → ''.
+    """
+    if not valor:
+        return ''
+    decomposto = unicodedata.normalize('NFKD', str(valor))
+    sem_acento = ''.join(ch for ch in decomposto if not unicodedata.combining(ch))
+    return ' '.join(sem_acento.casefold().split())
+
 
 def _mask_email(email: str):
     if not email or '@' not in email:
@@ -19,16 +80,17 @@ def _mask_email(email: str):
     return f"{local_mask}@{dominio}"
 
 
+@lru_cache(maxsize=TAMANHO_CACHE_FORMATOS)
 def _mask_doc(doc: str) -> str:
-    """Mascarar CPF/CNPJ (apenas dígitos esperados). Ex.: 11122233344 -> 111.***.***-44"""
+    """Mascarar CPF/CNPJ (apenas dígitos esperados). Ex.: 11122233344 -> 111.222.***-44"""
     if not doc:
         return ''
-    s = ''.join(ch for ch in str(doc) if ch.isdigit())
+    s = apenas_numeros(doc)
     l = len(s)
     if l == 11:  # CPF
         return f"{s[0:3]}.{s[3:6]}.***-{s[-2:]}"
     if l == 14:  # CNPJ
-        return f"{s[0:2]}.{s[2:5]}.***./{s[8:12]}-{s[-2:]}" 
+        return f"{s[0:2]}.{s[2:5]}.***./{s[8:12]}-{s[-2:]}"
     # máscara informativa
     # caso genérico, preserva primeiros e últimos
     if l <= 4:
@@ -36,10 +98,11 @@ def _mask_doc(doc: str) -> str:
     return s[0:2] + '*' * (l - 4) + s[-2:]
 
 
+@lru_cache(maxsize=TAMANHO_CACHE_FORMATOS)
 def _mask_phone(phone: str) -> str:
     if not phone:
         return ''
-    s = ''.join(ch for ch in str(phone) if ch.isdigit())
+    s = apenas_numeros(phone)
     l = len(s)
     if l <= 4:
         return '*' * l
@@ -47,6 +110,53 @@ def _mask_phone(phone: str) -> str:
     return '*' * (l - 4) + s[-4:]
 
 
+# ======================================================
+# FORMATAÇÃO (exibição)
+# ======================================================
+@lru_cache(maxsize=TAMANHO_CACHE_FORMATOS)
+def formatar_cpf(cpf) -> str:
+    s = apenas_numeros(cpf)
+    return f"{s[:3]}.{s[3:6]}.{s[6:9]}-{s[9:]}" if len(s) == 11 else s
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_FORMATOS)
+def formatar_cnpj(cnpj) -> str:
+    s = apenas_numeros(cnpj)
+    return f"{s[:2]}.{s[2:5]}.{s[5:8]}/{s[8:12]}-{s[12:]}" if len(s) == 14 else s
+
+
+def formatar_documento(doc) -> str:
+    """CPF (11 dígitos) ou CNPJ (14 dígitos) com pontuação; outro tamanho volta só com os dígitos."""
+    s = apenas_numeros(doc)
+    if len(s) == 14:
+        return formatar_cnpj(s)
+    return formatar_cpf(s)
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_FORMATOS)
+def formatar_telefone(tel) -> str:
+    """(11) 2345-6789 para fixo (10 dígitos), (11) 98765-4321 para celular (11 dígitos)."""
+    s = apenas_numeros(tel)
+    if len(s) == 10:
+        return f"({s[:2]}) {s[2:6]}-{s[6:]}"
+    if len(s) == 11:
+        return f"({s[:2]}) {s[2:7]}-{s[7:]}"
+    return s
+
+
+# Nome do filtro nos templates → função
+FILTROS_JINJA = {
+    'apenas_numeros': apenas_numeros,
+    'formatar_cpf': formatar_cpf,
+    'formatar_cnpj': formatar_cnpj,
+    'formatar_documento': formatar_documento,
+    'formatar_telefone': formatar_telefone,
+    'mascarar_documento': _mask_doc,
+    'mascarar_telefone': _mask_phone,
+    'mascarar_email': _mask_email,
+}
+
+
 def esta_ativo(valor): # TALVEZ mudar
     """Normaliza campo ativo (0/1/bool/str) para booleano."""
     if valor is None:
@@ -67,24 +177,10 @@ def esta_ativo(valor): # TALVEZ mudar
 def obter_documento_exibicao(usuario):
     """
     Retorna o tipo de documento (CPF ou CNPJ) e o valor formatado
-    para exibição no perfil.
+    para exibição no perfil (lido da tabela documento).
+    O perfil público usa o cartão em cache (servicos/perfil_servico.py).
     """
-
-    # ============================
-    # CPF
-    # ============================
-    if hasattr(usuario, 'cliente_cpf') and usuario.cliente_cpf:
-        if usuario.cliente_cpf.cpf:
-            return 'CPF', usuario.cliente_cpf.cpf
-
-    # ============================
-    # CNPJ
-    # ============================
-    if hasattr(usuario, 'cliente_cnpj') and usuario.cliente_cnpj:
-        if usuario.cliente_cnpj.cnpj:
-            return 'CNPJ', usuario.cliente_cnpj.cnpj
-
-    # ============================
-    # AUSÊNCIA DE DOCUMENTO
-    # ============================
-    return None, None
+    documento = getattr(usuario, 'documento', None)
+    if documento is None or not documento.numero:
+        return None, None
+    return documento.tipo.upper(), formatar_documento(documento.numero)
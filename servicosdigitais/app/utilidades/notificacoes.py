@@ -1,8 +1,9 @@
-import smtplib
-from email.message import EmailMessage
 from flask import current_app
 import secrets
 
+# smtplib / email são importados dentro de enviar_email_smtp:
+# só quem envia e-mail paga o custo do import.
+
 
 def gerar_token_prioridade(nbytes=6):
     # Gera token curto
@@ -20,6 +21,9 @@ def enviar_email_smtp(destinatarios, assunto, corpo_texto, corpo_html=None, reme
         current_app.logger.warning("Envio de e-mail desabilitado: MAIL_SERVER não configurado")
         return False, "Mail disabled"
 
+    import smtplib
+    from email.message import EmailMessage
+
     msg = EmailMessage()
     msg['Subject'] = assunto # alterar
     msg['From'] = remetente or current_app.config.get('MAIL_DEFAULT_SENDER')
@@ -0,0 +1,88 @@
+# ========================
+# Utilidades - roteamento de leitura (réplica / somente leitura)
+# ========================
+
+''' O que tem neste arquivo:
+- SessaoRoteada: sessão do bancodedados que escolhe o engine de leitura
+  (bind "leitura") para SELECTs das views marcadas
+- leitura_replica: decorator das views que podem ler da réplica
+- Aderência "lê o que escreveu": depois de uma escrita do usuário, as
+  leituras dele voltam ao primário por LEITURA_JANELA_ESCRITA segundos
+
+Regras para ir à réplica (todas precisam valer):
+- view marcada com @leitura_replica
+- bind "leitura" configurado em SQLALCHEMY_BINDS
+- instrução é SELECT (nada de INSERT/UPDATE/DELETE/text)
+- sessão sem flush em andamento e sem objetos pendentes
+- nenhuma escrita nesta requisição nem escrita recente do usuário
+
+Teste local: SQLALCHEMY_BINDS = {"leitura": "sqlite:///file:<caminho>?mode=ro&uri=true"}
+'''
+
+import time
+from functools import wraps
+
+from flask import g, has_request_context, session, current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql import Select, CompoundSelect
+
+BIND_LEITURA = 'leitura'
+CHAVE_ULTIMA_ESCRITA = '_ultima_escrita'
+
+
+def _leitura_liberada():
+    """A requisição atual pode ler da réplica?"""
+    if not has_request_context() or not g.get('_leitura_replica'):
+        return False
+    if g.get('_escreveu'):
+        return False
+
+    ultima = session.get(CHAVE_ULTIMA_ESCRITA)
+    if ultima:
+        janela = current_app.config.get('LEITURA_JANELA_ESCRITA', 10)
+        if time.time() - ultima < janela:
+            return False
+    return True
+
+
+class SessaoRoteada(Session):
+    """
+    Mesma escolha de engine do Flask-SQLAlchemy (bind_key dos modelos);
+    só troca o engine padrão pelo de leitura quando a regra permite.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        escolhido = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+        if bind is not None or not isinstance(clause, (Select, CompoundSelect)):
+            return escolhido
+
+        engines = self._db.engines
+        leitura = engines.get(BIND_LEITURA)
+        if leitura is None or escolhido is not engines.get(None):
+            return escolhido
+
+        if self._flushing or self.new or self.deleted or self.dirty:
+            return escolhido
+
+        return leitura if _leitura_liberada() else escolhido
+
+
+@event.listens_for(SessaoRoteada, 'after_flush')
+def _marcar_escrita(sessao, contexto_flush):
+    """Qualquer flush fixa a requisição (e o usuário) no primário."""
+    if has_request_context():
+        g._escreveu = True
+        session[CHAVE_ULTIMA_ESCRITA] = time.time()
+
+
+def leitura_replica(func):
+    """
+    Decorator: marca a view como só leitura (pode usar o bind "leitura").
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        g._leitura_replica = True
+        return func(*args, **kwargs)
+    return wrapper
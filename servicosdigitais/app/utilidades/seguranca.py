@@ -1,6 +1,8 @@
 from servicosdigitais.app.extensoes import bcrypt
+from concurrent.futures import ThreadPoolExecutor
 import secrets
 import string
+import os
 
 
 def gerar_senha_hash(senha: str) -> str:
@@ -10,6 +12,21 @@ def gerar_senha_hash(senha: str) -> str:
     return bcrypt.generate_password_hash(senha).decode("utf-8")
 
 
+def gerar_senhas_hash_em_paralelo(senhas, max_threads=None):
+    """
+    Gera hashes bcrypt para várias senhas ao mesmo tempo.
+    O bcrypt libera o GIL durante o cálculo, então threads
+    aproveitam todos os núcleos. Mantém a ordem da entrada.
+    """
+    senhas = list(senhas)
+    if len(senhas) <= 1:
+        return [gerar_senha_hash(s) for s in senhas]
+
+    threads = max_threads or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(gerar_senha_hash, senhas))
+
+
 def verificar_senha_hash(senha_digitada: str, senha_hash: str) -> bool:
     """
     Verifica se a senha digitada corresponde ao hash armazenado.
@@ -0,0 +1,31 @@
+# ========================
+# Utilidades - tarefas em segundo plano
+# ========================
+
+# Executor simples (em processo) para tirar trabalho lento da requisição:
+# envio de e-mails, processamento de imagens, etc.
+
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+
+# Poucas threads: as tarefas são de I/O (SMTP, disco)
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tarefas")
+
+
+def executar_em_segundo_plano(funcao, *args, **kwargs):
+    """
+    Agenda funcao(*args, **kwargs) em uma thread de fundo,
+    dentro do contexto da aplicação atual.
+    Retorna o Future (útil em testes).
+    """
+    app = current_app._get_current_object()
+
+    def _rodar():
+        with app.app_context():
+            try:
+                return funcao(*args, **kwargs)
+            except Exception:
+                app.logger.exception("Falha em tarefa de segundo plano: %s", funcao.__name__)
+                raise
+
+    return _executor.submit(_rodar)
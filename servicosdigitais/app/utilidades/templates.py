@@ -0,0 +1,52 @@
+# ========================
+# Utilidades - templates Jinja (cache de bytecode e pré-compilação)
+# ========================
+
+''' O que tem neste arquivo:
+- configurar_templates: liga o FileSystemBytecodeCache (JINJA_CACHE_BYTECODE_DIR)
+  e pré-compila os templates se TEMPLATES_PRECOMPILAR
+- precompilar_templates: compila todos os .html (usado no criar_app,
+  no servidor.py e no comando "flask compilar-templates")
+
+Com o cache de bytecode, cada worker carrega o template já compilado do
+disco em vez de compilar de novo. O Jinja confere o checksum do fonte,
+então um template alterado é recompilado sozinho.
+'''
+
+import os
+import time
+
+from jinja2 import FileSystemBytecodeCache
+
+EXTENSOES_TEMPLATE = ('html',)
+
+
+def configurar_templates(app):
+    pasta_cache = app.config.get('JINJA_CACHE_BYTECODE_DIR')
+    if pasta_cache:
+        os.makedirs(pasta_cache, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(pasta_cache)
+
+    if app.config.get('TEMPLATES_PRECOMPILAR'):
+        precompilar_templates(app)
+
+
+def precompilar_templates(app):
+    """
+    Compila todos os templates .html e deixa no cache do Jinja
+    (e no cache de bytecode, se ligado).
+    Retorna (quantidade, falhas, segundos).
+    """
+    inicio = time.perf_counter()
+    carregados, falhas = 0, []
+
+    for nome in app.jinja_env.list_templates(extensions=EXTENSOES_TEMPLATE):
+        try:
+            app.jinja_env.get_template(nome)
+            carregados += 1
+        except Exception:
+            app.logger.exception("Falha ao pré-compilar o template %s", nome)
+            falhas.append(nome)
+
+    app.extensions['templates_precompilados'] = carregados
+    return carregados, falhas, time.perf_counter() - inicio
@@ -4,7 +4,6 @@
 from werkzeug.utils import secure_filename
 from flask import current_app
 from io import BytesIO
-from PIL import Image
 import secrets
 import time
 import os
@@ -15,9 +14,42 @@ ext_uso = {'.jpg', '.jpeg', '.png'}
 # nível de compressão WEBP
 method=6
 
+# formatos aceitos na checagem rápida (mesmos do FileAllowed dos formulários)
+FORMATOS_ACEITOS = {'JPEG', 'PNG', 'WEBP'}
+
+def _pil_image():
+    """Importa o Pillow só no primeiro upload (fora da subida do app)."""
+    from PIL import Image
+    return Image
+
+
+def validar_imagem(dados):
+    """
+    Checagem barata, ainda na requisição: lê só o cabeçalho e a estrutura
+    (Image.verify, sem decodificar os pixels) e confere o formato.
+    Levanta ValueError com a mensagem para o usuário.
+    """
+    if not dados:
+        raise ValueError("Arquivo inválido ou vazio.")
+    try:
+        with _pil_image().open(BytesIO(dados)) as img:
+            formato = img.format
+            img.verify()
+    except Exception:
+        raise ValueError("O arquivo enviado não é uma imagem válida.")
+    if formato not in FORMATOS_ACEITOS:
+        raise ValueError("Formato de imagem não aceito (use JPG, PNG ou WEBP).")
+    return formato
+
+
+# Pasta base das fotos (static/fotos_perfil/<folder>/)
+def pasta_imagens(folder: str = '') -> str:
+    return os.path.join(current_app.root_path, 'static', 'fotos_perfil', folder)
+
+
 # Evita repetir os.path.join em todo lugar
 def caminho_imagem(folder: str, filename: str) -> str:
-    return os.path.join(current_app.root_path, 'static/fotos_perfil', folder, filename)
+    return os.path.join(pasta_imagens(folder), filename)
 
 
 def _strip_metadata_and_prepare(img, target_mode=None):
@@ -34,7 +66,7 @@ def _strip_metadata_and_prepare(img, target_mode=None):
 
     # Tirar metadata para proteção do usuário;
     base_mode = img.mode
-    base = Image.new(base_mode, img.size)
+    base = _pil_image().new(base_mode, img.size)
     base.paste(img)
     return base
 
@@ -83,10 +115,11 @@ def salvar_imagem(
     nome_base = f"{prefix + '_' if prefix else ''}{hashcode}_{ts}"
 
     # pastas
-    pasta = caminho_imagem
+    pasta = pasta_imagens(folder)
     os.makedirs(pasta, exist_ok=True)
 
     # preparações: abrir imagem principal a partir dos bytes lidos
+    Image = _pil_image()
     bio_main = BytesIO(data)
     img = Image.open(bio_main)
     img.thumbnail(max_size)
@@ -164,7 +197,7 @@ def apagar_imagem_arquivo(filename, folder='fotos_perfil'):
         return False
     if filename == 'default.jpg':
         return False
-    caminho = caminho_imagem
+    caminho = caminho_imagem(folder, os.path.basename(filename))
     if os.path.exists(caminho):
         try:
             os.remove(caminho)
@@ -172,19 +205,3 @@ def apagar_imagem_arquivo(filename, folder='fotos_perfil'):
         except Exception:
             return False
     return False
-
-
-def trocar_imagem_usuario(usuario, file_storage, prefix='user'):
-    """
-    Salva a nova imagem e apaga a antiga (se não for default.jpg).
-    Retorna nome_salvo (string) ou None.
-    """
-    try:
-        saved_name, _thumb = salvar_imagem(file_storage, folder='perfil', prefix=f"{prefix}{usuario.id}", gerar_thumb=False)
-        # apagar antiga (preservando default.jpg)
-        apagar_imagem_arquivo(usuario.foto_perfil, folder='perfil')
-        usuario.foto_perfil = saved_name
-        return saved_name
-    except Exception:
-        current_app.logger.exception("Erro ao salvar imagem do usuário")
-        return None
\ No newline at end of file
@@ -5,6 +5,7 @@
 from typing import Optional, List, Type
 from sqlalchemy.sql import func
 from servicosdigitais.app.extensoes import bancodedados
+from servicosdigitais.app.utilidades.normalizadores import apenas_numeros  # reexportado
 from servicosdigitais.app.models import (
     Usuario,
     ClienteCPF,
@@ -25,7 +26,7 @@ def validar_cpf(cpf: str):
     def calc_dig(nums):
         soma = 0
         for i, n in enumerate(nums, start=2):
-            soma += int(n) * (len(nums) + 2 - i)
+            soma += int(n) * (len(nums) + 3 - i)  # pesos 10..2 / 11..2
         resto = soma % 11
         return '0' if resto < 2 else str(11 - resto)
 
@@ -47,7 +48,7 @@ def validar_cnpj(cnpj: str):
         return False
 
     # garante string e só dígitos
-    c = ''.join(ch for ch in str(cnpj) if ch.isdigit())
+    c = apenas_numeros(cnpj)
 
     # tem que ter 14 dígitos
     if len(c) != 14:
@@ -77,6 +78,104 @@ def validar_cnpj(cnpj: str):
     return c[-2:] == (d1 + d2)
 
 
+# ======================================================
+# VALIDAÇÃO EM LOTE (importações / auditorias)
+# ======================================================
+# Pesos dos dígitos verificadores: linha 0 → 1º dígito, linha 1 → 2º dígito
+# (o 1º dígito não usa a última posição da base, peso 0)
+PESOS_CPF = (
+    (10, 9, 8, 7, 6, 5, 4, 3, 2, 0),
+    (11, 10, 9, 8, 7, 6, 5, 4, 3, 2),
+)
+PESOS_CNPJ = (
+    (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2, 0),
+    (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2),
+)
+
+
+def _numpy():
+    """NumPy é opcional: sem ele, a validação em lote usa Python puro."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _so_digitos_ascii(valor):
+    return valor.isascii() and valor.isdigit()
+
+
+def _validar_lote_python(documentos, tamanho, pesos):
+    validos = []
+    for doc in documentos:
+        if len(doc) != tamanho or not _so_digitos_ascii(doc) or doc == doc[0] * tamanho:
+            validos.append(False)
+            continue
+        ok = True
+        for linha, posicao in zip(pesos, (tamanho - 2, tamanho - 1)):
+            resto = sum(int(d) * p for d, p in zip(doc, linha)) % 11
+            if int(doc[posicao]) != (0 if resto < 2 else 11 - resto):
+                ok = False
+                break
+        validos.append(ok)
+    return validos
+
+
+def _validar_lote_numpy(np, documentos, tamanho, pesos):
+    mascara = np.zeros(len(documentos), dtype=bool)
+
+    # só as linhas com o tamanho certo entram na matriz
+    indices = [i for i, doc in enumerate(documentos) if len(doc) == tamanho and doc.isascii()]
+    if not indices:
+        return mascara
+
+    bruto = ''.join(documentos[i] for i in indices).encode('ascii')
+    matriz = np.frombuffer(bruto, dtype=np.uint8).reshape(len(indices), tamanho) - ord('0')
+
+    # uint8: caracteres abaixo de '0' dão a volta e ficam > 9
+    so_digitos = (matriz <= 9).all(axis=1)
+    repetidos = (matriz == matriz[:, :1]).all(axis=1)
+
+    # os dois dígitos de uma vez: (N, tamanho-1) @ (tamanho-1, 2)
+    base = matriz[:, :tamanho - 1].astype(np.int32)
+    somas = base @ np.array(pesos, dtype=np.int32).T
+    restos = somas % 11
+    esperados = np.where(restos < 2, 0, 11 - restos)
+
+    ok = so_digitos & ~repetidos & (matriz[:, -2:] == esperados).all(axis=1)
+    mascara[np.array(indices)] = ok
+    return mascara
+
+
+def _validar_lote(documentos, tamanho, pesos):
+    np = _numpy()
+    if np is None:
+        return _validar_lote_python(documentos, tamanho, pesos)
+    # list nos dois caminhos: "if mascara:" / "== [...]" valem com ou sem NumPy
+    return _validar_lote_numpy(np, documentos, tamanho, pesos).tolist()
+
+
+def validar_cpfs(cpfs):
+    """
+    Valida vários CPFs de uma vez (mesma regra do validar_cpf).
+    - cpfs: iterável de strings com APENAS dígitos (11 chars)
+    Retorna uma list de bool na mesma ordem (com ou sem NumPy).
+    """
+    documentos = [str(c) if c else '' for c in cpfs]
+    return _validar_lote(documentos, 11, PESOS_CPF)
+
+
+def validar_cnpjs(cnpjs):
+    """
+    Valida vários CNPJs de uma vez (mesma regra do validar_cnpj:
+    tira o que não for dígito antes).
+    Retorna uma list de bool na mesma ordem (com ou sem NumPy).
+    """
+    documentos = [apenas_numeros(c) for c in cnpjs]
+    return _validar_lote(documentos, 14, PESOS_CNPJ)
+
+
 def senha_segura(senha):
     """
     Verifica se a senha atende aos critérios de segurança:
@@ -150,13 +249,6 @@ def email_existe(
     return False
 
 
-def apenas_numeros(valor: str):
-    """Remove tudo que não for dígito e retorna só os números."""
-    if not valor:
-        return ''
-    return ''.join(ch for ch in str(valor) if ch.isdigit())
-
-
 def parece_email(valor: str):
     """Checa de forma simples se o valor parece um e-mail."""
     if not valor:
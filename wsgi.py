@@ -0,0 +1,9 @@
+# Ponto de entrada de produção (WSGI).
+#   python wsgi.py                      → Gunicorn com a config SERVIDOR_*
+#   gunicorn --preload wsgi:app         → Gunicorn externo
+from servicosdigitais.app.servidor import criar_app_producao, executar
+
+app = criar_app_producao()
+
+if __name__ == "__main__":
+    executar(app)